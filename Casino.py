@@ -1,14 +1,15 @@
 from __future__ import print_function
 
+import atexit
 import collections
-import copy
 import os
 import pdb
-import random
 import string
 import sys
 
-from lib import CardShoe, CasinoTable, Dealer, Player, Textbox
+from lib import CardShoe, CasinoTable, Dealer, Player
+from lib import RandomStream, BankLedger, Roster, generateDealerList, dieRoll
+from lib.PygameTextboxClass import Textbox
 
 import inflection
 import pygame
@@ -127,16 +128,34 @@ SCROLLSPEED = 1200
 # constants for them.
 TABLESEATS    = ('left', 'middle', 'right')
 TABLESEATSALL = ('left', 'middle', 'right', 'dealer')
-# This tuple stores all of the keys used in the Table object dictionary
-# attribute results (tableObj.results). This is used in the dealer's turn
-# to iterate through all of the possible hand options.
-HANDLIST = ('left reg', 'left split', 'middle reg', 'middle split', 'right reg', 'right split', 'dealer reg')
+# The keys of the Table object dictionary attribute results
+# (tableObj.results) are in tableObj.hand_list. It depends on the split rules
+# the table was built with. The dealer's turn iterates through it for all of
+# the possible hand options.
+
+# This is the root seed of the game's random numbers. None means a new seed is
+# drawn every time the game starts. It is printed to the console at startup;
+# so, setting it here replays the same dealers, player banks, card shoe, and
+# award rolls.
+GAMESEED = None
+
+# This is the file the bank ledger of the game is written to. Every win, loss,
+# tie, insurance bet, and award is recorded in it, so the banks can be
+# audited after the game. None keeps no ledger.
+LEDGERFILE = None
 
 
 def main(): # main game function
     global FPSCLOCK, DISPLAYSURF, CARDIMAGES, BLANKCARD, BASICFONT, SCOREFONT
     global DATAFONT, INSTRUCTFONT, PROMPTFONT
-    global listPlayers, listDealers, tableChoice, tableObj
+    global listPlayers, listDealers, tableChoice, tableObj, gameStreams
+
+    # Every source of random numbers in the game is a child stream of this
+    # one: 'dealers', 'players', 'shoe', and 'awards'. The child streams do
+    # not affect each other; so, a change to how one is used never changes
+    # the others.
+    gameStreams = RandomStream(GAMESEED)
+    print("main: Game seed is {0}.".format(gameStreams.root_seed))
 
     # Pygame initialization.
     pygame.init()
@@ -202,17 +221,18 @@ def main(): # main game function
     #             pixels
     # 'rect'    : a rect object large enough to display the Surface object
     #
-    # CARDIMAGES is a two layer nested ordered dictionary. The first layer maps
-    # a card, a tuple of (rank, suit) generated by CardShoe class, to a nested
-    # dictionary that maps the following items together with the card:
-    # (card) --> {'image'        : loaded graphics file of the tuple (card)
+    # CARDIMAGES is a list of 52 dictionaries, indexed by card code. A card
+    # is the integer code (0-51) CardShoe deals, the index of its (rank, suit)
+    # tuple in CardShoe.cards. Each dictionary maps the following items
+    # together with the card:
+    # [card] --> {'image'        : loaded graphics file of the card
     #             'scaled image' : image scaled to card width/height
     #             'surface'      : a surface object created from the scaled
     #                              scaled image
     #             'rect'         : a rect object large enough to display the
     #                              Surface object}
     # BLANKCARD is the simpler process, but it lays out the steps in building
-    # the full nested dictionary, CARDIMAGES.
+    # the full list of dictionaries, CARDIMAGES.
     BLANKCARD = {}
     BLANKCARD['image']     = pygame.image.load('graphics/Blank.png')
     BLANKCARD['surface']   = BLANKCARD['image'].convert()
@@ -220,67 +240,15 @@ def main(): # main game function
     BLANKCARD['rect']      = BLANKCARD['rect'].inflate(CARDWIDTH, CARDHEIGHT)
     
     # The first step to import the images and map them to their respective
-    # 'cards'. The rest can be done with a iterables. Note: CARDIMAGES is an
-    # ordered dict since that makes it easier to test changes. It also puts
-    # all of the cards in order for diagnostic printouts
-
-    CARDIMAGES   = collections.OrderedDict()
-    CARDIMAGES[( 'A', 'S')] = { 'image' : pygame.image.load('graphics/A-S.png') }
-    CARDIMAGES[( '2', 'S')] = { 'image' : pygame.image.load('graphics/2-S.png') }
-    CARDIMAGES[( '3', 'S')] = { 'image' : pygame.image.load('graphics/3-S.png') }
-    CARDIMAGES[( '4', 'S')] = { 'image' : pygame.image.load('graphics/4-S.png') }
-    CARDIMAGES[( '5', 'S')] = { 'image' : pygame.image.load('graphics/5-S.png') }
-    CARDIMAGES[( '6', 'S')] = { 'image' : pygame.image.load('graphics/6-S.png') }
-    CARDIMAGES[( '7', 'S')] = { 'image' : pygame.image.load('graphics/7-S.png') }
-    CARDIMAGES[( '8', 'S')] = { 'image' : pygame.image.load('graphics/8-S.png') }
-    CARDIMAGES[( '9', 'S')] = { 'image' : pygame.image.load('graphics/9-S.png') }
-    CARDIMAGES[('10', 'S')] = { 'image' : pygame.image.load('graphics/10-S.png') }
-    CARDIMAGES[( 'J', 'S')] = { 'image' : pygame.image.load('graphics/J-S.png') }
-    CARDIMAGES[( 'Q', 'S')] = { 'image' : pygame.image.load('graphics/Q-S.png') }
-    CARDIMAGES[( 'K', 'S')] = { 'image' : pygame.image.load('graphics/K-S.png') }
-    CARDIMAGES[( 'A', 'D')] = { 'image' : pygame.image.load('graphics/A-D.png') }
-    CARDIMAGES[( '2', 'D')] = { 'image' : pygame.image.load('graphics/2-D.png') }
-    CARDIMAGES[( '3', 'D')] = { 'image' : pygame.image.load('graphics/3-D.png') }
-    CARDIMAGES[( '4', 'D')] = { 'image' : pygame.image.load('graphics/4-D.png') }
-    CARDIMAGES[( '5', 'D')] = { 'image' : pygame.image.load('graphics/5-D.png') }
-    CARDIMAGES[( '6', 'D')] = { 'image' : pygame.image.load('graphics/6-D.png') }
-    CARDIMAGES[( '7', 'D')] = { 'image' : pygame.image.load('graphics/7-D.png') }
-    CARDIMAGES[( '8', 'D')] = { 'image' : pygame.image.load('graphics/8-D.png') }
-    CARDIMAGES[( '9', 'D')] = { 'image' : pygame.image.load('graphics/9-D.png') }
-    CARDIMAGES[('10', 'D')] = { 'image' : pygame.image.load('graphics/10-D.png') }
-    CARDIMAGES[( 'J', 'D')] = { 'image' : pygame.image.load('graphics/J-D.png') }
-    CARDIMAGES[( 'Q', 'D')] = { 'image' : pygame.image.load('graphics/Q-D.png') }
-    CARDIMAGES[( 'K', 'D')] = { 'image' : pygame.image.load('graphics/K-D.png') }
-    CARDIMAGES[( 'A', 'H')] = { 'image' : pygame.image.load('graphics/A-H.png') }
-    CARDIMAGES[( '2', 'H')] = { 'image' : pygame.image.load('graphics/2-H.png') }
-    CARDIMAGES[( '3', 'H')] = { 'image' : pygame.image.load('graphics/3-H.png') }
-    CARDIMAGES[( '4', 'H')] = { 'image' : pygame.image.load('graphics/4-H.png') }
-    CARDIMAGES[( '5', 'H')] = { 'image' : pygame.image.load('graphics/5-H.png') }
-    CARDIMAGES[( '6', 'H')] = { 'image' : pygame.image.load('graphics/6-H.png') }
-    CARDIMAGES[( '7', 'H')] = { 'image' : pygame.image.load('graphics/7-H.png') }
-    CARDIMAGES[( '8', 'H')] = { 'image' : pygame.image.load('graphics/8-H.png') }
-    CARDIMAGES[( '9', 'H')] = { 'image' : pygame.image.load('graphics/9-H.png') }
-    CARDIMAGES[('10', 'H')] = { 'image' : pygame.image.load('graphics/10-H.png') }
-    CARDIMAGES[( 'J', 'H')] = { 'image' : pygame.image.load('graphics/J-H.png') }
-    CARDIMAGES[( 'Q', 'H')] = { 'image' : pygame.image.load('graphics/Q-H.png') }
-    CARDIMAGES[( 'K', 'H')] = { 'image' : pygame.image.load('graphics/K-H.png') }
-    CARDIMAGES[( 'A', 'C')] = { 'image' : pygame.image.load('graphics/A-C.png') }
-    CARDIMAGES[( '2', 'C')] = { 'image' : pygame.image.load('graphics/2-C.png') }
-    CARDIMAGES[( '3', 'C')] = { 'image' : pygame.image.load('graphics/3-C.png') }
-    CARDIMAGES[( '4', 'C')] = { 'image' : pygame.image.load('graphics/4-C.png') }
-    CARDIMAGES[( '5', 'C')] = { 'image' : pygame.image.load('graphics/5-C.png') }
-    CARDIMAGES[( '6', 'C')] = { 'image' : pygame.image.load('graphics/6-C.png') }
-    CARDIMAGES[( '7', 'C')] = { 'image' : pygame.image.load('graphics/7-C.png') }
-    CARDIMAGES[( '8', 'C')] = { 'image' : pygame.image.load('graphics/8-C.png') }
-    CARDIMAGES[( '9', 'C')] = { 'image' : pygame.image.load('graphics/9-C.png') }
-    CARDIMAGES[('10', 'C')] = { 'image' : pygame.image.load('graphics/10-C.png') }
-    CARDIMAGES[( 'J', 'C')] = { 'image' : pygame.image.load('graphics/J-C.png') }
-    CARDIMAGES[( 'Q', 'C')] = { 'image' : pygame.image.load('graphics/Q-C.png') }
-    CARDIMAGES[( 'K', 'C')] = { 'image' : pygame.image.load('graphics/K-C.png') }
-    # Step two is to iterate through the cards (dict keys) and create the
+    # 'cards'. The graphics files are named after the cards, 'A-S.png' through
+    # 'K-C.png', which is CardShoe.names. The list is in card code order, which
+    # also puts all of the cards in order for diagnostic printouts.
+    CARDIMAGES = [{ 'image' : pygame.image.load('graphics/{0}.png'.format(name)) } for name in CardShoe.names]
+
+    # Step two is to iterate through the cards (list indexes) and create the
     # surfaces and rects we need to display the cards on screen. The inflate()
     # method ensures all cards are the same size.
-    for card in CARDIMAGES.iterkeys():
+    for card in xrange(0, len(CARDIMAGES)):
         tempSurf = CARDIMAGES[card]['image'].convert()
         CARDIMAGES[card]['scaled image'] = pygame.transform.scale(CARDIMAGES[card]['image'], (CARDWIDTH, CARDHEIGHT))
         CARDIMAGES[card]['surface'] = CARDIMAGES[card]['scaled image'].convert()
@@ -290,21 +258,26 @@ def main(): # main game function
     # print("main: CARDIMAGES = {}.".format(CARDIMAGES))
     # pressSpaceToContinue()
 
-    listDealers = generateDealerList()
+    listDealers = generateDealerList(gameStreams.stream('dealers'))
 
     # Now, we need to see if a saved game exists. If so, it will import it
-    # into listPlayers, a list of player objects. Players include a name
-    # ranking (starter, normal, special event, or high roller. If there are
-    # no saved game(s), we call the function that creates new players.
-    # If creating players fails, then the game bails out.
-    listPlayers = []
-    tempListPlayers = findPlayers()
-    if tempListPlayers != None:
-        listPlayers = copy.deepcopy(tempListPlayers)
-    if listPlayers == []:
+    # into listPlayers, a Roster of the user's players. Players include a
+    # name, bank, and ranking (starter, normal, special event, or high
+    # roller). The Roster is the only copy of this data; everything else
+    # reads it through views. If there are no saved game(s), we call the
+    # function that creates new players. If creating players fails, then the
+    # game bails out.
+    try:
+        listPlayers = Roster(findPlayers())
+    except ValueError:
+        # The roster is indexed by name; so, a saved game with the same name
+        # twice is treated as corrupt.
+        print("main: The saved game lists a player twice. It cannot be used.")
+        listPlayers = Roster()
+    if len(listPlayers) == 0:
         print("main: No saved data could be found.")
         createPlayers()
-        if listPlayers == []:
+        if len(listPlayers) == 0:
             terminate()
 
     # print("main: Player list is {}".format(listPlayers))
@@ -438,7 +411,17 @@ def main(): # main game function
                            tableChoice['name'],
                            tableChoice['bank'],
                            tableChoice['table bets'][0],
-                           tableChoice['table bets'][1])
+                           tableChoice['table bets'][1],
+                           rng = gameStreams.stream('shoe'))
+    # The seated players' banks are read straight from their Player objects
+    # from now on; so, listPlayers never has to be brought up to date.
+    listPlayers.bind_table(tableObj)
+    if LEDGERFILE is not None:
+        # The ledger only writes when its buffer fills; so, whatever is left
+        # in it is written when the game exits.
+        tableObj.ledger = BankLedger(LEDGERFILE)
+        tableObj.attach_ledger()
+        atexit.register(tableObj.ledger.close)
     print("main: Table min is ${0}. Table max is ${1}.".format(tableObj.min_bet, tableObj.max_bet))
 
     # Note: The following turn controls are also initialized with tableObj:
@@ -480,9 +463,8 @@ def cardImagesDiagnosticPrint(adjX=0, adjY=0):
     DISPLAYSURF.fill(BGCOLOR)
     posX = int(3 * (CARDSPACING + CARDWIDTH) / 2) + adjX
     posY = CARDHEIGHT + CARDSPACING + adjY
-    for card in CARDIMAGES.iterkeys():
-        rank, suit = card
-        if rank == 'A':
+    for card in xrange(0, len(CARDIMAGES)):
+        if CardShoe.code_ranks[card] == 0:
             posX  = int(3 * (CARDSPACING + CARDWIDTH) / 2) + adjX
             posY += CARDHEIGHT + CARDSPACING + adjY
         CARDIMAGES[card]['rect'].center = (posX, posY)
@@ -656,6 +638,10 @@ def printTableDealer(tableDealer, output = 'player turn'):
     # Dealer's turn. The Dealer.dealer_print() method will set the 'dealer turn'
     # flag in the dictionary it returns to True.
     if (tableDealer['dealer turn'] or output == 'dealer turn' or output == 'diagnostic') and tableDealer['hand']:
+        # The hold card is face up from here on. A diagnostic printout is not
+        # part of play; so, it does not count as revealing it.
+        if output != 'diagnostic':
+            tableObj.tableDealer.reveal_hold_card()
         dealerHardScoreSurf = SCOREFONT.render("Dealer's hard score: %s" % (tableDealer['hard score']), True, TEXTCOLOR)
         dealerHardScoreRect = dealerHardScoreSurf.get_rect()
         dealerHardScoreRect.center = (WINCENTERX, posY)
@@ -711,7 +697,7 @@ def printTableDealer(tableDealer, output = 'player turn'):
             posXHoldCard = WINCENTERX - (int((CARDSPACING + CARDWIDTH)/ 2))
             posYHoldCard = DEALERSCARDS
             holdCard = tableDealer['hand'][0]
-            print("printTableDealer: holdCard is {}.".format(holdCard))
+            print("printTableDealer: holdCard is {}.".format(CardShoe.names[holdCard]))
             dealerHoldCardSurf = CARDIMAGES[holdCard]['surface']
             dealerHoldCardRect = CARDIMAGES[holdCard]['rect']
             dealerHoldCardRect.topleft = (posXHoldCard, posYHoldCard)
@@ -725,11 +711,11 @@ def printTableDealer(tableDealer, output = 'player turn'):
         if tableDealer['hand'] and sizeOfHand > 1:
             posXVisCard = WINCENTERX + (int((CARDSPACING + CARDWIDTH)/ 2))
             posYVisCard = DEALERSCARDS
-            print("printTableDealer: tableDealer's visible card is {}.".format(tableDealer['visible card']))
-            # In Dealer and Player objects, the cards are tuples inside of
+            print("printTableDealer: tableDealer's visible card is {}.".format([CardShoe.names[card] for card in tableDealer['visible card']]))
+            # In Dealer and Player objects, the cards are card codes inside of
             # lists. We need to call the first and only member of this list.
             visCard = tableDealer['visible card'][0]
-            print("printTableDealer: visCard = {}.".format(visCard))
+            print("printTableDealer: visCard = {}.".format(CardShoe.names[visCard]))
             dealerVisCardSurf = CARDIMAGES[visCard]['surface']
             dealerVisCardRect = CARDIMAGES[visCard]['rect']
             dealerVisCardRect.topleft = (posXVisCard, posYVisCard)
@@ -1044,206 +1030,6 @@ def generateTable(tableColor = OLIVE):
     pygame.display.update()
     FPSCLOCK.tick()
 
-def generateDealerList():
-    """
-    This function creates a list of dictionary objects that feed initial
-    settings for creating dealer objects in CasinoTable objects. The structure
-    is a list of dictionaries of the form below:
-        'name'  : Dealer's name (string)
-        'type'  : This is type of CasinoTable that this "dealer" normally works
-                    'high'    : only works high roller tables, banks over $1m
-                    'starter' : best for new players, bank under $100k
-                    'normal'  : banks 100-250k
-                    'special' : dealer only works special events
-                    
-    For the early versions of the pygame implementation, this list will be
-    hardcoded, but the intention is to migrate this data to a much more
-    complete database, such as a postgres or sql-lite database.
-    INPUTS: None
-    OUTPUTS: list of dictionaries with the following additions
-        'bank' : A value calculated from a base determined by table type
-                 and adjusted by a random amount
-        'blackjack_multiplier : A value chosen randomly from a set of ratios
-                 controlled by the table type
-        'table color' : This the color of the felt of the table. The rim is
-                 always leather.
-        'table bets'  : Tuple storing the min and max bets that table allows
-
-    Each table type has formulas, complete with random choices to create
-    variety during play. All die rolls have a max value of whatever the die
-    itself can produce (d6+2 still maxes at 6, but a d6-2 maxes at 4). All die
-    rolls have a min of 0 (no negative values). The function, dieRoll(),
-    produces these "weighted" die results.
-        'starter': Starter tables
-            'bank': $50k + [(d30 - 5) * $1k]
-                This produces a range 50-75k with most banks being 50k
-            'table color' : OLIVE
-            'blackjack multiplier' : d6 choice from the following options:
-                1) 7:3, 2.33
-                2) 9:4, 2.25
-                3) 2:1, 2.00
-                4) 7:4, 1.75
-                5) 5:3, 1.67
-                6) 3:2, 1.50
-            'table bets' : (tableMin = 5, tableMax = 100)
-            
-        'high' : High Roller Tables
-            'bank': $1m + (d100 * $25k)
-                This produces a range of $1-3.5m (uniform)
-            'table color' : PURPLE
-            'blackjack multiplier' : d6 choice from the following options:
-                1) 11:4, 2.75
-                2) 8:3, 2.67
-                3) 5:2, 2.50
-                4) 7:3, 2.33
-                5) 9:4, 2.25
-                6) 2:1, 2.00
-            'table bets' : (tableMin = 500, tableMax = 100k)
-
-        'special' : Special Event Tables
-            'bank': $250k + (d100 * 5k)
-                This produces a range of $250-750k (uniform)
-            'table color' : AQUAMARINE
-            'blackjack multiplier' : d4 choice from the following options:
-                1) 3:1, 3.00
-                2) 5:2, 2.50
-                3) 2:1, 2.00
-                4) 3:2, 1.50
-            'table bets' : (tableMin = 250, tableMax = 1000)        
-
-        'normal' : Regular Tables
-            'bank': $100k + [(d100 - 25) * 2k]
-                This produces a range of $100-250k, weighted to 25% of banks
-                being $100k
-            'table color' : BLUE
-            'blackjack multiplier' : d8 choice from the following options:
-                1) 2:1, 2.00
-                2) 9:5, 1.80
-                3) 7:4, 1.75
-                4) 8:5, 1.60
-                5) 5:3, 1.67
-                6) 7:5, 1.40
-                7) 4:3, 1.33
-                8) 6:5, 1.20
-            'table bets' : (tableMin = 50, tableMax = 200)
-            
-    Note: All players start with the starter tables while they learn to play
-    this game. It helps to reinforce that the game is partly about having fun,
-    but it is also about beating the bank.
-    """
-    listDealers = []
-    listDealers.append({'name' : 'Frank',   'type' : 'starter'})
-    listDealers.append({'name' : 'Hannah',  'type' : 'normal'})
-    listDealers.append({'name' : 'Mike',    'type' : 'normal'})
-    listDealers.append({'name' : 'Rayden',  'type' : 'special'})
-    listDealers.append({'name' : 'Charlie', 'type' : 'special'})
-    listDealers.append({'name' : 'Freddie', 'type' : 'high'})
-    listDealers.append({'name' : 'James',   'type' : 'high'})
-    listDealers.append({'name' : 'Angela',  'type' : 'high'})
-    # print(listDealers)
-
-    numOfDealers = len(listDealers)
-    # As mentioned in the main comment block, we need to calculate the banks
-    # for each dealer, their current table blackjack_multiplier, and the color
-    # of the felt on their table. These are determined by formulas that depend
-    # on the type of table the dealer works at.
-    for i in range(0, numOfDealers):
-        if listDealers[i]['type'] == 'starter':
-            listDealers[i]['table color'] = OLIVE
-            listDealers[i]['bank'] = 50000 + (1000 * dieRoll(30, 0, 25, -5))
-            multiplierChoice = dieRoll(6, 1, 6)
-            if multiplierChoice == 1:
-                listDealers[i]['blackjack multiplier'] = ('7:3', 2.33)
-            elif  multiplierChoice == 2:
-                listDealers[i]['blackjack multiplier'] = ('9:4', 2.25)
-            elif  multiplierChoice == 3:
-                listDealers[i]['blackjack multiplier'] = ('2:1', 2.00)
-            elif  multiplierChoice == 4:
-                listDealers[i]['blackjack multiplier'] = ('7:4', 1.75)
-            elif  multiplierChoice == 5:
-                listDealers[i]['blackjack multiplier'] = ('5:3', 1.67)
-            elif  multiplierChoice == 6:
-                listDealers[i]['blackjack multiplier'] = ('3:2', 1.50)
-            listDealers[i]['table bets'] = (5, 100)
-            
-        elif listDealers[i]['type'] == 'normal':
-            listDealers[i]['table color'] = BLUE
-            listDealers[i]['bank'] = 100000 + (2000 * dieRoll(100, 0, 75, -25))
-            multiplierChoice = dieRoll(8, 1, 8)
-            if multiplierChoice == 1:
-                listDealers[i]['blackjack multiplier'] = ('2:1', 2.00)
-            elif  multiplierChoice == 2:
-                listDealers[i]['blackjack multiplier'] = ('9:5', 1.80)
-            elif  multiplierChoice == 3:
-                listDealers[i]['blackjack multiplier'] = ('7:4', 1.75)
-            elif  multiplierChoice == 4:
-                listDealers[i]['blackjack multiplier'] = ('8:5', 1.60)
-            elif  multiplierChoice == 5:
-                listDealers[i]['blackjack multiplier'] = ('3:2', 1.50)
-            elif  multiplierChoice == 6:
-                listDealers[i]['blackjack multiplier'] = ('7:5', 1.40)
-            elif  multiplierChoice == 7:
-                listDealers[i]['blackjack multiplier'] = ('4:3', 1.33)
-            elif  multiplierChoice == 8:
-                listDealers[i]['blackjack multiplier'] = ('6:5', 1.20)
-            listDealers[i]['table bets'] = (50, 200)
-
-        elif listDealers[i]['type'] == 'special':
-            listDealers[i]['table color'] = AQUAMARINE
-            listDealers[i]['bank'] = 250000 + (5000 * dieRoll(100, 1, 100))
-            multiplierChoice = dieRoll(4, 1, 4)
-            if multiplierChoice == 1:
-                listDealers[i]['blackjack multiplier'] = ('3:1', 3.00)
-            elif  multiplierChoice == 2:
-                listDealers[i]['blackjack multiplier'] = ('5:2', 2.50)
-            elif  multiplierChoice == 3:
-                listDealers[i]['blackjack multiplier'] = ('2:1', 2.00)
-            elif  multiplierChoice == 4:
-                listDealers[i]['blackjack multiplier'] = ('3:2', 1.50)
-            listDealers[i]['table bets'] = (250, 1000)
-
-        elif listDealers[i]['type'] == 'high':
-            listDealers[i]['table color'] = PURPLE
-            listDealers[i]['bank'] = 1000000 + (25000 * dieRoll(100, 1, 100))
-            multiplierChoice = dieRoll(6, 1, 6)
-            if multiplierChoice == 1:
-                listDealers[i]['blackjack multiplier'] = ('11:4', 2.75)
-            elif  multiplierChoice == 2:
-                listDealers[i]['blackjack multiplier'] = ('8:3', 2.67)
-            elif  multiplierChoice == 3:
-                listDealers[i]['blackjack multiplier'] = ('5:2', 2.50)
-            elif  multiplierChoice == 4:
-                listDealers[i]['blackjack multiplier'] = ('7:3', 2.33)
-            elif  multiplierChoice == 5:
-                listDealers[i]['blackjack multiplier'] = ('9:4', 2.25)
-            elif  multiplierChoice == 6:
-                listDealers[i]['blackjack multiplier'] = ('2:1', 2.00)
-            listDealers[i]['table bets'] = (500, 1000000)
-
-    return listDealers # generateDealerList
-
-def dieRoll(die, minNum, maxNum, adj=0):
-    """
-    This function generates random numbers for sequences with floor or ceiling
-    values. For example, suppose you need to have a roll weighted to be zero
-    more often than one possible value, such as d6-2 with a 0 minimum value.
-    The sequence of numbers would be [0, 0, 1, 2, 3, 4]. Or suppose you want
-    a d12+3 with max of 12. That sequence would be [4, 5, 6, 7, 8, 9 ,10, 11
-    12, 12, 12, 12]. In this version, it cannot do a sequence like [1, 1, 2, 2].
-    """
-    numList = []
-    for i in range(1, die + 1):
-        currentNum = i + adj
-        if not (minNum <= currentNum <= maxNum):
-            if currentNum < minNum:
-                currentNum = minNum
-            elif currentNum > maxNum:
-                currentNum = maxNum
-        numList.append(currentNum)
-    random.shuffle(numList)
-    output = random.randint(0, die - 1)
-    return numList[output]
-
 def findPlayers(filename = './etc/savedgame.txt'):
     """
     This function looks for saved game files. The correct format for a saved
@@ -1477,8 +1263,8 @@ def findPlayers(filename = './etc/savedgame.txt'):
 def writeSavedGame(listPlayers, filename = './etc/savedgame.txt'):
     """1111
     This function saves Player data to a saved game file.
-    INPUTS: listPlayers, which will a list of player dictionaries with the
-        following structure:
+    INPUTS: listPlayers, which will be the Roster (or a list of player
+        dictionaries) with the following structure:
         'name'   : player's name (string)
         'bank'   : player's money in chips (integer)
         'skill'  : player's skill ('high'|'starter'|'normal'|'special')
@@ -1627,9 +1413,12 @@ def createPlayers():
         posY += LINESPACING18
         nameTextboxRect = instTextRect.copy()
         nameTextboxRect.center = (WINCENTERX, posY)
-        pNameTextbox = Textbox((nameTextboxRect), fontSize = 18, command = setupPlayer,
-                               charFilter = 'alpha', enterClears = True, enterDeactivates = True)
-        playerName   = getTextboxNameEvents(pNameTextbox, instTextSurf, instTextRect, DISPLAYSURF)
+        # setupPlayer turns down a name that is already on the roster; so,
+        # the user is asked again until Player #i has been added.
+        while len(listPlayers) < i:
+            pNameTextbox = Textbox((nameTextboxRect), fontSize = 18, command = setupPlayer,
+                                   charFilter = 'alpha', enterClears = True, enterDeactivates = True)
+            playerName   = getTextboxNameEvents(pNameTextbox, instTextSurf, instTextRect, DISPLAYSURF)
     return # createPlayers
 
 def getTextboxNameEvents(Textbox, promptSurf, promptRect, Surface):
@@ -1669,29 +1458,30 @@ def setupPlayer(id, name):
     command attribute executes this function with Textbox.buffer as an
     argument.
     This function  is only used when a new set of players has to be created.
-    So, all players are 'starter' skill and have a starting bank.
+    So, all players are 'starter' skill and have a starting bank. A name that
+    is already in listPlayers is turned down, since the roster is indexed by
+    name.
     INPUTS: two arguments
         id, the id of the Textbox object
         name, a string captured from Textbox.finalBuffer
     OUTPUT: None, all changes are made to global variables
     """
-    bank = STARTINGBANK + (1000 * dieRoll(30, 5, 25, 4))
-    listPlayers.append({ 'name'  : name,
-                         'bank'  : bank,
-                         'skill' : 'starter' })
+    if name in listPlayers:
+        print("setupPlayer: {0} is already a player. Please choose another name.".format(name))
+        return
+    bank = STARTINGBANK + (1000 * dieRoll(30, 5, 25, 4, gameStreams.stream('players')))
+    listPlayers.add(name, bank, 'starter')
 
 def getTableSkillList(listPlayers):
     """
     This function takes a list of players and returns a set listing all of
     table types they can play at. It creates a set of their skill levels and
     returns it to main. We use sets because they cannot store duplicat values.
-    INPUT: listPlayers, a list of player dictionaries
+    INPUT: listPlayers, a Roster (or a list of player dictionaries)
     OUTPUT: tableTypes, a set of table types (see SKILLS constant for a full
         list)
     """
-    playerLevels = set()
-    for i in range(0, len(listPlayers)):
-        playerLevels.add(listPlayers[i]['skill'])
+    playerLevels = set([player['skill'] for player in listPlayers])
     print("getTableSkillList: Players's skills are {}".format(playerLevels))
     # Now that we have players levels, we need to find the max table type they
     # can attend. We use slicing to do that.
@@ -2057,10 +1847,11 @@ def playBlackjack():
     
     INPUTS: No arguments. All objects changed are global ones.
         tableObj, a CasinoTable object
-        listPlayers. the global list of player dictionaries which must be
-            updated as the game progresses
-    OUTPUTS: listPlayers, updated with new bank amounts, removal of players who
-        busted, and new table options (represented by the player's skill level)
+        listPlayers. the global Roster of the players. The seated players'
+            banks are read from tableObj.players; so, it stays up to date
+            as the game progresses.
+    OUTPUTS: listPlayers, updated with removal of players who busted, and new
+        table options (represented by the player's skill level)
     """
     roundCounter = 0
     #  Clear the screen.
@@ -2241,15 +2032,12 @@ def playBlackjack():
         endOfRound(roundCounter)
         endGame = (tableObj.phase == 'postgame')
 
-        # The final step is to migrate changes to player bank data and
-        # removing eliminated players.
-        updatePlayerData()
     # End of game while loop
     return # playBlackjack
 
 def removeActivePlayer(seat, rounds):
     """
-    This function removes a player from the table object, but updates their
+    This function removes a player from the table object, but keeps their
     bank in listPlayers. This function is used with the player wants to
     withdraw a player between rounds.
     INPUTS: three arguments (listPlayers and tableObj are global objects)
@@ -2259,23 +2047,19 @@ def removeActivePlayer(seat, rounds):
             being pulled from the table
     OUTPUTS: none
     Note: This function changes global object, tableObj, by removing a player.
-    It also updates listPlayers with the player's bank.
+    It also unbinds the player in listPlayers, which keeps their last bank.
     """
-    # We need to match their name. The playerObj should have it. We need to
-    # update the bank for that player once found. If they played sufficient
-    # rounds, the player's skill should be updated as well.
+    # The roster finds the player by name. Unbinding them keeps the bank they
+    # leave the table with. If they played sufficient rounds, the player's
+    # skill should be updated as well.
     playerObj = tableObj.players[seat]
-    for i in range(0, len(listPlayers)):
-        if listPlayers[i]['name'] == playerObj.name:
-            # Update the player's bank.
-            listPlayers[i]['bank'] = playerObj.bank
-            # Check to see if they played enough rounds to advance their skill.
-            if listPlayers[i]['skill'] == 'starter' and rounds >= STARTER:
-                listPlayers[i]['skill'] = 'normal'
-            elif listPlayers[i]['skill'] == 'normal' and rounds >= NORMAL:
-                listPlayers[i]['skill'] = 'special'
-            elif listPlayers[i]['skill'] == 'special' and rounds >= SPECIAL:
-                listPlayers[i]['skill'] = 'high'
+    listPlayers.unbind(playerObj.name)
+    playerSkill = listPlayers.view(playerObj.name)['skill']
+    # Check to see if they played enough rounds to advance their skill.
+    if (playerSkill == 'starter' and rounds >= STARTER) or\
+       (playerSkill == 'normal' and rounds >= NORMAL) or\
+       (playerSkill == 'special' and rounds >= SPECIAL):
+        listPlayers.promote(playerObj.name)
     # Now, we need to remove that player from the tableObj. We also need to
     # reduce the number of players by 1. The only problem is that CasinoTable
     # objects do not easily delete items.
@@ -2441,6 +2225,20 @@ def isPlayerStillThere(seat):
         # pressSpaceToContinue(STATUSBLOCKWIDTH, STATUSBLOCKHEIGHT)
         return True
 
+def handDescription(handIndex):
+    """
+    This function returns the words used for a hand in the status messages:
+    'regular hand' for the first hand, 'split hand' for the first split, and
+    'split hand 2', 'split hand 3', and so on for re-split hands.
+    INPUTS: handIndex, integer index of the hand in Player.hands
+    OUTPUTS: string describing the hand
+    """
+    if handIndex == 0:
+        return 'regular hand'
+    if handIndex == 1:
+        return 'split hand'
+    return 'split hand {0}'.format(handIndex)
+
 def getBet(betType = 'reg'):
     """
     This function leverages the Textbox class to create a numbers only textbox
@@ -2857,7 +2655,9 @@ def dealRound(rounds):
                 card = tableObj.deck.remove_top()
                 tableObj.results[seat + ' reg'] = tableObj.players[seat].add_card_to_hand(card)
         else: # Seat is the dealer's, which is always occupied during the game.
-            card = tableObj.deck.remove_top()
+            # The dealer's first card is the hold card. It is dealt face down;
+            # so, a card counter does not see it until the dealer's turn.
+            card = tableObj.deck.remove_top(face_down = (len(tableObj.tableDealer.hand) == 0))
             tableObj.results[seat + ' reg'] = tableObj.tableDealer.add_card_to_hand(card)
     refreshTable(tableObj.phase, rounds)
     pressSpaceToContinue(STATUSBLOCKWIDTH, STATUSBLOCKHEIGHT)
@@ -2920,7 +2720,7 @@ def checkForInsBet():
     posX = LEFTMARGIN
     posY = TOPMARGIN
     if blackjackFlag == True:
-        rank, suit = visCard
+        rank = CardShoe.ranks[CardShoe.code_ranks[visCard]]
         if rank == 'K':
             cardName = 'a king'
         elif rank == 'Q':
@@ -3553,6 +3353,8 @@ def eliminatePlayer(seat):
     playerName = tableObj.players[seat].name
     print("eliminatePlayer: Status: seat for elimination is {0}.".format(seat))
     print("eliminatePlayer: Status: Player to be eliminated is {0}.".format(playerName))
+    # Any hand the player still has must stop counting for the dealer.
+    tableObj.scores.drop_seat(tableObj.players[seat].seat_number)
     del tableObj.players[seat]
     tableObj.numPlayers -= 1
     # This step eliminates a bug that would have withdrawn players removed
@@ -3601,12 +3403,8 @@ def dealersTurn(rounds):
     insuranceBets = False
     userLosesGame = (tableObj.numPlayers == 0)
     noHandsRemain = False
-    # These varaiables are integers.
-    dealerLosses = 0
-    dealerWins = 0
     print("dealersTurn: Status: userLosesGame is {0}. Players left is {1}.".format(userLosesGame, tableObj.numPlayers))
     print("dealersTurn: Status: dealerBlackjack is {0}. noHandsRemain is {1}.".format(dealerBlackjack, noHandsRemain))
-    print("dealersTurn: Status: dealerLosses is {0}. dealerWins is {1}.".format(dealerLosses, dealerWins))
 
     # Next, we need to determine if any insurance were made.
     for seat in TABLESEATS:
@@ -3690,73 +3488,28 @@ def dealersTurn(rounds):
             userLostGame()
         return
 
-    # We need to determine if any playable hands remain. While we do that,
-    # we also need to determine the min and max scores for any playable hands
-    # If at least one playable hand exists, the dealer has to play their
-    # hand to determine the outcome of the game. Remember, soft scores
-    # are always greater than or equal to the hard score because the soft
-    # score uses Ace = 11 whenever possible. The dealer has to take a card
-    # until the dealer's soft score beats at least one player's score or the
-    # dealer's hand score is 17 or greater. The minScore gives that to us.
-    # The maxScore tells us if the dealer beat all of the remining hands.
+    # We need to determine if any playable hands remain, and the min and max
+    # scores for any playable hands. If at least one playable hand exists,
+    # the dealer has to play their hand to determine the outcome of the
+    # game. Remember, soft scores are always greater than or equal to the
+    # hard score because the soft score uses Ace = 11 whenever possible. The
+    # dealer has to take a card until the dealer's soft score beats at least
+    # one player's score or the dealer's hand score is 17 or greater. The
+    # minScore gives that to us. The maxScore tells us if the dealer beat all
+    # of the remining hands.
+    # The players keep the soft scores of their playable hands in order in
+    # tableObj.scores as the hands are dealt, bust, or settle; so, the scores
+    # are read from it instead of from every seat. It is possible for players
+    # to stand at 12 or 13 and wait to see if the dealer busts. So, minScore
+    # is the lowest score of 17 or more, or the maxScore if no score is that
+    # high.
     # We need the list of hands for a second purpose, determining win, tie,
-    # or lose on each playable hand. Since we are collecting scores for the
-    # hands, we can also collect keys for the hands as well.
-    playableScores = []
-    playableHands = []
-    for possibleHand in HANDLIST:
-        # The str.split() method turns a string into a list, or in this case,
-        # one or two list entries.
-        seat, handType = possibleHand.split(' ')
-        # This keeps kicking out a 'dealer is not there message'. So, I am 
-        # going to swap the order of the booleans.
-        if seat != 'dealer' and isPlayerStillThere(seat):
-            print("dealersTurn: Status: possibleHand is {0}. seat is {1}. handType is {2}. result is {3}.".format(possibleHand, seat, handType, tableObj.results[possibleHand]))
-            # We are skipping the dealer because we are collecting data on 
-            # players' hands.
-            handStatus = tableObj.results[possibleHand]
-            if handStatus == 'playable' and handType != 'split':
-                # This is a playable regular hand. First, we check the scores
-                # for the hand.
-                softScore = tableObj.players[seat].soft_hand_score
-                print("dealersTurn: Status: softScore is {0}.".format(softScore))
-                # Using a list allows us to sort it, pulling the highest
-                # and lowest scores out. We need the scores in order to
-                # ensure that the dealer plays their hand properly.
-                playableScores.append(softScore)
-                playableHands.append(possibleHand)
-            elif handStatus == 'playable' and handType == 'split':
-                # This is a split hand. Again, we check the scores and 
-                # append them to our list playableScores.
-                softScore = tableObj.players[seat].soft_split_score
-                print("dealersTurn: Status: softScore is {0}.".format(softScore))
-                playableScores.append(softScore)
-                playableHands.append(possibleHand)
-            # We don't need to look at any other conditions.
-    # We need to sort this list of scores in case the minScore is too small
-    # to use.
-    playableScores.sort
-    print("dealersTurn: Status: playableScores is {0}.".format(playableScores))
+    # or lose on each playable hand.
+    playableHands = playableHandKeys()
+    maxScore = tableObj.scores.high
+    minScore = tableObj.scores.lowest_from(17)
     print("dealersTurn: Status: playableHands is {0}.".format(playableHands))
-    # This code keeps this function from crashing when no playable hands
-    # remain among the players' hands.
-    if len(playableScores) == 0:
-        maxScore = 0
-        minScore = 0
-    else: # There is at least one playable hand.
-        maxScore = max(playableScores)
-        minScore = min(playableScores)
-    while minScore < 17 and len(playableScores) > 1:
-        # The score must be greater than 17. It is possible for players to
-        # stand at 12 or 13 and wait to see if the dealer busts. So, we will
-        # remove the bottom score and get a new minScore until we reach the
-        # maxScore.
-        playableScores.pop(0)
-        print("dealersTurn: Status: playableScore is {0}.".format(playableScores))
-        print("dealersTurn: Status: minScore is {0}, maxScore is {1}.".format(minScore, maxScore))
-        minScore = min(playableScores)
-        if minScore == maxScore:
-            break
+    print("dealersTurn: Status: minScore is {0}, maxScore is {1}.".format(minScore, maxScore))
 
     # Next, we need to check to see if the dealer needs to play their hand.
     # No remaining playable hands means that there is nothing to do. All of
@@ -3862,145 +3615,17 @@ def dealersTurn(rounds):
 
     # To get this far, the dealer had to stand with a playable hand. Now, we
     # to determine who wins and loses individually based on the scores for the
-    # dealer's hand. dealerHardScore and dealerSoftScore should be correct,
-    # since the dealer would not have taken another card. We also collected
-    # the playable hands, so we can find them again.
-    for hand in playableHands:
-        seat, handType = hand.split(' ')
-        print("dealersTurn: Status: Determining win/lose/tie. seat is {0}. handType is {1}. result is {2}".format(seat, handType, tableObj.results[hand]))
-        if handType == 'split':
-            # This is a split hand. To determine a winner, we only need the
-            # highest score the dealer or the player could achieve, which is
-            # the soft score. Remember, blackjack is a hand formed by the
-            # first two cards dealt to a player or dealer that contain an
-            # ace and a ten value card. This hand has a soft score of 21 and
-            # a hard score of 11.
-            playerSoftScore = tableObj.players[seat].soft_split_score
-        else: # This is the regular hand.
-            playerSoftScore = tableObj.players[seat].soft_hand_score
-        # Now, none of steps that follow require anything specific about
-        # hand in the tableObj. So, we can use the same code for regular
-        # hands and split hands. The hand key is unchanged.
-        if dealerSoftScore > playerSoftScore:
-            # The player lost their bet. For now, we are going to change
-            # the results from playable to 'loss'.
-            tableObj.results[hand] = 'loss'
-        elif dealerSoftScore == playerSoftScore:
-            # This is a tie. Ties are treated as a draw.
-            tableObj.results[hand] = 'tie'
-        else: # dealerSoftScore < playerSoftScore
-            # The player won against the dealer.
-            tableObj.results[hand] = 'win'
-        print("dealersTurn: Status: win/lose/tie determined. seat is {0}. handType is {1}. result is {2}".format(seat, handType, tableObj.results[hand]))
-
-    # All of the results have been tabulated, but we have only distributed
-    # the wins and losses for blackjack and busted hands. Now, we need to
-    # go through and pull out the winner and losers. We will use the collect
-    # the dealer's wins and losses, then use the Dealer.wins and Dealer.losses
-    # methods to apply them, since they will give us feedback if it breaks
-    # the dealer's bank. Likewise, as we roll through the hands, we will
-    # give players their winning and deduct losses using the Player wins,
-    # tie, and loss for each hand. These methods also give feedback, so that
-    # we will know if a player has to be eliminated.
+    # dealer's hand. We collected the playable hands, so tableObj.settle can
+    # settle all of them at once: it compares every hand's soft score with the
+    # dealer's, applies the wins, ties, and losses to the players' banks, and
+    # applies the dealer's aggregate wins, then losses, to its bank. The wins
+    # go first since they cannot affect the dealer's status, but may prevent
+    # a bust on the other bets.
     # Note: playableHands is the list of hands that players had after the
     # players' turns were over.
-    # Reset the ordinals. All of these results should be printable in the
-    # status window with the right spacing.
-    clearStatusCorner()
-    posX = LEFTMARGIN
-    posY = TOPMARGIN
-    for hand in playableHands:
-        seat, handType = hand.split(' ')
-        print("dealersTurn: Status: Distributing wins and losses. seat is {0}. handType is {1}. result is {2}".format(seat, handType, tableObj.results[hand]))
-        if tableObj.results[hand] == 'win':
-            playerName = tableObj.players[seat].name
-            # Players cannot be eliminated by a win. If they were already
-            # insolvent and this win is not enough to save their bank, the
-            # function findDefunctPlayer will identify and remove them.
-            if handType == 'split':
-                betAmt = tableObj.players[seat].split_bet
-                playerStatus = tableObj.players[seat].split_win()
-                playerHandText = "{0} won the bet of ${1} on their split hand.".format(playerName, betAmt)
-            else: # It is a regular hand.
-                betAmt = tableObj.players[seat].bet
-                playerStatus = tableObj.players[seat].win()
-                playerHandText = "{0} won the bet of ${1} on their regular hand.".format(playerName, betAmt)
-            dealerLosses += betAmt
-            playerHandSurf = SCOREFONT.render(playerHandText, True, TEXTCOLOR)
-            playerHandRect = playerHandSurf.get_rect(topleft = (posX, posY))
-            posY += LINESPACING12
-            DISPLAYSURF.blit(playerHandSurf, playerHandRect)
-            pygame.display.update()
-            pressSpaceToContinue(STATUSBLOCKWIDTH, STATUSBLOCKHEIGHT)
-
-        elif tableObj.results[hand] == 'tie':
-            playerName = tableObj.players[seat].name
-            # Players cannot be eliminated by a tie. If they were already
-            # insolvent, findDefunctPlayer will identify and remove them.
-            if handType == 'split':
-                betAmt = tableObj.players[seat].split_bet
-                playerStatus = tableObj.players[seat].split_tie()
-                playerHandText = "{0} tied on their split hand.".format(playerName)
-            else: # It is a regular hand.
-                betAmt = tableObj.players[seat].bet
-                playerStatus = tableObj.players[seat].tie()
-                playerHandText = "{0} tied on their regular hand.".format(playerName)
-            # With a tie, neither side loses any money.
-            playerHandSurf = SCOREFONT.render(playerHandText, True, TEXTCOLOR)
-            playerHandRect = playerHandSurf.get_rect(topleft = (posX, posY))
-            posY += LINESPACING12
-            DISPLAYSURF.blit(playerHandSurf, playerHandRect)
-            pygame.display.update()
-            pressSpaceToContinue(STATUSBLOCKWIDTH, STATUSBLOCKHEIGHT)
-        
-        elif tableObj.results[hand] == 'loss':
-            playerName = tableObj.players[seat].name
-            # Players losing bets can be eliminated from the game at this
-            # point. For that reason, all of these outcomes had to be
-            # handled separately.
-            if handType == 'split':
-                betAmt = tableObj.players[seat].split_bet
-                playerStatus = tableObj.players[seat].split_loss()
-                dealerWins += betAmt
-                playerHandText = "{0} lost the bet of {1} on their split hand.".format(playerName, betAmt)
-                playerHandSurf = SCOREFONT.render(playerHandText, True, TEXTCOLOR)
-                playerHandRect = playerHandSurf.get_rect(topleft = (posX, posY))
-                posY += LINESPACING12
-            else: # It is a regular hand.
-                betAmt = tableObj.players[seat].bet
-                playerStatus = tableObj.players[seat].reg_loss()
-                dealerWins += betAmt
-                playerHandText = "{0} lost the bet of {1} on their regular hand.".format(playerName, betAmt)
-                playerHandSurf = SCOREFONT.render(playerHandText, True, TEXTCOLOR)
-                playerHandRect = playerHandSurf.get_rect(topleft = (posX, posY))
-                posY += LINESPACING12
-            # Now, we have to determine if the player should be eliminated.
-            if playerStatus:
-                # The player is still solvent.
-                playerStatusText = "This player is still solvent."
-                playerStatusSurf = SCOREFONT.render(playerStatusText, True, TEXTCOLOR)
-                playerStatusRect = playerStatusSurf.get_rect(topleft = (posX, posY))
-                posY += LINESPACING12
-            else: # The player is insolvent.
-                playerStatusText = "This player is insolvent and was eliminated."
-                playerStatusSurf = PROMPTFONT.render(playerStatusText, True, ELIMINATIONCOLOR, ELIMINATIONBGCOLOR)
-                playerStatusRect = playerStatusSurf.get_rect(topleft = (posX, posY))
-                posY += LINESPACING18
-                eliminatePlayer(seat)
-                # The line spacing needs to be greater because PROMPTFONT
-                # is bigger.
-            DISPLAYSURF.blit(playerHandSurf, playerHandRect)
-            DISPLAYSURF.blit(playerStatusSurf, playerStatusRect)
-            pygame.display.update()
-            pressSpaceToContinue(STATUSBLOCKWIDTH, STATUSBLOCKHEIGHT)
-    # All wins and losses for the players have been applied to their banks.
-    # Now, we need to apply the dealer's aggregate wins and losses to its
-    # bank. We start with the wins, since they cannot affect the dealer's
-    # status, but may prevent a bust on the other bets. Then, we apply the
-    # losses and see if the dealer breaks their bank over it. The methods
-    # we use are Dealer.dealer_won(amt) and Dealer.dealer_lost(amt).
-    tableObj.tableDealer.dealer_won(dealerWins)
-    dealerStatus = tableObj.tableDealer.dealer_lost(dealerLosses)
+    settlement = tableObj.settle(playableHands)
+    showSettlement(settlement)
+    dealerStatus = settlement['dealer solvent']
     if dealerStatus:
         refreshTable('dealer', rounds)
         posX = LEFTMARGIN
@@ -4063,6 +3688,13 @@ def resolveInsBets(dealerBlackjack, rounds):
                 # the boolean it is given. result will be True if the player's
                 # bank is still solvent, False otherwise.
                 result = tableObj.players[seat].ins(dealerBlackjack)
+                # The dealer takes the other side of the bet, as in
+                # CasinoTable.dealer_turn; so, the ledger sees both sides. A
+                # broken dealer's bank is checked after the loop.
+                if dealerBlackjack:
+                    tableObj.tableDealer.dealer_lost(betAmt)
+                else:
+                    tableObj.tableDealer.dealer_won(betAmt)
 
                 # Now, we have a few different outcomes:
                 #   1) dealer had blackjack (player won)
@@ -4129,69 +3761,88 @@ def resolveInsBets(dealerBlackjack, rounds):
         playersWinGame(rounds)
     return # resolveInsBets
 
-def dealerHasBlackjack():
+def playableHandKeys():
     """
-    This function collects the user losses due to a dealer blackjack. It
-    returns the number of players remaining in the game.
+    This function returns the keys of tableObj.results for every hand still
+    marked 'playable' at an occupied seat, in table order.
     INPUTS: None
-    OUTPUTS: updates tableObj.numPlayers, otherwise none.
+    OUTPUTS: list of results keys
+    """
+    playableHands = []
+    for hand in tableObj.hand_list:
+        seat, handIndex = tableObj.hand_index(hand)
+        if seat != 'dealer' and isPlayerStillThere(seat) and tableObj.results[hand] == 'playable':
+            playableHands.append(hand)
+    return playableHands
+
+def showSettlement(settlement):
+    """
+    This function prints out the settlement returned by tableObj.settle in
+    the status corner, one hand at a time, in the same way for a dealer that
+    stands, busts, or has blackjack. The players in settlement['eliminated']
+    are told they are insolvent and are eliminated after the last hand has
+    been shown, since their other hands are still listed in the settlement.
+    INPUTS: settlement, the dict returned by CasinoTable.settle
+    OUTPUTS: None. All output is to the game screen.
     """
-    # First, we need to set up an aggregator for the dealer's winnings. We
-    # also need to clear the status corner and reset the positionals. All
-    # losses will printed out in the status corner together.  The dealer
-    # cannot be eliminated by wins, but players may be eliminated by their
-    # losses. We also need to tabulate surviving players via
-    # tableObj.numPlayers.
     clearStatusCorner()
     posX = LEFTMARGIN
     posY = TOPMARGIN
-    dealerWins = 0
-    # We need to process all of the hands marked "playable". All of them 
-    # are losses for the players in question.
-    for hand in HANDLIST:
-        seat, handType = hand.split(' ')
-        print("dealerHasBlackjack: Status: Looking for playable hands. seat is {0}. handType is {1}. result is {2}".format(seat, handType, tableObj.results[hand]))
-        if isPlayerStillThere(seat):
-            if tableObj.results[hand] == 'playable':
-                # Set this one to a loss.
-                tableObj.results[hand] = 'loss'
-                playerName = tableObj.players[seat].name
-                if handType == 'split':
-                    # This is a split hand.
-                    betAmt = tableObj.players[seat].split_bet
-                    playerStatus = tableObj.players[seat].split_loss()
-                else: # This is regular hand.
-                    betAmt = tableObj.players[seat].bet
-                    playerStatus = tableObj.players[seat].reg_loss()
-                dealerWins += betAmt
-                # The player lost their bet regardless of what else happens.
-                playerHandText = "{0} lost ${1} to dealer's blackjack.".format(playerName, betAmt)
-                playerHandSurf = SCOREFONT.render(playerHandText, True, TEXTCOLOR)
-                playerHandRect = playerHandSurf.get_rect(topleft = (posX, posY))
+    for hand, outcome, payout in zip(settlement['keys'], settlement['outcomes'], settlement['payouts']):
+        seat, handIndex = tableObj.hand_index(hand)
+        print("showSettlement: Status: seat is {0}. handIndex is {1}. result is {2}".format(seat, handIndex, tableObj.results[hand]))
+        playerName = tableObj.players[seat].name
+        handName = handDescription(handIndex)
+        # Players cannot be eliminated by a win or a tie. If they were already
+        # insolvent, findDefunctPlayer will identify and remove them.
+        if tableObj.results[hand] == 'win':
+            playerHandText = "{0} won the bet of ${1} on their {2}.".format(playerName, payout, handName)
+        elif tableObj.results[hand] == 'tie':
+            # With a tie, neither side loses any money.
+            playerHandText = "{0} tied on their {1}.".format(playerName, handName)
+        else: # The player lost this hand.
+            playerHandText = "{0} lost the bet of {1} on their {2}.".format(playerName, -payout, handName)
+        playerHandSurf = SCOREFONT.render(playerHandText, True, TEXTCOLOR)
+        playerHandRect = playerHandSurf.get_rect(topleft = (posX, posY))
+        posY += LINESPACING12
+        DISPLAYSURF.blit(playerHandSurf, playerHandRect)
+        if tableObj.results[hand] == 'loss':
+            # Now, we have to tell the user if the player should be eliminated.
+            if seat not in settlement['eliminated']:
+                # The player is still solvent.
+                playerStatusText = "This player is still solvent."
+                playerStatusSurf = SCOREFONT.render(playerStatusText, True, TEXTCOLOR)
+                playerStatusRect = playerStatusSurf.get_rect(topleft = (posX, posY))
                 posY += LINESPACING12
-                DISPLAYSURF.blit(playerHandSurf, playerHandRect)
-                # Now, we need to check the player's status. If they busted,
-                # the status must indicated that.
-                if playerStatus:
-                    # Player survived the round.
-                    playerStatusText = "{0} is still solvent.".format(playerName)
-                    playerStatusSurf = SCOREFONT.render(playerStatusText, True, TEXTCOLOR)
-                    playerStatusRect = playerStatusSurf.get_rect(topleft = (posX, posY))
-                    posY += LINESPACING12
-                else: # Player busted their bank.
-                    playerStatusText = "{0} is insolvent and was eliminated.".format(playerName)
-                    playerStatusSurf = PROMPTFONT.render(playerStatusText, True, ELIMINATIONCOLOR, ELIMINATIONBGCOLOR)
-                    playerStatusRect = playerStatusSurf.get_rect(topleft = (posX, posY))
-                    posY += LINESPACING18
-                    eliminatePlayer(seat)
-                    # Reduce the player counter.
-                # The status printout can use a common blit command block.
-                DISPLAYSURF.blit(playerStatusSurf, playerStatusRect)
-                pygame.display.update()
-                pressSpaceToContinue(STATUSBLOCKWIDTH, STATUSBLOCKHEIGHT)
-            # End of hand filter
-        # End of check for occupied seat
-    # End of for loop through HANDLIST
+            else: # The player is insolvent.
+                playerStatusText = "This player is insolvent and was eliminated."
+                playerStatusSurf = PROMPTFONT.render(playerStatusText, True, ELIMINATIONCOLOR, ELIMINATIONBGCOLOR)
+                playerStatusRect = playerStatusSurf.get_rect(topleft = (posX, posY))
+                # The line spacing needs to be greater because PROMPTFONT
+                # is bigger.
+                posY += LINESPACING18
+            DISPLAYSURF.blit(playerStatusSurf, playerStatusRect)
+        pygame.display.update()
+        pressSpaceToContinue(STATUSBLOCKWIDTH, STATUSBLOCKHEIGHT)
+    for seat in settlement['eliminated']:
+        eliminatePlayer(seat)
+    return # showSettlement
+
+def dealerHasBlackjack():
+    """
+    This function collects the user losses due to a dealer blackjack. The
+    dealer's bank collects the lost bets. It returns the number of players
+    remaining in the game.
+    INPUTS: None
+    OUTPUTS: updates tableObj.numPlayers, otherwise none.
+    """
+    # We need to process all of the hands marked "playable". All of them 
+    # are losses for the players in question. tableObj.settle applies them
+    # and the dealer's winnings together. The dealer cannot be eliminated by
+    # wins, but players may be eliminated by their losses; showSettlement
+    # prints them in the status corner and eliminates the insolvent players.
+    settlement = tableObj.settle(playableHandKeys(), dealer_blackjack = True)
+    showSettlement(settlement)
     return # dealerHasBlackjack
 
 def dealerBusts(rounds):
@@ -4201,46 +3852,13 @@ def dealerBusts(rounds):
     INPUTS: rounds, integer current number of the round of play
     OUTPUTS: None. All output is to the game screen.
     """
-    # First, clear the status corner and reset the positionals. We need an
-    # aggregator for the dealer's losses, in case this causes the dealer to
-    # break their bank. We don't need a player counter because none of the
-    # remaining players will be eliminated by winning these hands.
-    clearStatusCorner()
-    posX = LEFTMARGIN
-    posY = TOPMARGIN
-    dealerLosses = 0
-    # We need find and process all of the playable hands.
-    for hand in HANDLIST:
-        seat, handType = hand.split(' ')
-        print("dealerBusts: Status: Looking for playable hands. seat is {0}. handType is {1}. result is {2}.".format(seat, handType, tableObj.results[hand]))
-        if isPlayerStillThere(seat):
-            if tableObj.results[hand] == 'playable':
-                # Change the result to 'win'
-                tableObj.results[hand] = 'win'
-                playerName = tableObj.players[seat].name
-                if handType == 'split':
-                    # This is a split hand.
-                    betAmt = tableObj.players[seat].split_bet
-                    # We do not need a status since players are not eliminated
-                    # for winning bets.
-                    tableObj.players[seat].split_win()
-                else: # This is a regular hand.
-                    betAmt = tableObj.players[seat].bet
-                    tableObj.players[seat].win()
-                dealerLosses += betAmt
-                playerHandText = "{0} won their bet of ${1}.".format(playerName, betAmt)
-                playerHandSurf = SCOREFONT.render(playerHandText, True, TEXTCOLOR)
-                playerHandRect = playerHandSurf.get_rect(topleft = (posX, posY))
-                posY += LINESPACING12
-                DISPLAYSURF.blit(playerHandSurf, playerHandRect)
-                pygame.display.update()
-                pressSpaceToContinue(STATUSBLOCKWIDTH, STATUSBLOCKHEIGHT)
-            # End of hand filter
-        # End of check for occupied seat
-    # End of for loop through HANDLIST
-    # Now, we need to apply the dealer's losses and see if the dealer has
-    # broken their bank.
-    dealerStatus = tableObj.tableDealer.dealer_lost(dealerLosses)
+    # tableObj.settle pays every playable hand and takes the dealer's losses
+    # out of its bank in one step. The dealer's bust total beats no hand; so,
+    # every outcome is a win, and none of the players can be eliminated.
+    settlement = tableObj.settle(playableHandKeys())
+    showSettlement(settlement)
+    # Now, we need to see if the dealer has broken their bank.
+    dealerStatus = settlement['dealer solvent']
     if dealerStatus:
         # The dealer survived busting their hand.
         refreshTable('dealer', rounds)
@@ -4309,9 +3927,8 @@ def endOfRound(rounds):
     gives the user an analysis of the viability of the remaining players to
     help the user decide who to withdraw (if any) at the start of the next
     round. This analysis is similar to the report main() prints out when the
-    user chooses a dealer. The final thing it does is give the user the
-    option to replace the CardShoe. If the CardShoe is down to 100 cards or
-    less, it will do it automatically.
+    user chooses a dealer. The final thing it does is reshuffle the CardShoe
+    if the cut card came out during the round.
     INPUTS: rounds, integer number of the current round
     OUTPUTS: None. All output is to the game screen
     """
@@ -4324,6 +3941,8 @@ def endOfRound(rounds):
             tableObj.players[seat].end_round()
     # Now, run the end_round() method for the Dealer.
     tableObj.tableDealer.end_round()
+    if tableObj.ledger is not None:
+        tableObj.ledger.next_round()
     refreshTable('end', rounds)
     
     # Now, all of the bets, hands, and flags have been reset. The next step
@@ -4378,106 +3997,40 @@ def endOfRound(rounds):
     # End of for loop through seats.
     pressSpaceToContinue(STATUSBLOCKWIDTH, STATUSBLOCKHEIGHT)
 
-    # Now, we need to check the CardShoe to see if it has at least 100 cards
-    # left in it. Each round, the user can ask for a new shoe (six decks of
-    # 52 cards each). When the deck drop to 100 cards, it is replaced
-    # automatically. The replaceDeck boolean allows us to use a common set of
-    # display commands.
-    # The analysis can run fairly far down the screen. So, it is better to
-    # refresh the entire screen this time.
-    refreshTable('end', rounds)
-    posX = LEFTMARGIN
-    posY = TOPMARGIN
-    remainingCards = len(tableObj.deck)
-    replaceDeck = False
-    if remainingCards < 100:
-        deckReplaceTextFirst  = "The casino replaces card shoes below 100"
-        deckReplaceTextSecond = "cards remaining. This one has {0}.".format(remainingCards)
-        deckReplaceTextThird  = "The card shoe will be replaced with a new one."
-        replaceDeck = True
-        # Flipping this flag to True means that the checkForYesNo will be
-        # skipped further below.
-    else:
-        deckReplaceTextFirst  = "The current deck show has {0} card left.".format(remainingCards)
-        deckReplaceTextSecond = "While this is higher than the 100 card"
-        deckReplaceTextThird  = "minimum, I will replace it if you want me to."
-    # Here is the common printout block.
-    deckReplaceSurfFirst  = PROMPTFONT.render(deckReplaceTextFirst, True, TEXTCOLOR)
-    deckReplaceSurfSecond = PROMPTFONT.render(deckReplaceTextSecond, True, TEXTCOLOR)
-    deckReplaceSurfThird  = PROMPTFONT.render(deckReplaceTextThird, True, TEXTCOLOR)
-    deckReplaceRectFirst  = deckReplaceSurfFirst.get_rect(topleft = (posX, posY))
-    posY += LINESPACING18
-    deckReplaceRectSecond = deckReplaceSurfSecond.get_rect(topleft = (posX, posY))
-    posY += LINESPACING18
-    deckReplaceRectThird  = deckReplaceSurfThird.get_rect(topleft = (posX, posY))
-    posY += LINESPACING18
-    DISPLAYSURF.blit(deckReplaceSurfFirst, deckReplaceRectFirst)
-    DISPLAYSURF.blit(deckReplaceSurfSecond, deckReplaceRectSecond)
-    DISPLAYSURF.blit(deckReplaceSurfThird, deckReplaceRectThird)
-    pygame.display.update()
-    if replaceDeck:
-        tableObj.replace_cardshoe()
-        deckReplaceTextFourth = "Deck shoe has been replaced."
-        deckReplaceSurfFourth = PROMPTFONT.render(deckReplaceTextFourth, True, TEXTCOLOR)
-        deckReplaceRectFourth = deckReplaceSurfFourth.get_rect(topleft = (posX, posY))
-        DISPLAYSURF.blit(deckReplaceSurfFourth, deckReplaceRectFourth)
-        pygame.display.update()
-        refreshTable('end', rounds)
-        pressSpaceToContinue(STATUSBLOCKWIDTH, STATUSBLOCKHEIGHT)
-    else: # The user can choose to replace it.
-        deckReplaceTextFourth = "Would like me to replace the deck shoe?"
-        deckReplaceSurfFourth = PROMPTFONT.render(deckReplaceTextFourth, True, TEXTCOLOR)
-        deckReplaceRectFourth = deckReplaceSurfFourth.get_rect(topleft = (posX, posY))
-        DISPLAYSURF.blit(deckReplaceSurfFourth, deckReplaceRectFourth)
-        pygame.display.update()
-        replaceDeck = checkForYesNo(STATUSBLOCKWIDTH, STATUSBLOCKHEIGHT)
-        # Now, we will replace it depending on the players choice. Either way
-        # we need to clear the screen and reset the positionals.
+    # Now, we need to check whether the cut card came out during this round.
+    # If it did, the shoe is reshuffled automatically. The user is no longer
+    # asked about the shoe every round. Where the cut card sits in the shoe
+    # is set by tableObj.shoe_spec. A continuous shuffling machine (CSM)
+    # shoe gets its dealt cards back here instead, with no message.
+    if tableObj.check_cut_card():
+        # The analysis can run fairly far down the screen. So, it is better
+        # to refresh the entire screen this time.
         refreshTable('end', rounds)
         posX = LEFTMARGIN
         posY = TOPMARGIN
-        if replaceDeck:
-            tableObj.replace_cardshoe()
-            deckReplaceTextFifth = "Deck shoe has been replaced."
-        else: # User kept the deck shoe as is.
-            deckReplaceTextFifth = "Deck shoe has not been replaced."
-        # Common display block.
-        deckReplaceSurfFifth = PROMPTFONT.render(deckReplaceTextFifth, True, TEXTCOLOR)
-        deckReplaceRectFifth = deckReplaceSurfFifth.get_rect(topleft = (posX, posY))
-        DISPLAYSURF.blit(deckReplaceSurfFifth, deckReplaceRectFifth)
+        deckReplaceTextFirst  = "The cut card came out this round."
+        deckReplaceTextSecond = "The card shoe has been reshuffled. It has"
+        deckReplaceTextThird  = "{0} cards again.".format(len(tableObj.deck))
+        deckReplaceSurfFirst  = PROMPTFONT.render(deckReplaceTextFirst, True, TEXTCOLOR)
+        deckReplaceSurfSecond = PROMPTFONT.render(deckReplaceTextSecond, True, TEXTCOLOR)
+        deckReplaceSurfThird  = PROMPTFONT.render(deckReplaceTextThird, True, TEXTCOLOR)
+        deckReplaceRectFirst  = deckReplaceSurfFirst.get_rect(topleft = (posX, posY))
+        posY += LINESPACING18
+        deckReplaceRectSecond = deckReplaceSurfSecond.get_rect(topleft = (posX, posY))
+        posY += LINESPACING18
+        deckReplaceRectThird  = deckReplaceSurfThird.get_rect(topleft = (posX, posY))
+        DISPLAYSURF.blit(deckReplaceSurfFirst, deckReplaceRectFirst)
+        DISPLAYSURF.blit(deckReplaceSurfSecond, deckReplaceRectSecond)
+        DISPLAYSURF.blit(deckReplaceSurfThird, deckReplaceRectThird)
         pygame.display.update()
         pressSpaceToContinue(STATUSBLOCKWIDTH, STATUSBLOCKHEIGHT)
     
     # Finally, we need to return the hand results to None.
-    for hand in HANDLIST:
+    for hand in tableObj.hand_list:
         tableObj.results[hand] = None
     print("endOfRound: Hand Results are now {0}.".format(tableObj.results))
     return # endOfRound
 
-def updatePlayerData():
-    """
-    This function keeps the player bank data in sync between listPlayers and
-    tableObj.players. deletePlayer handles all player removals from the
-    listPlayers global object. removeActivePlayer keeps the removed player's
-    bank updated, and their experience level. playersWinGame will level up
-    any players still in the game when the dealer's bank is broken.
-    INPUTS: None. All data is in global objects.
-    OUTPUTS: None. All changes are made to listPlayers, a global object.
-    """
-    for seat in TABLESEATS:
-        if isPlayerStillThere(seat):
-            playerName = tableObj.players[seat].name
-            playerBank = tableObj.players[seat].bank
-            for i in range(0, len(listPlayers)):
-                # We only update players who are still seated. Other functions
-                # do the updates for withdrawn or eliminated players.
-                listName = listPlayers[i]['name']
-                if playerName == listName:
-                    listPlayers[i]['bank'] = playerBank
-                    print("updatePlayerData: Status: Match found for Player {0}.".format(playerName))
-                    print("updatePlayerData: Status: {0} now has a bank of ${1}.".format(listName, listPlayers[i]['bank']))
-    return
-
 def playersWinGame(rounds):
     """
     This function levels up all of the players still seated when the dealer's
@@ -4499,7 +4052,8 @@ def playersWinGame(rounds):
         tableLevel = 3
     else: # type == 'high'
         tableLevel = 4
-    winnersAward = 1000 * ((dieRoll(6, 1, 6) + dieRoll(6, 1, 6)) ** tableLevel)
+    awardStream = gameStreams.stream('awards')
+    winnersAward = 1000 * ((dieRoll(6, 1, 6, rng = awardStream) + dieRoll(6, 1, 6, rng = awardStream)) ** tableLevel)
     refreshTable('post-game', rounds) 
     posX = LEFTMARGIN
     posY = TOPMARGIN
@@ -4515,13 +4069,13 @@ def playersWinGame(rounds):
     pygame.display.update()
     pressSpaceToContinue(STATUSBLOCKWIDTH, STATUSBLOCKHEIGHT)
 
-    # Second, we update the player's banks, including adding this award. This
-    # will migrate the increased banks to listPlayers. The pressSpaceToContinue
+    # Second, we update the player's banks, including adding this award.
+    # listPlayers reads the seated players' banks from their Player objects;
+    # so, it already has the increased banks. The pressSpaceToContinue
     # makes the screen reflect the award given to the players.
     for seat in TABLESEATS:
         if isPlayerStillThere(seat):
             tableObj.players[seat].bank += winnersAward
-    updatePlayerData()
     refreshTable('post-game', rounds)
     pressSpaceToContinue(STATUSBLOCKWIDTH, STATUSBLOCKHEIGHT)    
 
@@ -4530,21 +4084,10 @@ def playersWinGame(rounds):
     # left in the game at the time the dealer broke its bank,
     for seat in TABLESEATS:
         if isPlayerStillThere(seat):
-            # Find the player in listPlayers.
-            playerName = tableObj.players[seat].name
-            for i in range(0, len(listPlayers)):
-                listName = listPlayers[i]['name']
-                if listName == playerName:
-                    # Now, we check the player's skill level and raise to
-                    # the next level, if a new level exists.
-                    playerSkill = listPlayers[i]['skill']
-                    if playerSkill == 'starter':
-                        listPlayers[i]['skill'] = 'normal'
-                    elif playerSkill == 'normal':
-                        listPlayers[i]['skill'] = 'special'
-                    elif playerSkill == 'special':
-                        listPlayers[i]['skill'] = 'high'
-                    # There is no higher sklll than high roller currently.
+            # listPlayers finds the player by name and raises them to the
+            # next level, if a new level exists. There is no higher skill
+            # than high roller currently.
+            listPlayers.promote(tableObj.players[seat].name)
     writeAttempt = writeSavedGame(listPlayers)
     # Clear the screen.
     DISPLAYSURF.fill(BLACK)
@@ -4989,13 +4532,8 @@ def deletePlayer(playerName):
     INPUTS: playerName, string
     OUTPUTS: None. All changes are made to listPlayers, a global object.
     """
-    # The reason we have to search listPlayers is that it is a list of
-    # dictionary objects with keys 'name', 'bank', and 'skill'. We need the
-    # index of the player object to remove it.
-    for i in range(0, len(listPlayers)):
-        if playerName == listPlayers[i]['name']:
-            listPlayers.pop(i)
-            break
+    # listPlayers is indexed by name; so, there is nothing to search for.
+    listPlayers.remove(playerName)
     return
 
 if __name__ == '__main__':
@@ -0,0 +1,295 @@
+from __future__ import print_function
+
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+from array import array
+
+from lib import CardShoe, RandomStream, ShoePool, HAVENUMPY, shuffled_shoes
+from lib.ShoeBatch import CODERANKS
+
+__doc__ = """
+This script benchmarks the card shoes used by the game and the simulations.
+For each shoe mode it measures shoes per second and cards per second, and it
+checks that the cards come out uniformly random:
+    chi-square: counts of each rank at each position of the shoe, against
+        the equal share every rank should get at every position
+    serial correlation: the lag 1 correlation of the ranks of consecutive
+        cards. Dealing without replacement makes it slightly negative,
+        -1 / (cards - 1) per position pair on average; anything far from
+        that is a problem.
+The results are printed and written as JSON to the --output file.
+
+Modes:
+    'pick and delete' : the original CardShoe algorithm, picking a random
+                        card out of a sequential list and deleting it, then
+                        dealing with pop(0) like the original remove_top.
+                        It is kept here only as the baseline.
+    'lazy'            : CardShoe, picking each card as it is dealt
+    'pre-shuffled'    : CardShoe after finish_shuffle()
+    'csm'             : a continuous shuffling machine shoe, returning the
+                        dealt cards every CSMROUNDCARDS cards
+    'pool'            : shoes taken from a ShoePool, shuffled by its worker
+    'numpy batch'     : ShoeBatch.shuffled_shoes (needs numpy)
+
+Usage:
+    python ShoeBenchmark.py [--shoes N] [--decks D] [--seed S]
+                            [--modes MODE ...] [--output FILE]
+"""
+
+MODES = ('pick and delete', 'lazy', 'pre-shuffled', 'csm', 'pool', 'numpy batch')
+DEFAULTSHOES  = 2000
+DEFAULTDECKS  = 6
+DEFAULTOUTPUT = 'shoe-benchmark.json'
+CSMROUNDCARDS = 20
+NUMPYBATCH    = 1000
+NUMRANKS      = len(CardShoe.ranks)
+
+
+def pickAndDeleteShoe(decks, rng):
+    """
+    This function is the original CardShoe shuffle: a sequential list of
+    (rank, suit) tuples, with a random card picked and deleted until the
+    list is empty. It returns the shuffled list of card tuples.
+    """
+    deck = []
+    for i in xrange(0, decks):
+        for suit in CardShoe.suits:
+            for rank in CardShoe.ranks:
+                deck.append((rank, suit))
+    shuffled = []
+    while len(deck) > 0:
+        pick = rng.randint(0, len(deck) - 1)
+        shuffled.append(deck[pick])
+        del deck[pick]
+    return shuffled
+
+
+def rankIndexes(cards):
+    """
+    This function turns a list of card codes into a list of rank indexes
+    (0-12) for the uniformity checks. The original algorithm deals card
+    tuples (rank, suit); those are looked up by rank instead.
+    """
+    if cards and isinstance(cards[0], tuple):
+        rankIndex = dict([(rank, i) for i, rank in enumerate(CardShoe.ranks)])
+        return [rankIndex[rank] for rank, suit in cards]
+    codeRanks = CardShoe.code_ranks
+    return [codeRanks[code] for code in cards]
+
+
+def generateShoes(mode, shoes, decks, seed, extras):
+    """
+    This generator yields shoes dealt out in mode, as a sequence of rank
+    indexes per shoe. The cards are dealt inside the timed part; turning them
+    into rank indexes is cheap next to that and the same for every mode.
+    It yields (ranks, seconds spent dealing that shoe). Anything else worth
+    reporting for the mode, like the pool counters, is stored in the dict
+    extras.
+    """
+    rng = RandomStream(seed).stream(mode)
+    if mode == 'pick and delete':
+        for i in xrange(0, shoes):
+            start = time.time()
+            shuffled = pickAndDeleteShoe(decks, rng)
+            cards = [shuffled.pop(0) for j in xrange(0, len(shuffled))]
+            elapsed = time.time() - start
+            yield rankIndexes(cards), elapsed
+    elif mode in ('lazy', 'pre-shuffled'):
+        shoe = CardShoe(decks, rng = rng)
+        for i in xrange(0, shoes):
+            start = time.time()
+            if mode == 'pre-shuffled':
+                shoe.finish_shuffle()
+            removeTop = shoe.remove_top
+            cards = [removeTop() for j in xrange(0, shoe.length)]
+            shoe.reshuffle()
+            elapsed = time.time() - start
+            yield rankIndexes(cards), elapsed
+    elif mode == 'csm':
+        # A CSM shoe is never dealt out. A "shoe" here is one shoe's worth of
+        # cards dealt in rounds of CSMROUNDCARDS, with the cards returned
+        # after every round.
+        shoe = CardShoe(decks, rng = rng, csm = True)
+        for i in xrange(0, shoes):
+            start = time.time()
+            cards = []
+            while len(cards) < shoe.length:
+                for j in xrange(0, min(CSMROUNDCARDS, shoe.length - len(cards))):
+                    cards.append(shoe.remove_top())
+                shoe.return_dealt()
+            elapsed = time.time() - start
+            yield rankIndexes(cards), elapsed
+    elif mode == 'pool':
+        pool = ShoePool(decks = decks, rng = rng)
+        shoe = pool.get()
+        for i in xrange(0, shoes):
+            start = time.time()
+            removeTop = shoe.remove_top
+            cards = [removeTop() for j in xrange(0, shoe.length)]
+            pool.put_back(shoe)
+            shoe = pool.get()
+            elapsed = time.time() - start
+            yield rankIndexes(cards), elapsed
+        extras['pool'] = pool.stats()
+        pool.stop()
+    elif mode == 'numpy batch':
+        done = 0
+        while done < shoes:
+            count = min(NUMPYBATCH, shoes - done)
+            start = time.time()
+            batch = shuffled_shoes(count, decks, rng)
+            elapsed = time.time() - start
+            ranks = CODERANKS[batch]
+            for row in ranks:
+                yield row.tolist(), elapsed / count
+            done += count
+    else:
+        raise ValueError("generateShoes: unknown mode {0}.".format(mode))
+
+
+def chiSquare(positionCounts, shoes):
+    """
+    This function returns the chi-square statistic, its degrees of freedom,
+    and an approximate p-value for the position by rank counts. Every rank is
+    1/13 of the shoe; so, the expected count in every cell is shoes / 13.
+    The p-value uses the Wilson-Hilferty normal approximation, which is very
+    close for the thousands of degrees of freedom involved.
+    """
+    expected = shoes / float(NUMRANKS)
+    statistic = 0.0
+    for counts in positionCounts:
+        for observed in counts:
+            statistic += (observed - expected) ** 2 / expected
+    dof = len(positionCounts) * (NUMRANKS - 1)
+    z = ((statistic / dof) ** (1.0 / 3) - (1 - 2.0 / (9 * dof))) / math.sqrt(2.0 / (9 * dof))
+    pValue = 0.5 * math.erfc(z / math.sqrt(2))
+    return statistic, dof, pValue
+
+
+def serialCorrelation(sums):
+    """
+    This function returns the lag 1 Pearson correlation from the running sums
+    collected over every pair of consecutive cards.
+    """
+    n, sumX, sumY, sumXX, sumYY, sumXY = sums
+    covariance = sumXY / n - (sumX / n) * (sumY / n)
+    varianceX = sumXX / n - (sumX / n) ** 2
+    varianceY = sumYY / n - (sumY / n) ** 2
+    if varianceX <= 0 or varianceY <= 0:
+        return 0.0
+    return covariance / math.sqrt(varianceX * varianceY)
+
+
+def shoeBytes(mode, decks):
+    """
+    This function estimates the memory one shoe holds while it is dealt: the
+    card list and its tuples for the original algorithm, or the card code
+    array for CardShoe.
+    """
+    cards = CardShoe.deck_size * decks
+    if mode == 'pick and delete':
+        sample = pickAndDeleteShoe(decks, random)
+        return sys.getsizeof(sample) + sum([sys.getsizeof(card) for card in set(sample)])
+    if mode == 'numpy batch':
+        return cards
+    return sys.getsizeof(array('B', [0] * cards))
+
+
+def benchmarkMode(mode, shoes, decks, seed):
+    """
+    This function runs one mode and returns a dict with its throughput and
+    uniformity results.
+    """
+    cards = CardShoe.deck_size * decks
+    positionCounts = [[0] * NUMRANKS for i in xrange(0, cards)]
+    sums = [0.0] * 6
+    dealing = 0.0
+    extras = {}
+    for ranks, elapsed in generateShoes(mode, shoes, decks, seed, extras):
+        dealing += elapsed
+        for position, rank in enumerate(ranks):
+            positionCounts[position][rank] += 1
+        previous = ranks[:-1]
+        following = ranks[1:]
+        sums[0] += len(previous)
+        sums[1] += sum(previous)
+        sums[2] += sum(following)
+        sums[3] += sum([x * x for x in previous])
+        sums[4] += sum([y * y for y in following])
+        sums[5] += sum([x * y for x, y in zip(previous, following)])
+    statistic, dof, pValue = chiSquare(positionCounts, shoes)
+    result = {'mode'                 : mode,
+              'shoes'                : shoes,
+              'cards per shoe'       : cards,
+              'seconds'              : dealing,
+              'shoes per second'     : shoes / dealing if dealing else None,
+              'cards per second'     : shoes * cards / dealing if dealing else None,
+              'bytes per shoe'       : shoeBytes(mode, decks),
+              'chi-square'           : statistic,
+              'chi-square dof'       : dof,
+              'chi-square p-value'   : pValue,
+              'serial correlation'   : serialCorrelation(sums),
+              'expected correlation' : -1.0 / (cards - 1)}
+    result.update(extras)
+    return result
+
+
+def printResult(result):
+    """
+    This function prints one mode's results as a short table row.
+    """
+    print("{0:<16} {1:>12,.0f} shoes/s {2:>14,.0f} cards/s {3:>8,} bytes  "
+          "chi2 p={4:.3f}  r1={5:+.4f} (expect {6:+.4f})".format(result['mode'],
+                                                               result['shoes per second'] or 0,
+                                                               result['cards per second'] or 0,
+                                                               result['bytes per shoe'],
+                                                               result['chi-square p-value'],
+                                                               result['serial correlation'],
+                                                               result['expected correlation']))
+    return
+
+
+def main():
+    parser = argparse.ArgumentParser(description = 'Benchmark CardShoe throughput and uniformity.')
+    parser.add_argument('--shoes', type = int, default = DEFAULTSHOES,
+                        help = 'shoes dealt per mode (default {0})'.format(DEFAULTSHOES))
+    parser.add_argument('--decks', type = int, default = DEFAULTDECKS,
+                        help = 'decks per shoe (default {0})'.format(DEFAULTDECKS))
+    parser.add_argument('--seed', type = int, default = None,
+                        help = 'root seed; a random one is used and reported if omitted')
+    parser.add_argument('--modes', nargs = '+', choices = MODES, default = None,
+                        help = 'modes to run (default: all that are available)')
+    parser.add_argument('--output', default = DEFAULTOUTPUT,
+                        help = 'JSON report file (default {0})'.format(DEFAULTOUTPUT))
+    args = parser.parse_args()
+
+    modes = args.modes or [mode for mode in MODES if mode != 'numpy batch' or HAVENUMPY]
+    if 'numpy batch' in modes and not HAVENUMPY:
+        parser.error("the 'numpy batch' mode needs numpy.")
+    seed = args.seed
+    if seed is None:
+        seed = RandomStream().root_seed
+
+    report = {'python'  : platform.python_version(),
+              'machine' : platform.machine(),
+              'seed'    : seed,
+              'decks'   : args.decks,
+              'results' : []}
+    print("ShoeBenchmark: {0} shoes of {1} decks per mode, seed {2}.".format(args.shoes, args.decks, seed))
+    for mode in modes:
+        result = benchmarkMode(mode, args.shoes, args.decks, seed)
+        printResult(result)
+        report['results'].append(result)
+
+    with open(args.output, 'w') as reportFile:
+        json.dump(report, reportFile, indent = 2, sort_keys = True)
+    print("ShoeBenchmark: report written to {0}.".format(args.output))
+    return
+
+if __name__ == '__main__':
+    main()
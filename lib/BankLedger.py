@@ -0,0 +1,273 @@
+from __future__ import print_function
+import os, struct
+
+__doc__ = """
+This module keeps an append-only ledger of every change to a Player's or a
+Dealer's bank. Each change is one fixed width record packed into an
+in-memory ring buffer. Nothing is printed or written per change; the buffer
+is written to the ledger file in one block when it fills up, or when flush()
+is called. With no file, the ring keeps the latest records and drops the
+oldest ones.
+
+Record layout (RECORD, RECORDSIZE bytes, little endian):
+    round   4 bytes  unsigned, the round the change happened in
+    seat    1 byte   0 for the dealer, 1-3 for the table seats (see
+                     CasinoTable.TABLESEATS), NOSEAT if unknown
+    hand    1 byte   index of the hand in Player.hands, NOHAND if the change
+                     is not for a hand (insurance, dealer totals, awards)
+    kind    1 byte   index of the kind of change in KINDS
+    padding 1 byte
+    amount  8 bytes  signed change to the bank in dollars
+
+Ledger file layout:
+    Header (HEADERSIZE bytes): MAGIC, VERSION, and RECORDSIZE
+    Records: RECORDSIZE bytes each, in the order they were made
+
+Every transfer between a player and the dealer is recorded on both sides;
+so, the amounts of one round add up to zero. audit() reports the rounds
+where they do not. 'adjust' records are bank changes made from outside the
+Player methods, such as the awards at the end of a game; they are left out
+of the audit.
+
+Classes:
+    BankLedger: the ring buffer and its ledger file
+"""
+
+MAGIC = b'BJLEDGR\x01'
+VERSION = 1
+HEADER = struct.Struct('<8sHH')
+HEADERSIZE = 16
+RECORD = struct.Struct('<IBBBxq')
+RECORDSIZE = RECORD.size
+NOSEAT = 255
+NOHAND = 255
+
+# The kinds of bank changes. A record stores the index into this tuple.
+KINDS = ('blackjack', 'win', 'loss', 'tie', 'insurance', 'dealer won', 'dealer lost', 'adjust')
+KINDCODES = dict([(kind, code) for code, kind in enumerate(KINDS)])
+
+
+def _read_header(fileObj, filename):
+    fileObj.seek(0)
+    data = fileObj.read(HEADERSIZE)
+    if len(data) < HEADERSIZE:
+        raise ValueError("{0} is too short to be a bank ledger.".format(filename))
+    magic, version, recordSize = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION or recordSize != RECORDSIZE:
+        raise ValueError("{0} is not a version {1} bank ledger.".format(filename, VERSION))
+    return
+
+
+def _decode(record):
+    roundNumber, seat, hand, kind, amount = record
+    return (roundNumber, seat, hand, KINDS[kind], amount)
+
+
+class BankLedger(object):
+    '''
+    This class is the ledger shared by a table's players and dealer. A
+    CasinoTable hands it to them with attach_ledger(); the Player and Dealer
+    bank methods then call post() for every change to a bank.
+
+    Class Order Attributes:
+        DEFAULTCAPACITY: the number of records the ring buffer holds if no
+            capacity is given
+
+    Attributes:
+        filename: path of the ledger file, or None to keep records in memory
+            only
+        capacity: the number of records the ring buffer holds
+        buffer: bytearray of capacity records
+        count: the number of records in the buffer
+        start: the buffer slot of the oldest record
+        written: the number of records written to the file
+        dropped: the number of records overwritten because the buffer was
+            full and there is no file
+        round: the round stamped on new records
+        totals: dict {seat: net change in dollars} over every record posted,
+            the per-seat profit and loss of the session
+
+    Methods:
+        __init__: sets up the buffer and opens or creates the ledger file
+        __len__: returns the number of records posted and kept
+        __str__: returns a string with the record counts
+        post: appends one record
+        next_round: moves new records to the next round
+        flush: writes the buffered records to the file in one block
+        records: returns every kept record as tuples
+        audit: returns the rounds whose records do not add up to zero
+        read: (static) returns every record in a ledger file
+        close: flushes and closes the ledger file
+        diagnostic_print: prints out the ledger's attributes
+    '''
+    DEFAULTCAPACITY = 4096
+
+    def __init__(self, filename = None, capacity = None, first_round = 1):
+        '''
+        INPUTS:
+            filename: path of the ledger file. An existing ledger is appended
+                to, starting at the round after its last record; so, the
+                rounds of every session stay apart. None keeps the records
+                in memory only.
+                Default: None
+            capacity: integer, the number of records buffered before they are
+                written to the file
+                Default: None (uses DEFAULTCAPACITY)
+            first_round: integer, the round stamped on the first records, or
+                the lowest one when an existing ledger is appended to
+                Default: 1
+        '''
+        if capacity is None:
+            capacity = BankLedger.DEFAULTCAPACITY
+        if (type(capacity) not in (int, long)) or (capacity < 1):
+            raise ValueError("BankLedger: capacity must be a positive integer, not {0}.".format(capacity))
+        self.filename = filename
+        self.capacity = capacity
+        self.buffer = bytearray(capacity * RECORDSIZE)
+        self.count = 0
+        self.start = 0
+        self.written = 0
+        self.dropped = 0
+        self.round = first_round
+        self.totals = {}
+        self.fileObj = None
+        if filename is not None:
+            if os.path.exists(filename) and os.path.getsize(filename) > 0:
+                self.fileObj = open(filename, 'r+b')
+                _read_header(self.fileObj, filename)
+                self.fileObj.seek(0, os.SEEK_END)
+                self.written = (self.fileObj.tell() - HEADERSIZE) // RECORDSIZE
+                if self.written > 0:
+                    self.fileObj.seek(HEADERSIZE + (self.written - 1) * RECORDSIZE)
+                    lastRound = RECORD.unpack(self.fileObj.read(RECORDSIZE))[0]
+                    self.round = max(first_round, lastRound + 1)
+            else:
+                self.fileObj = open(filename, 'w+b')
+                header = HEADER.pack(MAGIC, VERSION, RECORDSIZE)
+                self.fileObj.write(header + b'\x00' * (HEADERSIZE - len(header)))
+
+    def __len__(self):
+        return self.written + self.count
+
+    def __str__(self):
+        return "Bank Ledger: {0} records ({1} written, {2} buffered, {3} dropped), round {4}.".format(
+               len(self), self.written, self.count, self.dropped, self.round)
+
+    def post(self, seat, hand, kind, amount):
+        '''
+        This method appends one record for a change of amount dollars to the
+        bank of seat. kind is one of KINDS. It is the only work done per bank
+        change: one struct.pack_into into the buffer and one dict update. A
+        full buffer is written to the file first, or loses its oldest record
+        if there is no file. It returns no values.
+        '''
+        if self.count == self.capacity:
+            if self.fileObj is not None:
+                self.flush()
+            else:
+                self.start = (self.start + 1) % self.capacity
+                self.count -= 1
+                self.dropped += 1
+        slot = (self.start + self.count) % self.capacity
+        RECORD.pack_into(self.buffer, slot * RECORDSIZE, self.round, seat, hand, KINDCODES[kind], amount)
+        self.count += 1
+        self.totals[seat] = self.totals.get(seat, 0) + amount
+        return
+
+    def next_round(self):
+        '''
+        This method moves the ledger on to the next round. It returns the new
+        round number.
+        '''
+        self.round += 1
+        return self.round
+
+    def flush(self):
+        '''
+        This method writes every buffered record to the ledger file in one
+        write and empties the buffer. Without a file, it does nothing. It
+        returns the number of records written.
+        '''
+        if self.fileObj is None or self.count == 0:
+            return 0
+        first = self.start * RECORDSIZE
+        last = (self.start + self.count) * RECORDSIZE
+        self.fileObj.seek(0, os.SEEK_END)
+        if last <= len(self.buffer):
+            self.fileObj.write(self.buffer[first:last])
+        else:
+            # The records wrap around the end of the buffer.
+            self.fileObj.write(self.buffer[first:] + self.buffer[:last - len(self.buffer)])
+        self.fileObj.flush()
+        written = self.count
+        self.written += written
+        self.start = 0
+        self.count = 0
+        return written
+
+    def records(self):
+        '''
+        This method returns a list of tuples (round, seat, hand, kind,
+        amount), with kind as its name, for every record kept: the ones in
+        the file followed by the ones still in the buffer.
+        '''
+        if self.fileObj is not None:
+            self.fileObj.flush()
+            result = BankLedger.read(self.filename)
+        else:
+            result = []
+        for i in xrange(0, self.count):
+            slot = (self.start + i) % self.capacity
+            result.append(_decode(RECORD.unpack_from(self.buffer, slot * RECORDSIZE)))
+        return result
+
+    def audit(self):
+        '''
+        This method adds up the amounts of every kept record by round, leaving
+        out 'adjust' records. Transfers between players and the dealer cancel
+        out; so, the bank is conserved in every round that adds up to zero.
+        It returns a dict {round: imbalance} of the rounds that do not. An
+        empty dict means the ledger balances.
+        '''
+        sums = {}
+        for roundNumber, seat, hand, kind, amount in self.records():
+            if kind != 'adjust':
+                sums[roundNumber] = sums.get(roundNumber, 0) + amount
+        return dict([(roundNumber, total) for roundNumber, total in sums.items() if total != 0])
+
+    @staticmethod
+    def read(filename):
+        '''
+        This method returns every record in the ledger file filename as a
+        list of tuples (round, seat, hand, kind, amount).
+        '''
+        fileObj = open(filename, 'rb')
+        try:
+            _read_header(fileObj, filename)
+            data = fileObj.read()
+        finally:
+            fileObj.close()
+        records = len(data) // RECORDSIZE
+        return [_decode(RECORD.unpack_from(data, i * RECORDSIZE)) for i in xrange(0, records)]
+
+    def close(self):
+        '''
+        This method writes any buffered records and closes the ledger file.
+        It returns no values.
+        '''
+        if self.fileObj is not None and not self.fileObj.closed:
+            self.flush()
+            self.fileObj.close()
+        return
+
+    def diagnostic_print(self):
+        '''
+        This method prints out the attributes of the ledger for debugging.
+        '''
+        print("Ledger file: ", self.filename)
+        print("Buffer capacity: ", self.capacity)
+        print("Records written, buffered, dropped: ", self.written, self.count, self.dropped)
+        print("Current round: ", self.round)
+        print("Totals by seat: ", self.totals)
+        return
+
@@ -0,0 +1,513 @@
+from __future__ import print_function
+import time
+from BlackjackClasses import CardShoe, CasinoTable
+from ShoeBatch import HAVENUMPY, CODERANKS, shuffled_shoes, numpy_random_state
+from StrategyPolicies import MimicDealer, PAIRS, UPCARDS
+
+# NumPy is only needed for batch play, like ShoeBatch. The game itself runs
+# without it; so, the import failing is not an error until a BatchEngine is
+# built.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+__doc__ = """
+This module plays many independent rounds of Blackjack at once with NumPy.
+A BatchEngine is a row of lanes, and every lane is a table of its own: its
+own shoe (one row of ShoeBatch.shuffled_shoes), its own dealer's bank, and
+its own round in play. One step plays one round in every lane. The hands,
+totals, Ace flags, bets, and statuses of every lane live in arrays, and
+every step of a round is a handful of array operations over the lanes it
+concerns instead of a call per Player object.
+
+The rules are RoundEngine's, played in the same order and dealing the cards
+in the same order. So, a lane dealt from a shoe row and a CasinoTable dealt
+from the same row with load_shoe play the same round:
+    * every seat antes the table minimum
+    * two passes of the deal, the dealer's first card face down. Player
+      blackjacks are paid right away.
+    * insurance is offered when the dealer shows an Ace or a 10 value card
+    * pairs are split, and re-split, as the table's split rules allow, with
+      the split hand bet the same as the regular hand
+    * a playable hand may raise its bet by the original bet, and then goes on
+      hitting (this game's double down)
+    * hands hit or stand; busted hands are lost right away
+    * the dealer stands on a hard 17 or more, or on a soft score over 16 that
+      beats the weakest live player hand, as in CasinoTable.dealer_turn
+    * every hand still in play is settled as in settle_hands
+Player decisions are lookups in the compiled arrays of a TablePolicy, indexed
+by StrategyPolicies.decision_index for every lane at once.
+
+Differences from a CasinoTable: the players' banks are taken to cover every
+bet (the simulator seats players with very large banks), so nobody sits out
+or is eliminated; and a lane's dealer is only checked for a broken bank at
+the end of each round.
+
+Hand statuses (STATUSES):
+    EMPTY     : no cards
+    PLAYABLE  : still in play
+    BUST      : busted and lost to the dealer
+    BLACKJACK : 21 on two cards on the regular hand after a split. It is not
+                live for the dealer's stand rule, but is settled like any
+                other hand.
+    PAID      : a natural blackjack, paid out and cleared after the deal
+
+Classes:
+    BatchEngine: the lanes and their rounds
+
+NumPy is optional. If it is not installed, HAVENUMPY is False and building a
+BatchEngine raises ImportError.
+"""
+
+EMPTY, PLAYABLE, BUST, BLACKJACK, PAID = range(0, 5)
+STATUSES = ('empty', 'playable', 'bust', 'blackjack', 'paid')
+
+if HAVENUMPY:
+    RANKVALUES = numpy.minimum(numpy.arange(len(CardShoe.ranks)) + 1, 10)
+else:
+    RANKVALUES = None
+
+
+class BatchEngine(object):
+    '''
+    This class plays rounds in many lanes at once. Every lane is an
+    independent table with the same configuration. The per hand arrays have
+    the shape (lanes, seats, max hands); the per seat arrays (lanes, seats);
+    and the dealer's arrays (lanes,).
+
+    Class Order Attributes:
+        DEFAULTLANES: the number of lanes if none is given
+
+    Attributes:
+        lanes: the number of lanes
+        seats: the seats played, in table order, as in CasinoTable.TABLESEATS
+        policies: the TablePolicy of each seat, in the order of seats
+        min_bet, max_bet: the table bets
+        blackjack_multiplier: ('ratio', float), as in CasinoTable
+        winnings: the payout of a natural blackjack on the table minimum
+        insurance: list of the insurance bet of each seat when it is offered
+        shoe_spec, split_rules: as in CasinoTable
+        cut_card: the number of cards a shoe deals before it is reshuffled
+        rng: the numpy.random.RandomState the shoes are shuffled with
+        shoes: (lanes, cards) array of card codes, one shoe per lane
+        cursor: the position of the next card in each lane's shoe
+        round_start: the position of the first card of the round in play in
+            each lane's shoe. The cards in front of it are discards.
+        exhausted: True for each lane whose shoe ran out during the round
+            and had its discards put back, as in CardShoe._deal_discards
+        dealer_banks: the dealer's bank in each lane
+        broke: True for each lane whose dealer's bank has been broken
+        rounds: the number of rounds played in each lane
+        hard, ace, cards, first, second, status, bet, raised: per hand, the
+            hard score, whether it holds an Ace, its number of cards, the
+            ranks of its first two cards, its status (STATUSES), its bet, and
+            whether the raise was offered
+        hand_count: per seat, the number of hands in play
+        net: per seat, the change to the player's bank this round
+        dealer_hard, dealer_ace, dealer_cards, upcard: the dealer's hard
+            score, Ace flag, number of cards, and visible card's rank
+
+    Methods:
+        __init__: sets up the lanes, their shoes, and the policies
+        play: plays rounds in the lanes and returns the counts
+        play_round: plays one round in the first count lanes
+        diagnostic_print: prints out the engine's configuration
+    '''
+    DEFAULTLANES = 50000
+
+    def __init__(self,
+                 lanes = None,
+                 policy = None,
+                 players = 3,
+                 min_bet = 5,
+                 max_bet = 100,
+                 blackjack_multiplier = ('3:2', 1.50),
+                 dealerBank = 100000,
+                 shoe_spec = None,
+                 split_rules = None,
+                 insurance = None,
+                 rng = None):
+        '''
+        INPUTS:
+            lanes: integer, the number of lanes
+                Default: None (DEFAULTLANES)
+            policy: a TablePolicy (class or object) for every seat, or a dict
+                {seat: TablePolicy}
+                Default: None (MimicDealer, which plays like the default
+                Policy of RoundEngine)
+            players: integer, the number of seats played, 1-3
+                Default: 3
+            min_bet, max_bet, blackjack_multiplier, dealerBank, shoe_spec,
+            split_rules: as in CasinoTable.__init__
+            insurance: the insurance bet every seat places when it is
+                offered, or a dict {seat: bet}. It must be at most max_bet.
+                Default: None (no insurance)
+            rng: seed, RandomStream, RandomState, or None. See
+                ShoeBatch.numpy_random_state.
+                Default: None
+        Bad arguments raise a ValueError.
+        '''
+        if not HAVENUMPY:
+            raise ImportError("BatchEngine: numpy is required for batch play.")
+        if lanes is None:
+            lanes = BatchEngine.DEFAULTLANES
+        if (type(lanes) not in (int, long)) or (lanes < 1):
+            raise ValueError("BatchEngine: lanes must be a positive integer, not {0}.".format(lanes))
+        if players not in (1, 2, 3):
+            raise ValueError("BatchEngine: players must be 1, 2, or 3, not {0}.".format(players))
+        self.lanes = lanes
+        self.seats = [CasinoTable.TABLESEATS[str(i + 1)] for i in xrange(0, players)]
+        if not isinstance(policy, dict):
+            policy = dict([(seat, policy) for seat in self.seats])
+        self.policies = [policy.get(seat) or MimicDealer for seat in self.seats]
+        self.split_tables  = [numpy.array(p.split_table, dtype = numpy.uint8) for p in self.policies]
+        self.double_tables = [numpy.array(p.double_table, dtype = numpy.uint8) for p in self.policies]
+        self.hit_tables    = [numpy.array(p.hit_table, dtype = numpy.uint8) for p in self.policies]
+
+        self.min_bet = min_bet
+        self.max_bet = max_bet
+        self.blackjack_multiplier = blackjack_multiplier
+        self.winnings = int(min_bet * blackjack_multiplier[1])
+        if not isinstance(insurance, dict):
+            insurance = dict([(seat, insurance or 0) for seat in self.seats])
+        self.insurance = [int(insurance.get(seat, 0)) for seat in self.seats]
+        for bet in self.insurance:
+            if not (0 <= bet <= max_bet):
+                raise ValueError("BatchEngine: an insurance bet must be from 0 to {0}, not {1}.".format(max_bet, bet))
+
+        # The shoe geometry and the split rules are checked the same way as
+        # at a CasinoTable.
+        self.shoe_spec = dict(CasinoTable.SHOESPEC)
+        if shoe_spec is not None:
+            self.shoe_spec.update(shoe_spec)
+        geometry = CardShoe(self.shoe_spec['decks'], self.shoe_spec['penetration'],
+                            self.shoe_spec['cut card'], csm = self.shoe_spec['csm'])
+        self.cut_card = geometry.cut_card
+        self.split_rules = dict(CasinoTable.SPLITRULES)
+        if split_rules is not None:
+            self.split_rules.update(split_rules)
+        maxHands = self.split_rules['max hands']
+        if (type(maxHands) not in (int, long)) or (maxHands < 2):
+            raise ValueError("BatchEngine: 'max hands' must be an integer of at least 2, not {0}.".format(maxHands))
+
+        self.rng = numpy_random_state(rng)
+        self.shoes = shuffled_shoes(lanes, self.shoe_spec['decks'], self.rng)
+        self.cursor = numpy.zeros(lanes, dtype = numpy.intp)
+        self.round_start = numpy.zeros(lanes, dtype = numpy.intp)
+        self.exhausted = numpy.zeros(lanes, dtype = bool)
+        self.dealer_banks = numpy.full(lanes, dealerBank, dtype = numpy.int64)
+        self.broke = numpy.zeros(lanes, dtype = bool)
+        self.rounds = 0
+
+        shape = (lanes, players, maxHands)
+        self.hard = numpy.zeros(shape, dtype = numpy.int16)
+        self.ace = numpy.zeros(shape, dtype = bool)
+        self.cards = numpy.zeros(shape, dtype = numpy.int8)
+        self.first = numpy.zeros(shape, dtype = numpy.int8)
+        self.second = numpy.zeros(shape, dtype = numpy.int8)
+        self.status = numpy.zeros(shape, dtype = numpy.int8)
+        self.bet = numpy.zeros(shape, dtype = numpy.int64)
+        self.raised = numpy.zeros(shape, dtype = bool)
+        self.hand_count = numpy.zeros((lanes, players), dtype = numpy.int8)
+        self.net = numpy.zeros((lanes, players), dtype = numpy.int64)
+        self.dealer_hard = numpy.zeros(lanes, dtype = numpy.int16)
+        self.dealer_ace = numpy.zeros(lanes, dtype = bool)
+        self.dealer_cards = numpy.zeros(lanes, dtype = numpy.int8)
+        self.upcard = numpy.zeros(lanes, dtype = numpy.int8)
+        return
+
+    def _draw(self, lanes):
+        # This deals the next card of each lane in lanes and returns the
+        # ranks. A lane whose shoe has run out deals its discards.
+        cursor = self.cursor[lanes]
+        empty = cursor >= self.shoes.shape[1]
+        if empty.any():
+            self._deal_discards(lanes[empty])
+            cursor = self.cursor[lanes]
+        codes = self.shoes[lanes, cursor]
+        self.cursor[lanes] = cursor + 1
+        return CODERANKS[codes]
+
+    def _deal_discards(self, lanes):
+        # This puts the discards of each lane in lanes back behind the cards
+        # of the round in play, in the order they were dealt, like
+        # CardShoe._deal_discards. The lanes are reshuffled after the round.
+        starts = self.round_start[lanes]
+        if (starts == 0).any():
+            raise IndexError("BatchEngine: a lane's card shoe is empty.")
+        length = self.shoes.shape[1]
+        positions = (numpy.arange(0, length)[None, :] + starts[:, None]) % length
+        self.shoes[lanes] = self.shoes[lanes[:, None], positions]
+        self.cursor[lanes] = length - starts
+        self.round_start[lanes] = 0
+        self.exhausted[lanes] = True
+        return
+
+    def _add(self, lanes, seat, index, ranks):
+        # This adds one card to hands[index] of seat in each lane, like
+        # RoundEngine._deal, and returns the new statuses. As in
+        # Player.add_card_to_split, only the regular hand can make a
+        # blackjack; a two card 21 on any other hand is playable.
+        count = self.cards[lanes, seat, index]
+        self.first[lanes, seat, index] = numpy.where(count == 0, ranks, self.first[lanes, seat, index])
+        self.second[lanes, seat, index] = numpy.where(count == 1, ranks, self.second[lanes, seat, index])
+        hard = self.hard[lanes, seat, index] + RANKVALUES[ranks]
+        ace = self.ace[lanes, seat, index] | (ranks == 0)
+        status = numpy.where(hard > 21, BUST,
+                             numpy.where((count == 1) & (hard == 11) & ace & (index == 0), BLACKJACK, PLAYABLE))
+        self.hard[lanes, seat, index] = hard
+        self.ace[lanes, seat, index] = ace
+        self.cards[lanes, seat, index] = count + 1
+        self.status[lanes, seat, index] = status
+        return status
+
+    def _soft(self, lanes, seat, index):
+        hard = self.hard[lanes, seat, index]
+        return hard + 10 * (self.ace[lanes, seat, index] & (hard <= 11))
+
+    def _decide(self, tables, lanes, seat, index):
+        # This looks up the decisions of seat's policy for hands[index] in
+        # each lane, one array index per lane; see decision_index.
+        hard = self.hard[lanes, seat, index]
+        soft = self._soft(lanes, seat, index)
+        first = self.first[lanes, seat, index]
+        pair = numpy.where((self.cards[lanes, seat, index] == 2) & (first == self.second[lanes, seat, index]),
+                           first + 1, 0)
+        decision = ((soft * 2 + (soft != hard)) * PAIRS + pair) * UPCARDS + RANKVALUES[self.upcard[lanes]] - 1
+        return tables[seat][decision] == 1
+
+    def play_round(self, count = None):
+        '''
+        This method plays one round in the first count lanes, all of them if
+        count is None. It returns a dict of arrays over those lanes:
+            'net'               : (count, seats) change to each player's bank
+            'hands'             : (count, seats) hands each seat played
+            'busts'             : (count, seats) hands each seat busted
+            'blackjacks'        : (count, seats) True for a natural
+            'dealer total'      : the dealer's final soft score, or its hard
+                                  score if it busted
+            'dealer blackjack'  : True if the dealer had blackjack
+            'reshuffled'        : True if the lane's shoe was reshuffled
+        '''
+        if count is None:
+            count = self.lanes
+        lanes = numpy.arange(0, count)
+        rows = slice(0, count)
+        players = len(self.seats)
+        maxHands = self.split_rules['max hands']
+        for name in ('hard', 'ace', 'cards', 'first', 'second', 'status', 'bet', 'raised', 'hand_count', 'net'):
+            getattr(self, name)[rows] = 0
+        self.dealer_hard[rows] = 0
+        self.dealer_ace[rows] = False
+        self.dealer_cards[rows] = 0
+        self.bet[rows, :, 0] = self.min_bet
+        self.hand_count[rows] = 1
+        self.round_start[rows] = self.cursor[rows]
+        busts = numpy.zeros((count, players), dtype = numpy.int64)
+
+        # The deal: two passes, the dealer last. The dealer's second card is
+        # the visible one.
+        for deal in (0, 1):
+            for seat in xrange(0, players):
+                self._add(lanes, seat, 0, self._draw(lanes))
+            ranks = self._draw(lanes)
+            self.dealer_hard[rows] += RANKVALUES[ranks]
+            self.dealer_ace[rows] |= (ranks == 0)
+            self.dealer_cards[rows] += 1
+        self.upcard[rows] = ranks
+        blackjacks = self.status[rows, :, 0] == BLACKJACK
+        self.net[rows] += blackjacks * self.winnings
+        self.status[rows, :, 0][blackjacks] = PAID
+        self.cards[rows, :, 0][blackjacks] = 0
+
+        # Insurance is offered on an Ace or a 10 value card to every seat
+        # that was not paid a blackjack.
+        upValues = RANKVALUES[self.upcard[rows]]
+        flagged = (upValues == 1) | (upValues == 10)
+        insured = numpy.zeros((count, players), dtype = numpy.int64)
+        for seat in xrange(0, players):
+            if self.insurance[seat]:
+                insured[flagged & ~blackjacks[:, seat], seat] = self.insurance[seat]
+
+        # Splits, in the order RoundEngine offers them: every hand of a seat
+        # is checked again after a split, until it is declined or cannot be
+        # split, before the next hand.
+        resplitAces = self.split_rules['resplit aces']
+        for seat in xrange(0, players):
+            for index in xrange(0, maxHands):
+                declined = numpy.zeros(count, dtype = bool)
+                while True:
+                    counts = self.hand_count[rows, seat]
+                    first = self.first[rows, seat, index]
+                    splittable = (self.cards[rows, seat, index] == 2) & (first == self.second[rows, seat, index]) & \
+                                 (counts < maxHands) & ~declined
+                    if not resplitAces:
+                        splittable &= ~((first == 0) & (counts > 1))
+                    asked = numpy.flatnonzero(splittable)
+                    if len(asked) == 0:
+                        break
+                    accepted = self._decide(self.split_tables, asked, seat, index)
+                    declined[asked[~accepted]] = True
+                    split = asked[accepted]
+                    if len(split) == 0:
+                        break
+                    new = self.hand_count[split, seat].astype(numpy.intp)
+                    moved = self.second[split, seat, index]
+                    kept = self.first[split, seat, index]
+                    self.hard[split, seat, new] = RANKVALUES[moved]
+                    self.ace[split, seat, new] = moved == 0
+                    self.cards[split, seat, new] = 1
+                    self.first[split, seat, new] = moved
+                    self.status[split, seat, new] = PLAYABLE
+                    self.bet[split, seat, new] = self.bet[split, seat, 0]
+                    self.hard[split, seat, index] = RANKVALUES[kept]
+                    self.ace[split, seat, index] = kept == 0
+                    self.cards[split, seat, index] = 1
+                    self.hand_count[split, seat] += 1
+                    self._add(split, seat, index, self._draw(split))
+                    self._add(split, seat, new, self._draw(split))
+
+        # The raise: every playable hand is offered it once.
+        for seat in xrange(0, players):
+            for index in xrange(0, maxHands):
+                asked = numpy.flatnonzero(self.status[rows, seat, index] == PLAYABLE)
+                if len(asked) == 0:
+                    continue
+                accepted = self._decide(self.double_tables, asked, seat, index)
+                self.bet[asked[accepted], seat, index] *= 2
+                self.raised[asked, seat, index] = True
+
+        # Player turns, seat by seat and hand by hand. A hand is played until
+        # it stands, busts, or reaches 21.
+        for seat in xrange(0, players):
+            for index in xrange(0, maxHands):
+                active = numpy.flatnonzero(self.status[rows, seat, index] == PLAYABLE)
+                while len(active) != 0:
+                    active = active[self._soft(active, seat, index) < 21]
+                    if len(active) == 0:
+                        break
+                    active = active[self._decide(self.hit_tables, active, seat, index)]
+                    if len(active) == 0:
+                        break
+                    status = self._add(active, seat, index, self._draw(active))
+                    bust = active[status == BUST]
+                    self.net[bust, seat] -= self.bet[bust, seat, index]
+                    self.cards[bust, seat, index] = 0
+                    busts[bust, seat] += 1
+                    active = active[status == PLAYABLE]
+
+        # The dealer's turn. Insurance is settled first, then the dealer
+        # draws while no stand rule is met. The stand rule reads the weakest
+        # live hand, the lowest score a ScoreIndex would hold.
+        dealerHard = self.dealer_hard[rows]
+        dealerSoft = dealerHard + 10 * (self.dealer_ace[rows] & (dealerHard <= 11))
+        dealerBlackjack = (self.dealer_cards[rows] == 2) & (dealerSoft == 21) & (dealerHard == 11)
+        self.net[rows] += numpy.where(dealerBlackjack[:, None], insured, -insured)
+        live = self.status[rows] == PLAYABLE
+        hardScores = self.hard[rows]
+        softScores = hardScores + 10 * (self.ace[rows] & (hardScores <= 11))
+        weakest = numpy.where(live, softScores, 99).reshape(count, -1).min(axis = 1)
+        anyLive = live.reshape(count, -1).any(axis = 1)
+        drawing = numpy.flatnonzero(~dealerBlackjack & anyLive)
+        while len(drawing) != 0:
+            hard = self.dealer_hard[drawing]
+            soft = hard + 10 * (self.dealer_ace[drawing] & (hard <= 11))
+            drawing = drawing[(hard < 17) & ~((soft > 16) & (soft > weakest[drawing]))]
+            if len(drawing) == 0:
+                break
+            ranks = self._draw(drawing)
+            self.dealer_hard[drawing] += RANKVALUES[ranks]
+            self.dealer_ace[drawing] |= (ranks == 0)
+            self.dealer_cards[drawing] += 1
+        dealerHard = self.dealer_hard[rows]
+        dealerSoft = dealerHard + 10 * (self.dealer_ace[rows] & (dealerHard <= 11))
+        dealerTotal = numpy.where(dealerHard > 21, dealerHard, dealerSoft)
+
+        # Settlement, as in settle_hands, of every hand that still has cards.
+        settled = ((self.status[rows] == PLAYABLE) | (self.status[rows] == BLACKJACK)) & (self.cards[rows] > 0)
+        outcomes = numpy.where(dealerBlackjack[:, None, None], -1,
+                               numpy.where((dealerTotal > 21)[:, None, None], 1,
+                                           numpy.sign(softScores - dealerTotal[:, None, None])))
+        self.net[rows] += (outcomes * self.bet[rows] * settled).sum(axis = 2)
+
+        # The end of the round. The dealer's bank takes the other side of
+        # every player's change; then the shoes past their cut card or out of
+        # cards, or every shoe of a continuous shuffling machine, are
+        # reshuffled.
+        self.dealer_banks[rows] -= self.net[rows].sum(axis = 1)
+        self.broke[rows] |= self.dealer_banks[rows] <= 0
+        if self.shoe_spec['csm']:
+            reshuffle = numpy.zeros(count, dtype = bool)
+            self._reshuffle(lanes)
+        else:
+            reshuffle = (self.cursor[rows] >= self.cut_card) | self.exhausted[rows]
+            self._reshuffle(lanes[reshuffle])
+        self.rounds += 1
+        return {'net'              : self.net[rows].copy(),
+                'hands'            : settled.sum(axis = 2) + busts + blackjacks,
+                'busts'            : busts,
+                'blackjacks'       : blackjacks,
+                'dealer total'     : dealerTotal,
+                'dealer blackjack' : dealerBlackjack,
+                'reshuffled'       : reshuffle}
+
+    def _reshuffle(self, lanes):
+        if len(lanes) != 0:
+            self.shoes[lanes] = shuffled_shoes(len(lanes), self.shoe_spec['decks'], self.rng)
+            self.cursor[lanes] = 0
+            self.round_start[lanes] = 0
+            self.exhausted[lanes] = False
+        return
+
+    def play(self, rounds, sample = None):
+        '''
+        This method plays rounds rounds in every lane and returns the counts
+        in the form of Simulator.simulate: per seat (by seat name) the
+        rounds, net, sum of squares of the net, hands, busts, and
+        blackjacks; the dealer's busts and blackjacks; the reshuffles; the
+        lanes whose dealer broke; and the dealers' banks, summed over the
+        lanes, before the first round and every sample rounds. Every count
+        is an integer except 'seconds'. 'shards' is the number of lanes,
+        since each one is an independent table.
+        '''
+        players = len(self.seats)
+        seats = dict([(seat, {'rounds' : 0, 'net' : 0, 'squares' : 0, 'hands' : 0, 'busts' : 0, 'blackjacks' : 0})
+                      for seat in self.seats])
+        counts = {'rounds' : rounds * self.lanes, 'shards' : self.lanes, 'dealer busts' : 0,
+                  'dealer blackjacks' : 0, 'dealer broke' : 0, 'reshuffles' : 0, 'seats' : seats,
+                  'trajectory' : [int(self.dealer_banks.sum())], 'trajectory shards' : [self.lanes]}
+        start = time.time()
+        for roundNumber in xrange(1, rounds + 1):
+            result = self.play_round()
+            net = result['net']
+            for i, seat in enumerate(self.seats):
+                stats = seats[seat]
+                stats['rounds'] += self.lanes
+                stats['net'] += int(net[:, i].sum())
+                stats['squares'] += int((net[:, i] * net[:, i]).sum())
+                stats['hands'] += int(result['hands'][:, i].sum())
+                stats['busts'] += int(result['busts'][:, i].sum())
+                stats['blackjacks'] += int(result['blackjacks'][:, i].sum())
+            counts['dealer busts'] += int((result['dealer total'] > 21).sum())
+            counts['dealer blackjacks'] += int(result['dealer blackjack'].sum())
+            counts['reshuffles'] += int(result['reshuffled'].sum())
+            if sample and roundNumber % sample == 0:
+                counts['trajectory'].append(int(self.dealer_banks.sum()))
+                counts['trajectory shards'].append(self.lanes)
+        counts['seconds'] = time.time() - start
+        counts['dealer broke'] = int(self.broke.sum())
+        counts['dealer bank'] = int(self.dealer_banks.sum())
+        return counts
+
+    def diagnostic_print(self):
+        '''
+        This method prints out the configuration of the engine for debugging.
+        '''
+        print("Lanes: ", self.lanes)
+        print("Seats and policies: ", zip(self.seats, [getattr(p, '__name__', type(p).__name__)
+                                                       for p in self.policies]))
+        print("Table bets: ", self.min_bet, self.max_bet, self.blackjack_multiplier)
+        print("Shoe and split rules: ", self.shoe_spec, self.split_rules, "cut card", self.cut_card)
+        print("Rounds played per lane: ", self.rounds)
+        return
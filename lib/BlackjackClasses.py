@@ -1,13 +1,16 @@
 from __future__ import print_function
-import random, os, pygame, inflection
-from pygame.locals import *
+import os
+from array import array
+from RandomStreams import resolve_stream
+from BankLedger import NOSEAT, NOHAND
 import pdb
 
 # from abc import ABCMeta, abstractmethod
 
 class CardShoe(object):
     '''
-    This class is used to simulate a six deck shoe.
+    This class is used to simulate a multiple deck shoe. Casinos normally use
+    six decks, which is the default.
         
     Class Order Attributes:
         suits: a tuple of the suits used in normal playing card decks
@@ -16,73 +19,179 @@ class CardShoe(object):
         ranks: a tuple of the ranks of playing cards in ascending order Ace 
             through King, represented by A, 1, 2, 3,...., 9, 10, J, Q, K.
             Tuples are used here for the same reason.
+        cards: a tuple of the 52 card tuples (rank, suit) in sequential
+            order, (A, S) through (K, C). A card is the integer index (0-51)
+            of its tuple here, its card code. The shoe, the hands, and the
+            card images all use card codes; this tuple turns a code back
+            into its rank and suit.
+        deck_size: the number of cards in one deck (52)
+        code_ranks: tuple mapping a card code to the index of its rank in
+            ranks
+        code_suits: tuple mapping a card code to the index of its suit in
+            suits
+        code_values: tuple mapping a card code to its blackjack value, with
+            Aces counted as 1
+        names: tuple mapping a card code to its printable name, like 'A-S'
+        CUTCARDRESERVE: the number of cards left behind the cut card when
+            neither a penetration nor a cut card position is given. The casino
+            has always replaced a shoe once it drops to 100 cards. A shoe
+            too small for that places the cut card half way through instead.
 
-    Note: The "cards" themselves are tuples of (rank, suit). Six 52 card
-        decks of them are created for the Shoe. The first one is a sequential
+    Note: The "cards" themselves are card codes, 0 to 51, with
+        code = suit index * 13 + rank index. Six 52 card decks of them are
+        created for the Shoe. The first one is a sequential
         order list. To increase the entropy of the randomizing process, a
         randomly chosen single card is removed from the sequential "Shoe"
-        and inserted into the list shuffled_deck (see below). This process
-        continues until all 312 cards have been removed from the sequential
-        deck.
+        and dealt. This process continues until all 312 cards have been
+        removed from the sequential deck.
+
+        The shoe is a preallocated array of one byte card indexes with a
+        read cursor. Everything in front of the cursor has already been
+        dealt. Instead of deleting the randomly chosen card from the
+        sequential list (which shifts every card behind it), the chosen card
+        is swapped into the cursor position and the cursor moves forward.
+        The cards behind the cursor are always the cards still in the shoe,
+        so every card is still chosen at random from the cards remaining.
+        This makes remove_top, __len__, and reshuffle constant time, no
+        matter how big the shoe is.
     
     Attributes
-        shuffled_deck : a randomly shuffled shoe created from decks.
+        card_codes: array of card indexes into CardShoe.cards. Cards at
+            positions below cursor have been dealt.
+        cursor: position of the next card to be dealt
+        shuffled: positions below this one have already had their random
+            card chosen. It is normally equal to cursor. finish_shuffle and
+            shuffled_deck move it to the end of the shoe.
         length: the number of cards in the shoe after initialization
+        decks: the number of 52 card decks in the shoe
+        cut_card: the position of the cut card in the shoe. Once this many
+            cards have been dealt, the cut card has come out and the shoe
+            should be reshuffled at the end of the round.
+        round_start: position of the first card of the round in play. The
+            cards in front of it are the discards of earlier rounds.
+        discards_dealt: True once the shoe ran out during a round and its
+            discards were put back to finish it
+        rng: the random number generator that picks the cards. It is the
+            global random module unless a seed or RandomStream was provided.
+        csm: True if the shoe is a continuous shuffling machine (CSM). The
+            dealt cards go back into a CSM shoe after every round, and it has
+            no cut card.
+        rank_counts: list of the number of cards of each rank still in the
+            shoe, in the order of ranks. remove_top keeps it up to date.
+        suit_counts: list of the number of cards of each suit still in the
+            shoe, in the order of suits
+        counter: a CardCounter object fed by remove_top, or None. It is reset
+            whenever the shoe is reshuffled.
+        recorder: a ShoeRecorder object that is given the order of every new
+            shoe, or None. See ShoeArchive.
     
     Methods:
-        __init__ : Initializes shuffled_deck to create a card shoe.
+        __init__ : Initializes card_codes to create a card shoe.
         __len__: returns the number of cards remaining in the shoe.
         __str__: returns a string listing the number of cards remaining
             in the shoe.
+        cut_card_reached: (property) True once the cut card has come out
         __del__: returns a message the deck show has been removed as it 
             deletes the CardShoe object
-        remove_top: removes the top card (index 0) from the shuffled deck
-            and returns the tuple of the card (rank, suit)
+        shuffled_deck: (property) the list of card codes remaining in the
+            shoe in the order they will be dealt
+        remove_top: removes the top card from the shuffled deck and returns
+            its card code. A card dealt face down is not shown to the
+            counter.
+        finish_shuffle: picks the random order of every card still in the
+            shoe instead of waiting for them to be dealt
+        reshuffle: puts every dealt card back into the shoe. It replaces
+            building a new CardShoe object.
+        return_dealt: puts the cards dealt during a round back into a CSM
+            shoe
+        mark_round: marks the cursor as the start of the next round
+        composition: returns a snapshot of the rank and suit counts
+        remaining: returns the number of cards of a rank and/or suit still in
+            the shoe
         diagnostic_print: prints out the entire CardShoe object, including
             all class order attributes, and current attributes
         
     '''
     suits = ('S', 'D', 'H', 'C')
     ranks = ('A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K')
+    cards = tuple([(r, s) for s in suits for r in ranks])
+    deck_size = len(cards)
+    code_ranks = tuple([code % len(ranks) for code in xrange(deck_size)])
+    code_suits = tuple([code // len(ranks) for code in xrange(deck_size)])
+    code_values = tuple([min(rank + 1, 10) for rank in code_ranks])
+    names = tuple(['{0}-{1}'.format(r, s) for (r, s) in cards])
+    CUTCARDRESERVE = 100
     
-    def __init__(self):
+    def __init__(self, decks = 6, penetration = None, cut_card = None, rng = None, csm = False):
         """
         __init__ creates the CardShoe object in the following manner:
-        A sequentially generate list of cards [tuples of the form (rank,
-        suit)] are generated for a list called decks. Decks is a local
-        variable. To increase the entropy in the randomization process,
-        the "cards" are randomly chosen one at a time, instead of randomizing
-        the entire Shoe at once. There is no other return value.
+        A sequentially generated array of card indexes is created for the
+        requested number of decks. Each index is a card code, pointing to a
+        card tuple (rank, suit) in CardShoe.cards. To increase the entropy in
+        the randomization process, the "cards" are randomly chosen one at a
+        time as they are dealt, instead of randomizing the entire Shoe at
+        once. There is no other return value.
+        INPUTS:
+            decks: integer, number of 52 card decks in the shoe
+                Default: 6
+            penetration: integer or float, the percentage of the shoe
+                dealt before the cut card comes out, 0 < penetration <= 100
+                Default: None
+            cut_card: integer, the number of cards dealt before the cut card
+                comes out. It takes precedence over penetration.
+                Default: None
+            rng: an integer seed, a RandomStream (or random.Random) object,
+                or None for the global random module. Two shoes built with
+                the same seed deal the same cards in the same order, through
+                every reshuffle.
+                Default: None
+            csm: boolean, True makes this a continuous shuffling machine.
+                penetration and cut_card are ignored for a CSM shoe.
+                Default: False
+        If neither penetration nor cut_card is provided, the cut card is
+        placed CUTCARDRESERVE cards from the end of the shoe. A ValueError is
+        raised for a shoe geometry that cannot be built.
 
-        To help prevent cheating, __init__ takes no arguments.
+        To help prevent cheating, the game itself never passes a fixed seed.
+        Seeds are for replaying simulations and chasing bugs.
         """
-
-        # The following nested for loops generate 6 52 "card decks" of tuples
-        # (rank, suit). Each 52 card set is in sequential order by the tuples
-        # suits and ranks, starting with (A, S) and ending with (K, C).
-        decks = []
-        for i in xrange(0, 6):
-            for s in CardShoe.suits:
-                for r in CardShoe.ranks:
-                    decks.append((r,s))
-        
-        # To create a shuffled card shoe, we need to take a random card from
-        # decks and move it into the shoe. We keep doing that until the deck
-        # is fully randomized. It could have been done with a direct call
-        # random.shuffle(decks), but this process adds more entropy to the
-        # system without using much memory or CPU.
-        self.shuffled_deck = []
-        while len(decks) > 0:
-            # card is another local variable. It is a tuple pulled using a
-            # random index of the remaining elements in decks.
-            # card_index is that random index created using random.randint().
-            card_index = random.randint(0,len(decks) - 1)
-            self.shuffled_deck.append(decks[card_index])
-            del decks[card_index]
-        # Now, CardShoe.shuffled_deck contains a shuffled six deck shoe.
+        if (type(decks) not in (int, long)) or (decks < 1):
+            raise ValueError("CardShoe: decks must be a positive integer, not {0}.".format(decks))
+        # The array holds the 52 card decks of indexes. Each 52 card set is in
+        # sequential order by the tuples suits and ranks, starting with (A, S)
+        # and ending with (K, C). An array of unsigned bytes keeps the whole
+        # shoe in one byte per card instead of a list of tuples.
+        self.decks = decks
+        self.rng = resolve_stream(rng)
+        self.card_codes = array('B', range(CardShoe.deck_size) * decks)
         # This length is the number of cards in the initialized deck. It
-        # should be 312 cards (r, s).
-        self.length = len(self.shuffled_deck)
+        # should be 312 cards (r, s) for six decks.
+        self.length = len(self.card_codes)
+        self.cursor = 0
+        self.shuffled = 0
+        self.round_start = 0
+        self.discards_dealt = False
+        self.csm = csm
+        self.counter = None
+        self.recorder = None
+        self._reset_counts()
+
+        # Now, we need to place the cut card. A continuous shuffling machine
+        # does not use one; so, it is placed at the very end of the shoe.
+        if csm:
+            cut_card = self.length
+        elif cut_card is None:
+            if penetration is None:
+                cut_card = self.length - CardShoe.CUTCARDRESERVE
+                if cut_card < self.length // 2:
+                    cut_card = self.length // 2
+            elif 0 < penetration <= 100:
+                cut_card = int(self.length * penetration / 100.0)
+            else:
+                raise ValueError("CardShoe: penetration must be above 0 and at most 100, not {0}.".format(penetration))
+        if not (0 < cut_card <= self.length):
+            raise ValueError("CardShoe: cut_card must be between 1 and {0}, not {1}.".format(self.length, cut_card))
+        self.cut_card = cut_card
     
     def __len__(self):
         """
@@ -91,14 +200,25 @@ class CardShoe(object):
         in the game. It is also used by CasinoTable classes to determine when
         the Shoe should be automatically reshuffled between rounds.
         """
-        return len(self.shuffled_deck)
+        return self.length - self.cursor
     
     def __str__(self):
         """
         # This method returns a string indicating that the deck has been
         # initialized and the current number of "cards" remaining in it.
         """
-        return "Deck: A shuffled shoe containing "+ str(len(self.shuffled_deck)) + " cards."
+        return "Deck: A shuffled shoe containing "+ str(len(self)) + " cards."
+
+    @property
+    def cut_card_reached(self):
+        '''
+        This property is True once the cut card has come out of the shoe. The
+        round in play is finished with the cards left in the shoe, and the
+        shoe is reshuffled before the next round starts. It is also True
+        once the discards had to be dealt to finish a round. A CSM shoe has
+        no cut card; so, it is always False for one.
+        '''
+        return (not self.csm) and (self.discards_dealt or (self.cursor >= self.cut_card))
     
     def __del__(self):
         """
@@ -106,16 +226,180 @@ class CardShoe(object):
         string indicating that the deck shoe has been deleted.
         """
         return "The current deck shoe has been removed from the game."
+
+    @property
+    def shuffled_deck(self):
+        '''
+        This property returns a list of the card codes still in the shoe, in
+        the order they will be dealt. Since the order of a card
+        is normally chosen when it is dealt, this calls finish_shuffle first.
+        It is kept for diagnostic printouts and older code. Dealing should
+        use remove_top.
+        '''
+        self.finish_shuffle()
+        return self.card_codes[self.cursor:].tolist()
     
-    def remove_top(self):
+    def remove_top(self, face_down = False):
+        '''
+        This method removes the top card from the deck and returns its card
+        code (see CardShoe.cards). face_down is True for the dealer's hold
+        card. A face down card is not given to the counter; Dealer counts it
+        when the hold card is revealed.
+
+        If the card at the cursor has not been chosen yet, a random card is
+        picked from the cards remaining in the shoe and swapped into the
+        cursor position. Then, the cursor moves forward one card. If the shoe
+        runs out during a round, the discards are dealt to finish it; see
+        _deal_discards.
+        '''
+        position = self.cursor
+        if position >= self.length:
+            self._deal_discards()
+            position = self.cursor
+        codes = self.card_codes
+        if position >= self.shuffled:
+            pick = self.rng.randint(position, self.length - 1)
+            codes[position], codes[pick] = codes[pick], codes[position]
+            self.shuffled = position + 1
+        self.cursor = position + 1
+        code = codes[position]
+        self.rank_counts[CardShoe.code_ranks[code]] -= 1
+        self.suit_counts[CardShoe.code_suits[code]] -= 1
+        if self.counter is not None and not face_down:
+            self.counter.count_code(code)
+        return code
+
+    def finish_shuffle(self):
+        '''
+        This method picks the random order of every card remaining in the
+        shoe right away, instead of as each card is dealt. The cards come out
+        in the same order either way. It takes no arguments and returns no
+        values.
+        '''
+        codes = self.card_codes
+        last = self.length - 1
+        randint = self.rng.randint
+        for position in xrange(max(self.shuffled, self.cursor), last):
+            pick = randint(position, last)
+            codes[position], codes[pick] = codes[pick], codes[position]
+        self.shuffled = self.length
+        return
+
+    def reshuffle(self):
+        '''
+        This method returns every dealt card to the shoe. Since every card is
+        chosen at random from the cards behind the cursor, all that is
+        required is moving the cursor back to the start of the shoe. This
+        replaces deleting the CardShoe and building a new one. It takes no
+        arguments and returns no values.
+        If the shoe has a recorder, the new order is shuffled right away and
+        recorded before any card is dealt.
+        '''
+        self.cursor = 0
+        self.shuffled = 0
+        self.round_start = 0
+        self.discards_dealt = False
+        self._reset_counts()
+        if self.recorder is not None:
+            self.recorder.record(self)
+        return
+
+    def mark_round(self):
+        '''
+        This method marks the cursor as the start of the next round; so, the
+        cards dealt so far are discards. CasinoTable.check_cut_card calls it
+        between rounds. It takes no arguments and returns no values.
+        '''
+        self.round_start = self.cursor
+        return
+
+    def _deal_discards(self):
+        '''
+        This method is called when the shoe runs out in the middle of a
+        round. A cut card close to the end of the shoe, or a long round, can
+        do that. Like a dealer who runs out of cards, it puts the discards
+        of the earlier rounds back behind the cards of the round in play,
+        and the round goes on. The discards come back in the order they
+        were dealt, which is already random, and the shoe is reshuffled as
+        soon as the round is over. A round that used the whole shoe leaves
+        no discards; that raises an IndexError, just like popping an empty
+        list. It returns no values.
+        '''
+        start = self.round_start
+        if start == 0:
+            raise IndexError("remove_top: The card shoe is empty.")
+        codes = self.card_codes
+        codes[:] = codes[start:] + codes[:start]
+        self.cursor = self.length - start
+        self.shuffled = self.length
+        self.round_start = 0
+        self.discards_dealt = True
+        # The cards left in the shoe are the discards now.
+        self._reset_counts()
+        for code in codes[:self.cursor]:
+            self.rank_counts[CardShoe.code_ranks[code]] -= 1
+            self.suit_counts[CardShoe.code_suits[code]] -= 1
+        return
+
+    def return_dealt(self):
+        '''
+        This method puts the cards dealt during a round back into a
+        continuous shuffling machine (CSM) shoe. A real machine mixes them
+        in among the cards it still holds. Here, the next card is always
+        picked at random from every card behind the cursor, and moving the
+        cursor back to the start puts the dealt cards behind it again. The
+        cards still in the shoe are not touched, and no shuffle takes place,
+        but the next card is equally likely to be any card in the shoe. It
+        takes no arguments and returns no values. It does nothing for a shoe
+        that is not a CSM.
+        '''
+        if self.csm:
+            self.cursor = 0
+            self.shuffled = 0
+            self.round_start = 0
+            self._reset_counts()
+            if self.recorder is not None:
+                self.recorder.record(self)
+        return
+
+    def _reset_counts(self):
+        '''
+        This method sets rank_counts and suit_counts back to a full shoe, and
+        starts the counter over if there is one. It only depends on the number
+        of ranks and suits, not on the number of cards in the shoe.
+        '''
+        self.rank_counts = [len(CardShoe.suits) * self.decks] * len(CardShoe.ranks)
+        self.suit_counts = [len(CardShoe.ranks) * self.decks] * len(CardShoe.suits)
+        if self.counter is not None:
+            self.counter.reset(self.decks)
+        return
+
+    def composition(self):
         '''
-        This method removes the top card from the deck and returns the tuple
-        (rank, suit) of the card. The top card has index 0. It does not accept
-        any arguments.
+        This method returns a snapshot of the cards remaining in the shoe as a
+        tuple (rank counts, suit counts). Both are tuples in the order of the
+        class order attributes ranks and suits. The snapshot does not change
+        as more cards are dealt.
         '''
-        top_card = self.shuffled_deck[0]
-        self.shuffled_deck.pop(0)
-        return top_card
+        return (tuple(self.rank_counts), tuple(self.suit_counts))
+
+    def remaining(self, rank = None, suit = None):
+        '''
+        This method returns the number of cards of rank (for example, '10' or
+        'A') still in the shoe, or of suit, without looking at the cards.
+        Given both, it returns the count of that one card, which is computed
+        from the dealt cards; so, it is only meant for occasional use. Given
+        neither, it returns len(self). An unknown rank or suit raises a
+        ValueError.
+        '''
+        if rank is None and suit is None:
+            return len(self)
+        if suit is None:
+            return self.rank_counts[CardShoe.ranks.index(rank)]
+        if rank is None:
+            return self.suit_counts[CardShoe.suits.index(suit)]
+        code = CardShoe.cards.index((rank, suit))
+        return self.decks - self.card_codes[:self.cursor].count(code)
 
     def diagnostic_print(self):
         '''
@@ -126,8 +410,433 @@ class CardShoe(object):
         print("Class Order Attributes:")
         print("Ranks: ", self.ranks)
         print("Suits: ", self.suits)
+        print("Number of decks in Shoe: ", self.decks)
         print("Number of cards in Shoe: ", self.length)
-        print("Shuffled_Shoe: ", self.shuffled_deck)
+        print("Cut card position: ", self.cut_card)
+        print("Continuous shuffling machine: ", self.csm)
+        print("Ranks remaining: ", self.rank_counts)
+        print("Suits remaining: ", self.suit_counts)
+        print("Counter: ", self.counter)
+        print("Recorder: ", self.recorder)
+        print("Random number generator: ", self.rng)
+        print("Cards remaining in Shoe: ", len(self))
+        print("Shuffled_Shoe: ", [CardShoe.names[code] for code in self.shuffled_deck])
+        return
+
+
+def hand_state(hard_score, has_ace, cards):
+    '''
+    This function packs the scoring state of a hand into the integer used to
+    index Hand.hand_table. cards is the number of cards in the hand; only
+    0, 1, and "2 or more" matter, because blackjack needs exactly two cards.
+    '''
+    return (hard_score * 2 + int(has_ace)) * 3 + min(cards, 2)
+
+
+def _build_hand_table(hard_limit):
+    '''
+    This function builds the hand transition table stored in
+    Hand.hand_table. It returns a tuple indexed by card code, and each card
+    code holds a tuple indexed by hand_state. Each entry is the tuple (next
+    state, soft score, hard score, status) for that card being added to a
+    hand in that state, where status is 'blackjack', 'bust', or 'playable'.
+    Only a hand that is not bust can take a card; so, the entries for bust
+    states are None. Cards of the same rank share one tuple.
+    '''
+    table = []
+    for rank in xrange(0, len(CardShoe.ranks)):
+        # Rank 0 is the Ace. Its value, like every rank's, is its card code
+        # value in the first suit.
+        value = CardShoe.code_values[rank]
+        entries = [None] * hand_state(hard_limit + 1, False, 0)
+        for hard in xrange(0, 22):
+            for has_ace in (False, True):
+                for cards in (0, 1, 2):
+                    new_hard = hard + value
+                    new_ace = has_ace or (rank == 0)
+                    if new_ace and new_hard <= 11:
+                        new_soft = new_hard + 10
+                    else:
+                        new_soft = new_hard
+                    if new_hard > 21:
+                        status = 'bust'
+                    elif (new_hard == 11) and (new_soft == 21) and (cards == 1):
+                        status = 'blackjack'
+                    else:
+                        status = 'playable'
+                    entries[hand_state(hard, has_ace, cards)] = (hand_state(new_hard, new_ace, cards + 1),
+                                                                 new_soft, new_hard, status)
+        table.append(tuple(entries))
+    return tuple([table[rank] for rank in CardShoe.code_ranks])
+
+
+class Hand(object):
+    '''
+    This class holds one blackjack hand: its cards, its scores, the bet on
+    it, and its status. A Player holds a list of them, the regular hand and
+    the split hand, and the Dealer holds one. Everything that was kept twice
+    on a Player, once for each hand, lives here once.
+
+    Hand, Player, and Dealer use __slots__. A hand is a few fixed fields
+    instead of a dict; so, a simulation holding thousands of seats keeps
+    its memory down.
+
+    Class Order Attributes:
+        HARDLIMIT: the highest hard score a hand can reach, 21 plus a 10
+            value card
+        EMPTYHAND: the hand_state of a hand with no cards
+        hand_table: the precomputed transition table. hand_table[card][state]
+            is (next state, soft score, hard score, status) for that card
+            code added to a hand in that state. See hand_state and
+            _build_hand_table.
+
+    Attributes:
+        cards: list of the card codes in the hand
+        soft_score: integer "soft" score, counting one Ace as 11 when that
+            is still playable
+        hard_score: integer "hard" score, counting every Ace as 1
+        state: integer packing the hard score, whether there is an Ace, and
+            the number of cards (0, 1, or 2 or more). See hand_state().
+        bet: integer amount bet on the hand
+        raise_bet: boolean indicating if the player has attempted to raise
+            the bet on the hand
+        status: the result of the last card added, 'blackjack', 'bust', or
+            'playable'. It is None for a hand that has no cards yet.
+
+    Methods:
+        __init__: creates an empty hand with no bet
+        __len__: returns the number of cards in the hand
+        score: (static) returns (soft, hard) for any list of card codes
+        add_card: adds a card, updates the scores and status with one table
+            lookup, and returns the status
+        rescore: scores the hand again from its cards
+        clear: empties the hand and clears the bet
+    '''
+    __slots__ = ('cards', 'soft_score', 'hard_score', 'state', 'bet', 'raise_bet', 'status')
+
+    HARDLIMIT = 31
+    EMPTYHAND = hand_state(0, False, 0)
+    hand_table = _build_hand_table(HARDLIMIT)
+
+    def __init__(self, bet = 0):
+        self.cards = []
+        self.soft_score = 0
+        self.hard_score = 0
+        self.state = Hand.EMPTYHAND
+        self.bet = bet
+        self.raise_bet = False
+        self.status = None
+
+    def __len__(self):
+        return len(self.cards)
+
+    @staticmethod
+    def score(cards):
+        '''
+        This method returns the tuple (soft, hard) of scores for a list of
+        card codes. Each card is one lookup in hand_table, which has already
+        worked out whether an Ace can be scored as 11. Only one Ace ever can,
+        since two of them would make 22.
+        '''
+        state = Hand.EMPTYHAND
+        soft_score = hard_score = 0
+        for card in cards:
+            if hard_score > 21:
+                # The table stops at a bust, because a bust hand is never
+                # dealt another card. Any cards after that just add up.
+                hard_score += CardShoe.code_values[card]
+                soft_score = hard_score
+            else:
+                (state, soft_score, hard_score, status) = Hand.hand_table[card][state]
+        return (soft_score, hard_score)
+
+    def add_card(self, card):
+        '''
+        This method adds a card code to the hand. The new scores, state, and
+        status are one lookup in hand_table; the rest of the hand is never
+        rescanned. The first card of a hand starts the state over, since
+        other code empties hands by replacing the card list. It returns the
+        status: 'blackjack', 'bust', or 'playable'.
+        '''
+        cards = self.cards
+        cards.append(card)
+        if len(cards) == 1:
+            self.state = Hand.EMPTYHAND
+        entry = Hand.hand_table[card][self.state]
+        if entry is None:
+            # The hand was already bust. The game never does this, but the
+            # scores are still kept correct.
+            (self.soft_score, self.hard_score) = Hand.score(cards)
+            self.status = 'bust'
+        else:
+            (self.state, self.soft_score, self.hard_score, self.status) = entry
+        return self.status
+
+    def rescore(self):
+        '''
+        This method scores the hand again from its cards, after a card has
+        been taken out of it. It returns the status, or None for an empty
+        hand.
+        '''
+        cards = self.cards
+        self.cards = []
+        self.soft_score = self.hard_score = 0
+        self.status = None
+        for card in cards:
+            self.add_card(card)
+        return self.status
+
+    def clear(self):
+        '''
+        This method empties the hand, zeroes the scores, and clears the bet.
+        It returns no values.
+        '''
+        self.cards = []
+        self.soft_score = 0
+        self.hard_score = 0
+        self.state = Hand.EMPTYHAND
+        self.bet = 0
+        self.raise_bet = False
+        self.status = None
+        return
+
+
+def _hand_attribute(index, name, doc):
+    '''
+    This function returns a property that reads and writes attribute name of
+    the Hand at position index in self.hands. Player uses it to keep the
+    names it has always had, like split_bet for hands[1].bet. A Dealer only
+    holds hands[0]; so, reading one of its split attributes returns the value
+    of an empty Hand instead of raising IndexError.
+    '''
+    def get_attribute(self):
+        if index < len(self.hands):
+            return getattr(self.hands[index], name)
+        return getattr(Hand(), name)
+    def set_attribute(self, value):
+        setattr(self.hands[index], name, value)
+        self.version += 1
+    return property(get_attribute, set_attribute, doc = doc)
+
+
+class Snapshot(dict):
+    '''
+    This class is the read only dict returned by Player.extract_data and
+    Dealer.extract_data. The same snapshot is handed to every caller until
+    the object's version changes; so, it must never be changed in place.
+    Every method that would change it raises a TypeError. Hands are stored
+    as tuples of card codes for the same reason.
+    '''
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Snapshot: extract_data snapshots are read only.")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        # copy and pickle rebuild the snapshot from a plain dict, since they
+        # cannot fill it in item by item.
+        return (Snapshot, (dict(self),))
+
+
+# Settlement outcomes of a hand against the dealer. The code is the sign of
+# the payout; so, a payout is always outcome * bet.
+LOSS, TIE, WIN = -1, 0, 1
+OUTCOMES = {LOSS: 'loss', TIE: 'tie', WIN: 'win'}
+
+
+def settle_hands(dealer_total, totals, bets, owners, banks, dealer_blackjack = False):
+    '''
+    This function settles every hand still in play against the dealer's
+    final hand in one pass. It is the settlement stage shared by
+    CasinoTable.settle, the game, and the simulations. The hands are given
+    as parallel sequences; nothing is looked up on Player objects.
+    INPUTS:
+        dealer_total: the dealer's final soft score. Over 21 is a bust.
+        totals: the soft score of each hand
+        bets: the bet on each hand
+        owners: for each hand, the index of its owner in banks
+        banks: the bank of each owner before settlement
+        dealer_blackjack: True if the dealer has blackjack. Every hand
+            loses, whatever its score.
+            Default: False
+    OUTPUT: a dict with the following keys:
+        'outcomes'    : list of LOSS, TIE, or WIN for each hand
+        'payouts'     : list of the change to the owner's bank for each hand
+        'dealer won'  : total of the bets the dealer won
+        'dealer lost' : total of the bets the dealer lost
+        'banks'       : list of each owner's bank after settlement
+        'eliminated'  : list of the owners who lost a hand and have a bank
+                        of zero or less. A win or a tie never eliminates a
+                        player.
+    '''
+    if dealer_blackjack:
+        outcomes = [LOSS] * len(totals)
+    elif dealer_total > 21:
+        outcomes = [WIN] * len(totals)
+    else:
+        outcomes = [cmp(total, dealer_total) for total in totals]
+    payouts = [outcome * bet for outcome, bet in zip(outcomes, bets)]
+    newBanks = list(banks)
+    lost = [False] * len(banks)
+    for owner, payout in zip(owners, payouts):
+        newBanks[owner] += payout
+        if payout < 0:
+            lost[owner] = True
+    return {'outcomes'    : outcomes,
+            'payouts'     : payouts,
+            'dealer won'  : -sum([payout for payout in payouts if payout < 0]),
+            'dealer lost' : sum([payout for payout in payouts if payout > 0]),
+            'banks'       : newBanks,
+            'eliminated'  : [owner for owner in xrange(0, len(banks)) if lost[owner] and newBanks[owner] <= 0]}
+
+
+class ScoreIndex(object):
+    '''
+    This class keeps the soft scores of every live player hand at a table,
+    ordered by score, for the dealer's stand rule. A CasinoTable hands it to
+    its players with attach_scores(); each Player then reports a hand to it
+    whenever the hand is scored, busts, is settled, or is cleared. So, the
+    lowest and highest live scores are always ready, and the dealer's
+    "beats at least one player" check never looks at the seats.
+
+    A hand is live while it has cards and its status is 'playable'. Busts,
+    blackjacks (paid out right away), and settled hands are not.
+
+    Scores are counted in one bucket per score from 0 to TOPSCORE. Adding a
+    hand is one bucket increment. Removing the lowest or highest hand walks
+    the buckets to the next one in use, which is never more than TOPSCORE
+    steps, however many seats or hands the table has.
+
+    Class Order Attributes:
+        TOPSCORE: the highest playable score, 21
+
+    Attributes:
+        counts: list of the number of live hands with each soft score
+        scores: dict {(seat number, hand index): soft score} of the live
+            hands. The seat number is Player.seat_number.
+        low: the lowest live score, or 0 if no hand is live
+        high: the highest live score, or 0 if no hand is live
+
+    Methods:
+        __init__: creates an empty index
+        __len__: returns the number of live hands
+        __str__: returns a string with the live hands and the low and high
+            scores
+        update: sets the score of a hand, or drops it for a score of None
+        discard: drops a hand if it is live
+        drop_seat: drops every hand of a seat
+        clear: drops every hand
+        beats_any: returns True if a total beats at least one live hand
+        lowest_from: returns the lowest live score at or above a floor
+        diagnostic_print: prints out the index's attributes
+    '''
+    __slots__ = ('counts', 'scores', 'low', 'high')
+
+    TOPSCORE = 21
+
+    def __init__(self):
+        self.counts = [0] * (ScoreIndex.TOPSCORE + 1)
+        self.scores = {}
+        self.low = self.high = 0
+
+    def __len__(self):
+        return len(self.scores)
+
+    def __str__(self):
+        return "Score Index: {0} live hands, low {1}, high {2}.".format(len(self.scores), self.low, self.high)
+
+    def update(self, seat, index, score):
+        '''
+        This method sets the soft score of hand index of seat. A score of
+        None drops the hand. It returns no values.
+        '''
+        key = (seat, index)
+        old = self.scores.get(key)
+        if old == score:
+            return
+        if old is not None:
+            self._remove(key, old)
+        if score is not None:
+            self.scores[key] = score
+            self.counts[score] += 1
+            if (self.low == 0) or (score < self.low):
+                self.low = score
+            if score > self.high:
+                self.high = score
+        return
+
+    def _remove(self, key, score):
+        del self.scores[key]
+        counts = self.counts
+        counts[score] -= 1
+        if len(self.scores) == 0:
+            self.low = self.high = 0
+        elif counts[score] == 0:
+            # The lowest or highest hand may have gone. Walk to the next
+            # bucket in use; there is at least one live hand left.
+            while counts[self.low] == 0:
+                self.low += 1
+            while counts[self.high] == 0:
+                self.high -= 1
+        return
+
+    def discard(self, seat, index):
+        '''
+        This method drops hand index of seat if it is live. It returns no
+        values.
+        '''
+        self.update(seat, index, None)
+        return
+
+    def drop_seat(self, seat):
+        '''
+        This method drops every live hand of seat, for the end of a round or
+        a player leaving the table. It returns no values.
+        '''
+        for key in [key for key in self.scores if key[0] == seat]:
+            self._remove(key, self.scores[key])
+        return
+
+    def clear(self):
+        '''
+        This method drops every hand. It returns no values.
+        '''
+        self.counts = [0] * (ScoreIndex.TOPSCORE + 1)
+        self.scores = {}
+        self.low = self.high = 0
+        return
+
+    def beats_any(self, total):
+        '''
+        This method returns True if total beats at least one live hand, that
+        is, it is higher than the lowest live score. With no live hands, it
+        returns False.
+        '''
+        return (len(self.scores) != 0) and (total > self.low)
+
+    def lowest_from(self, floor):
+        '''
+        This method returns the lowest live score that is at least floor. If
+        no live score is that high, it returns the highest live score. With
+        no live hands, it returns 0.
+        '''
+        if floor <= self.low:
+            return self.low
+        for score in xrange(floor, self.high + 1):
+            if self.counts[score] != 0:
+                return score
+        return self.high
+
+    def diagnostic_print(self):
+        '''
+        This method prints out the attributes of the index for debugging.
+        '''
+        print("Live hands: ", self.scores)
+        print("Hands by score: ", self.counts)
+        print("Low score: ", self.low)
+        print("High score: ", self.high)
         return
 
 
@@ -183,28 +892,42 @@ class Player(object):
         
     Attributes:
         name: stores the player's name
-        hand: tracks the card tuples (rank, suit) of the cards in the player's
-            regular hand
+        bank: integer number of dollars the player currently has in chips
+        hands: list of Hand objects. hands[0] is the regular hand and
+            hands[1] is the split hand. Re-splitting adds hands[2], hands[3],
+            and so on. Each holds its cards (card codes, see CardShoe.cards),
+            scores, bet, and status. There are always at least two Hand
+            objects; end_round drops any others.
+        hand_count: the number of hands in play this round, hands[0] through
+            hands[hand_count - 1]. It is 1 until the player splits.
+        split_flag: boolean set to True if the player splits, False if not.
+        insurance: tracks the amount of any side bets taken on the dealer
+            getting blackjack (requires Dealer shows an Ace or 10 value card
+            for its visible card)
+        version: integer bumped by every change to the player's cards, bets,
+            or bank. A renderer can skip a seat whose version has not changed
+            since it was last drawn.
+        bank is a property over the _bank slot; so, changing the bank from
+            outside the class bumps the version too, and is posted to the
+            ledger as an 'adjust'.
+        ledger: the BankLedger every bank change is posted to, or None
+        seat_number: the seat posted with each ledger record (0 for the
+            dealer, 1-3 for the table seats, NOSEAT if unseated)
+        scores: the table's ScoreIndex every live hand is reported to, or
+            None
+
+    Hand Properties (these read and write the Hand objects in hands):
+        hand: the card codes in the regular hand
         soft_hand_score: integer value of the current "soft" score of the
             player's hand
         hard_hand_score: integer value of the "hard" score of the player's
             hand
-        split_flag: boolean set to True if the player splits, False if not.
-        split_hand: tracks a second hand created by a split
-        soft_split_score: integer value of the current "soft" score of the
-            player's split hand, if it exists
-        hard_split_score: integer value of the current "hard" score of the
-            player's split hand, if it exists
-        bank: integer number of dollars the player currently has in chips
+        hand_state: the packed hand_state of the regular hand
         bet: current amount bet on the outcome of their hand vs dealer's hand
         raise_bet: boolean indicating if the player has attempted to raise
             there bet
-        split_bet: tracks any bets applied to a split hand
-        raise_split_bet: boolean indicating if the player has attempted to
-            raise their split bet
-        insurance: tracks the amount of any side bets taken on the dealer
-            getting blackjack (requires Dealer shows an Ace or 10 value card
-            for its visible card)
+        split_hand, soft_split_score, hard_split_score, split_state,
+            split_bet, raise_split_bet: the same for the split hand
     
     Methods:
         __init__: Creates the player object, initializing all of the
@@ -213,7 +936,8 @@ class Player(object):
             format. If the split_flag is True, it adds split hand data.
         extract_data: This method originally printed out the basic data on a
             Player's bets, hands, and scores. This is new in the pygame
-            conversion. It returns a dict object containing the following:
+            conversion. It returns a read only Snapshot dict, cached until
+            the version changes, containing the following:
                 'name'            : player's name
                 'bank'            : player's bank
                 'hand'            : player's regular hand or None
@@ -233,43 +957,44 @@ class Player(object):
             __str__ method.
         score_hand: takes a hand and returns the soft and hard scores for
             the hand as a tuple (soft, hard)
-        add_card_to_hand: takes a card as an argument, adds it to the hand,
-            calls score_hand to get the new hard and soft scores, and returns
-            'blackjack', 'bust', or 'playable'
-        add_card_to_split: takes a card as an argument, adds it to the hand,
-            calls score_hand to get the new hard and soft scores, and returns
-            'bust' or 'playable'
+        add_card_to_hand: takes a card as an argument, adds it to the hand
+            with Hand.add_card, and returns 'blackjack', 'bust', or
+            'playable'
+        add_card_to_split: takes a card and an optional hand index (default
+            1, the split hand), adds the card to that hand, and returns 'bust'
+            or 'playable'
         blackjack: takes the player's regular bet, mulitplies it by the
             Blackjack multiplier (supplied via argument) and adds it to their
             bank
-        win: adds the player's bet to their bank
-        split_win: add the player's split bet to the bank
-        reg_loss: subtracts the player's bet from the bank. Returns False
-            if the player's bank is now empty.
-        split_loss: subtracts the player's split bet from the bank. Returns
-            False if the player's bank is now empty, ending their game.
-        tie: clears self.bet without deduction from the bank. This is needed
-            for Dealer methods.
-        split_tie: clears the bet on the split hand without deduction from
-            the bank. This is needed for Dealer methods.
+        win_hand: adds the bet on hands[index] to the bank
+        lose_hand: subtracts the bet on hands[index] from the bank and
+            removes the hand's cards. Returns False if the player's bank is
+            now empty.
+        tie_hand: clears the bet on hands[index] without deduction from the
+            bank
+        settle_hand: applies a LOSS, TIE, or WIN outcome to hands[index] with
+            lose_hand, tie_hand, or win_hand
+        win, reg_loss, tie: win_hand, lose_hand, and tie_hand for the
+            regular hand
+        split_win, split_loss, split_tie: the same for the split hand
         ins: tracks a side bet taken on the dealer getting blackjack. It
             takes a boolean for the Dealer's blackjack. It returns True for
             a positive bank, False if the Player's bank is zero or negative.
-        split_pair: moves one card over to the split_hand, prompts for a
-            initial split_bet, and sets the split_flag to True. Adjusts the
-            scores accordingly.
-        split_check: checks for a pair in the initial deal. Returns True if
-            so, False otherwise.
+        split_pair: moves the second card of hands[index] over to the next
+            free hand and sets the split_flag to True. Adjusts the scores
+            accordingly and returns the index of the new hand.
+        split_check: checks hands[index] for a pair that the table's split
+            rules allow to be split. Returns True if so, False otherwise.
         end_round: resets all hands to empty, the split_flag to False, and all
             bets to zero (including insurance). This method is used to clean
             up after the Dealer's turn ends the round.
-        update_bet: This method requires an integer for the new bet amount.
-            It makes certain the player has the money in their bank to cover
-            the new amount of their regular bet and all other bets. If so,
-            it returns 'success'. If not, it returns an error code.
-            The argument is the amount to increase the bet.
-        update_split_bet: This method performs the same operation as
-            update_bet, only on the split hand bets.
+        update_hand_bet: This method requires a hand index and an integer
+            for the new bet amount. It makes certain the player has the money
+            in their bank to cover the new amount of the bet on that hand and
+            all other bets. If so, it returns 'success'. If not, it returns
+            an error code. The argument is the amount to increase the bet.
+        update_bet: update_hand_bet for the regular hand
+        update_split_bet: update_hand_bet for the split hand
         update_ins: This method requires an integer amount of the insurance
             bet to be made. It verifies that the player has enough money in
             their bank to cover all of their bets, including the insurance
@@ -285,13 +1010,71 @@ class Player(object):
         diagnostic_print: This method prints out all of the attributes and
             object stored in this object. Normally, this is used for code
             diagnostics only.
+
+    Every change to the bank made by these methods goes through _post, which
+    changes the bank and appends one record to the ledger, if there is one.
+    Every change to a hand's score or status goes through _track, which
+    reports the hand to the table's ScoreIndex, if there is one.
         
       
     """
     values = {'A' : 1,  '2' : 2,  '3' : 3, '4' : 4, '5' : 5, \
               '6' : 6,  '7' : 7,  '8' : 8, '9' : 9, '10' : 10, \
               'J' : 10, 'Q' : 10, 'K' : 10 }
-    
+
+    __slots__ = ('name', '_bank', 'hands', 'hand_count', 'split_flag', 'insurance', 'version',
+                 '_snapshot', 'ledger', 'seat_number', 'scores')
+
+    # The regular hand is hands[0] and the split hand is hands[1]. These
+    # properties keep the attribute names the game has always used.
+    hand             = _hand_attribute(0, 'cards', "card codes in the regular hand")
+    soft_hand_score  = _hand_attribute(0, 'soft_score', "soft score of the regular hand")
+    hard_hand_score  = _hand_attribute(0, 'hard_score', "hard score of the regular hand")
+    hand_state       = _hand_attribute(0, 'state', "hand_state of the regular hand")
+    bet              = _hand_attribute(0, 'bet', "bet on the regular hand")
+    raise_bet        = _hand_attribute(0, 'raise_bet', "True once the regular bet was raised")
+    split_hand       = _hand_attribute(1, 'cards', "card codes in the split hand")
+    soft_split_score = _hand_attribute(1, 'soft_score', "soft score of the split hand")
+    hard_split_score = _hand_attribute(1, 'hard_score', "hard score of the split hand")
+    split_state      = _hand_attribute(1, 'state', "hand_state of the split hand")
+    split_bet        = _hand_attribute(1, 'bet', "bet on the split hand")
+    raise_split_bet  = _hand_attribute(1, 'raise_bet', "True once the split bet was raised")
+
+    def _get_bank(self):
+        return self._bank
+    def _set_bank(self, value):
+        if self.ledger is not None and value != self._bank:
+            self.ledger.post(self.seat_number, NOHAND, 'adjust', value - self._bank)
+        self._bank = value
+        self.version += 1
+    bank = property(_get_bank, _set_bank, doc = "dollars the player has in chips")
+
+    def _post(self, kind, hand, amount):
+        '''
+        This method adds amount to the bank and posts it to the ledger as a
+        change of kind (see BankLedger.KINDS) for hand index hand. Every bank
+        change in this class and Dealer goes through it. It returns no
+        values.
+        '''
+        self._bank += amount
+        self.version += 1
+        if self.ledger is not None:
+            self.ledger.post(self.seat_number, hand, kind, amount)
+        return
+
+    def _track(self, index):
+        '''
+        This method reports hands[index] to the table's ScoreIndex, if there
+        is one. A hand with cards and a 'playable' status is live with its
+        soft score; any other hand is dropped. It returns no values.
+        '''
+        if self.scores is not None:
+            hand = self.hands[index]
+            if (hand.status == 'playable') and (len(hand.cards) != 0):
+                self.scores.update(self.seat_number, index, hand.soft_score)
+            else:
+                self.scores.discard(self.seat_number, index)
+        return
     
     def __init__(self, name, bank=10000):
         '''
@@ -300,31 +1083,27 @@ class Player(object):
             bank: takes a non-negative integer and stores it (even for
                 Dealer). This attribute has a default of $10000 dollars
                 if not specified in the call.
-            hand: creates an empty list
-            soft_hand_score: integer set to 0
-            hard_hand_score: integer set to 0
+            hands: a list of two empty Hand objects with no bets, the
+                regular hand and the split hand
+            hand_count: set to 1, only the regular hand is in play
             split_flag: boolean set to False
-            split_hand: creates an empty list
-            soft_split_score: integer set to 0
-            hard_split_score: integer set to 0
-            bet: integer set to 0
-            split_bet: integer set to 0
             insurance: integer set to 0
+            version: integer set to 0, with no cached snapshot
+            ledger: set to None, seat_number: set to NOSEAT (see
+                CasinoTable.attach_ledger)
+            scores: set to None (see CasinoTable.attach_scores)
             
         '''
+        self.version = 0
+        self._snapshot = None
+        self.ledger = None
+        self.seat_number = NOSEAT
+        self.scores = None
         self.name = name
-        self.bank = bank
-        self.hand = []
-        self.soft_hand_score = 0
-        self.hard_hand_score = 0
+        self._bank = bank
+        self.hands = [Hand(), Hand()]
+        self.hand_count = 1
         self.split_flag = False
-        self.split_hand = []
-        self.soft_split_score = 0
-        self.hard_split_score = 0
-        self.bet = 0
-        self.raise_bet = False
-        self.split_bet = 0
-        self.raise_split_bet = False
         self.insurance = 0
         return
     
@@ -337,21 +1116,11 @@ class Player(object):
         print("Chips:\t${0}".format(self.bank))
         
         if len(self.hand) != 0:       
-            print("\n\tCurrent Hand: ", end='')
-            # This suppresses the linefeed and flushes the buffer to make the ouput
-            # look like a single line of code.                                                      
-            for rank, suit in self.hand:
-                print("{0}-{1}  ".format(rank,suit), end='')
-            print("\n\tSoft score for this hand: ", self.soft_hand_score)
-            print("\tHard score for this hand: ", self.hard_hand_score)
-            print("\n\tBet on this hand: $", self.bet)
-        if (self.split_flag == True) and (len(self.split_hand) != 0):
-            print("\n\tSplit Hand: ", end='')
-            for rank, suit in self.split_hand:
-                print("{0}-{1}  ".format(rank,suit), end='')
-            print("\n\tSoft score for this hand: ", self.soft_split_score)
-            print("\tHard score for this hand: ", self.hard_split_score)
-            print("\n\tBet on this hand: $", self.split_bet)
+            self._print_hand("Current Hand", self.hands[0])
+        if self.split_flag == True:
+            for index in xrange(1, self.hand_count):
+                if len(self.hands[index]) != 0:
+                    self._print_hand(self._split_title(index), self.hands[index])
         print("\nInsurance against Dealer Blackjack: $", self.insurance)
         return "Player " + self.name + '\n'
 
@@ -377,7 +1146,14 @@ class Player(object):
         "hands" are set to None if they do not exist, including split_hand.
         The split_flag is used to check for the latter. Bets and scores are
         set to None if they are zero.
+
+        The dict is a read only Snapshot with the hands as tuples. It is
+        built once per version; while the version is unchanged, every call
+        returns the same object. So, a caller can also compare snapshots by
+        identity to find the seats that changed.
         '''
+        if (self._snapshot is not None) and (self._snapshot[0] == self.version):
+            return self._snapshot[1]
 
         playerData = {}
         playerData['name'] = self.name
@@ -385,7 +1161,7 @@ class Player(object):
 
         # Determine if a hand was dealt to the player or still exists.
         if len(self.hand) != 0:
-            playerData['hand']        = self.hand
+            playerData['hand']        = tuple(self.hand)
             playerData['soft score']  = self.soft_hand_score
             playerData['hard score']  = self.hard_hand_score
             playerData['regular bet'] = self.bet
@@ -398,7 +1174,7 @@ class Player(object):
 
         # Determine if a split hand was dealt to the player or still exists.   
         if (self.split_flag == True) and (len(self.split_hand) != 0):
-            playerData['split hand']            = self.split_hand
+            playerData['split hand']            = tuple(self.split_hand)
             playerData['soft score split hand'] = self.soft_split_score
             playerData['hard score split hand'] = self.hard_split_score
             playerData['split hand bet']        = self.split_bet
@@ -425,6 +1201,8 @@ class Player(object):
             playerData['insurance bet'] = self.insurance
         else:
             playerData['insurance bet'] = None
+        playerData = Snapshot(playerData)
+        self._snapshot = (self.version, playerData)
         return playerData
     
     def __del__(self):
@@ -452,12 +1230,33 @@ class Player(object):
             return False
         print("Player:\t", self.name)
         print("Chips:\t${0}.00".format(self.bank))
-        print("\n\tSplit Hand: ", end='')
-        for rank, suit in self.split_hand:
-            print("{0}-{1}  ".format(rank,suit), end='')
-        print("\n\tSoft score for this hand: ", self.soft_split_score)
-        print("\tHard score for this hand: ", self.hard_split_score)
-        print("\n\tBet on this hand: $", self.split_bet)
+        for index in xrange(1, self.hand_count):
+            self._print_hand(self._split_title(index), self.hands[index])
+        return
+
+    @staticmethod
+    def _split_title(index):
+        '''
+        This method returns the title printed for split hand hands[index]:
+        "Split Hand" for hands[1], then "Split Hand 2", "Split Hand 3", ...
+        '''
+        if index == 1:
+            return "Split Hand"
+        return "Split Hand {0}".format(index)
+
+    def _print_hand(self, title, hand):
+        '''
+        This method prints the cards, scores, and bet of one Hand for
+        __str__ and print_split.
+        '''
+        print("\n\t{0}: ".format(title), end='')
+        # This suppresses the linefeed and flushes the buffer to make the ouput
+        # look like a single line of code.                                                      
+        for card in hand.cards:
+            print("{0}  ".format(CardShoe.names[card]), end='')
+        print("\n\tSoft score for this hand: ", hand.soft_score)
+        print("\tHard score for this hand: ", hand.hard_score)
+        print("\n\tBet on this hand: $", hand.bet)
         return
 
     def total_bets(self):
@@ -465,7 +1264,7 @@ class Player(object):
         This method returns a total of all bets placed by the player. It
         accepts no arguments.
         '''
-        return self.bet + self.split_bet + self.insurance
+        return sum([hand.bet for hand in self.hands]) + self.insurance
     
     def score_hand(self, card_hand):
         '''
@@ -479,50 +1278,21 @@ class Player(object):
         score. If so, it will try to find the highest playable score. Keep in
         mind that blackjacks have a soft score of 21 and a hard score of 11.
         '''
-        # We need to track Aces and both scores. They start out equal.
-        soft_score = hard_score = 0
-        aces = 0
-        for (rank, suit) in card_hand:
-            card_score = Player.values[rank]
-            # We increment both scores by the value in values, which treats
-            # Aces as a 1 point card. If no aces are present, the scores will
-            # remain equal.
-            soft_score += card_score
-            hard_score += card_score
-            if rank == 'A':
-                # Increment the number of aces.
-                aces += 1
-        
-        # The hard_score is the minimum value that the hand can have, but it
-        # may not be the only playable value. If there is at least one Ace, we
-        # we have to determine if scoring one or more Aces as 11 will result in
-        # a playable score. The only case we care about is a playable hard score
-        # with at least one Ace.
-        if hard_score < 21 and aces != 0:
-            for i in xrange(1, aces + 1):
-                # This for loop takes the soft score and adds 10 to it, tests
-                # it to see if it is still playable. If so, it changes the soft
-                # score to match it. It does this until all Aces are exhausted.
-                # The largest playable score will be containted in soft_score
-                # after it completes its run.
-                test_score = soft_score + 10
-                if test_score <= 21:
-                    soft_score = test_score
-        
-        # Now, we return the tuple.
-        return (soft_score, hard_score)
-    
+        return Hand.score(card_hand)
+
     def add_card_to_hand(self, card):
         '''
-        This method accepts a card tuple (rank, suit) as argument. It places
-        this card into the Player.hand list. It calls the internal method
-        score_hand to rescore the hard and soft scores of the hand. The hard
+        This method accepts a card code as argument. It places
+        this card into the regular hand with Hand.add_card. The new hard and
+        soft scores and the result are one lookup in Hand.hand_table for the
+        card and the hand_state of the hand; so, the rest of the hand is never
+        rescanned. The first card of a hand starts the state over. The hard
         score for a hand will be equal to the soft score if there are no aces
         in the hand. The soft_score can be greater than the hard score if
         scoring any ace in the hand as an 11 would result in a playable hand.
         In fact, blackjack (a natural 21) has a hard score of 11, while the
         soft score is 21 with the first two cards that were dealt.
-        INPUT: card, a tuple of (rank, suit)
+        INPUT: card, a card code (see CardShoe.cards)
         OUTPUT: This function returns the following:
             'blackjack'  = the soft score is 21, the hard score is 11, and the
                            len(hand) is 2 (meaning the starting deal was a
@@ -532,38 +1302,34 @@ class Player(object):
                            If one is 21, the hand is "longer" than 2 cards,
                            making it ineligible for blackjack.
         '''
-        self.hand.append(card)
-        (self.soft_hand_score, self.hard_hand_score) = self.score_hand(self.hand)
-        if self.hard_hand_score > 21:
-            return 'bust'
-        elif (self.hard_hand_score == 11) and \
-             (self.soft_hand_score == 21) and \
-             (len(self) == 2):
-            return 'blackjack'
-        else:
-            return 'playable'
+        self.version += 1
+        result = self.hands[0].add_card(card)
+        self._track(0)
+        return result
     
-    def add_card_to_split(self, card):
+    def add_card_to_split(self, card, index = 1):
         '''
-        This method accepts a card tuple (rank, suit) as argument. It places
-        this card into the Player.split_hand list. It calls the internal
-        method score_hand to rescore the hard and soft scores of the split
-        hand. The hard score for a hand will be equal to the soft score if
+        This method accepts a card code as argument. It places
+        this card into a split hand, hands[1] unless another index is given
+        for a re-split hand, the same way
+        add_card_to_hand does for the regular hand. The hard score for a hand will be equal to the soft score if
         there are no aces in the hand. The soft_score can be greater than the
         hard score if scoring any ace in the hand as an 11 would result in
         a playable hand. This hand cannot have a blackjack result because it
         it created from the second card dealt.
-        INPUT: card, a tuple of (rank, suit)
+        INPUT: card, a card code (see CardShoe.cards)
+        OPTIONAL: index, integer index of the split hand in hands (default 1)
         OUTPUT: This function returns the following:
             'bust'       = the hard_score is greater than 21
             'playable'   = at least one score is less than or equal to 21
         '''
-        self.split_hand.append(card)
-        (self.soft_split_score, self.hard_split_score) = self.score_hand(self.split_hand)
-        if self.hard_split_score > 21:
-            return 'bust'
-        else:
-            return 'playable'
+        hand = self.hands[index]
+        self.version += 1
+        if hand.add_card(card) != 'bust':
+            # A two card 21 on a split hand is not a blackjack.
+            hand.status = 'playable'
+        self._track(index)
+        return hand.status
         
     def blackjack(self, multiplier):
         '''
@@ -584,104 +1350,122 @@ class Player(object):
         a natural 21. (Splits are offered when a pair is dealt to a player.)
         '''
         winnings = int(multiplier * self.bet)
-        self.bank += winnings
-        self.hand = []
-        self.soft_hand_score = self.hard_hand_score = 0
-        self.bet = 0
-        return
-    
-    def win(self):
-        '''
-        This method handles the player's winnings after a win with their
-        regular hand. The split_hand has a separate method for this purpose.
-        
-        This method does not accept arguments nor return values.
-        '''
-        # There is no multiplier for a regular win.
-        self.bank += self.bet
+        self._post('blackjack', 0, winnings)
+        self.hands[0].clear()
+        self._track(0)
+        self.version += 1
         return
     
-    def split_win(self):
+    def win_hand(self, index):
         '''
-        This method handles the player's winnings after a win with their
-        split hand. The regular hand has a separate method for this purpose.
+        This method handles the player's winnings after a win with the hand
+        hands[index]. There is no multiplier for a regular win.
         
-        This method does not accept arguments nor return values.
+        This method does not return values.
         '''
-        # There is no multiplier for a win with a split hand.
-        self.bank += self.split_bet
+        self._post('win', index, self.hands[index].bet)
+        # The hand is settled; so, it no longer counts for the dealer.
+        if self.scores is not None:
+            self.scores.discard(self.seat_number, index)
         return
     
-    def reg_loss(self):
+    def lose_hand(self, index):
         '''
-        This method deducts player's losses from bets on their regular hand,
+        This method deducts player's losses from the bet on hands[index],
         either to a bust or a lower hand score during the round than the
-        dealer.
+        dealer, and removes the cards of that hand.
         
-        This method takes no arguments. It returns True while the players has
-        a positive balance in the bank. A zero or negative balance returns
-        False.
+        It returns True while the players has a positive balance in the bank.
+        A zero or negative balance returns False.
         
         Note: This method is predicated on the idea that other methods or
         functions have made certain that the player had enough in their bank
         to cover any bets made.
         '''
-        self.bank -= self.bet
-        self.hand = []
+        hand = self.hands[index]
+        self._post('loss', index, -hand.bet)
+        hand.cards = []
+        self._track(index)
+        self.version += 1
         if self.bank <= 0:
             return False
         else:
             return True
-       
-    def split_loss(self):
+    
+    def tie_hand(self, index):
         '''
-        This method deducts the player's losses on the split hand, either
-        to a bust or a lower score during the round than the dealer.
-        
-        This method takes no arguments. It returns True while the players
-        has a positive balance in the bank. A zero or negative balance
-        returns False.
+        This method clears the bet on hands[index] if the hand ties with the
+        Dealer. Ties do not normally result in casino wins. This is due to the
+        realization by gaming commissions and club owners that coming away
+        richer than you started at Blackjack tables is hard enough without
+        the Dealer winning ties.
         
-        Note: This method is predicated on the idea that other methods or
-        functions have made certain that the player had enough in their
-        bank to cover any bets made.
+        This method returns no values. There is no deduction from the bank,
+        nor gain in a tie.
         '''
-        self.bank -= self.split_bet
-        self.split_hand = []
-        if self.bank <= 0:
-            return False
+        # A tie is posted with no amount; so, the ledger still counts it.
+        self._post('tie', index, 0)
+        self.hands[index].bet = 0
+        if self.scores is not None:
+            self.scores.discard(self.seat_number, index)
+        return
+
+    def settle_hand(self, index, outcome):
+        '''
+        This method applies the outcome settle_hands worked out for
+        hands[index]: LOSS calls lose_hand, TIE calls tie_hand, and WIN calls
+        win_hand. It returns what lose_hand returns for a loss, and True
+        otherwise.
+        '''
+        if outcome == LOSS:
+            return self.lose_hand(index)
+        if outcome == TIE:
+            self.tie_hand(index)
         else:
-            return True
+            self.win_hand(index)
+        return True
+
+    def win(self):
+        '''
+        This method handles the player's winnings after a win with their
+        regular hand. It takes no arguments and returns no values.
+        '''
+        return self.win_hand(0)
+    
+    def split_win(self):
+        '''
+        This method handles the player's winnings after a win with their
+        split hand. It takes no arguments and returns no values.
+        '''
+        return self.win_hand(1)
+    
+    def reg_loss(self):
+        '''
+        This method deducts player's losses from bets on their regular hand.
+        It returns False if the player's bank is now empty. See lose_hand.
+        '''
+        return self.lose_hand(0)
+       
+    def split_loss(self):
+        '''
+        This method deducts the player's losses on the split hand. It returns
+        False if the player's bank is now empty. See lose_hand.
+        '''
+        return self.lose_hand(1)
     
     def tie(self):
         '''
         This method clears the regular bet if the hand ties with the Dealer.
-        Ties do not normally result in casino wins. This is due to the
-        realization by gaming commissions and club owners that coming away
-        richer than you started at Blackjack tables is hard enough without
-        the Dealer winning ties.
-        
-        This method accepts no arguments and returns no values. The reason
-        for the latter is that there is no deduction from the bank, nor gain
-        in a tie.
+        It takes no arguments and returns no values.
         '''
-        self.bet = 0
-        return
+        return self.tie_hand(0)
     
     def split_tie(self):
         '''
         This method clears the split bet if the split hand ties with the
-        Dealer. Ties do not normally result in casino wins. This is due to the
-        realization by gaming commissions and club owners that coming away
-        richer than you started at Blackjack tables is hard enough without
-        the Dealer winning ties.
-        
-        This method accepts no arguments and returns no values. The reason
-        for the latter is that there is no deduction from the bank, nor gain
-        in a tie.
+        Dealer. It takes no arguments and returns no values.
         '''
-        self.split_bet = 0
-        return
+        return self.tie_hand(1)
     
     def ins(self, dealer_blackjack):
         '''
@@ -701,14 +1485,17 @@ class Player(object):
         Note: This method does not care if the insurance bet is zero. In that
         case, it has no effect on their bank balance.
         '''
-        if dealer_blackjack == True:
+        if self.insurance == 0:
+            # There is nothing to post.
+            pass
+        elif dealer_blackjack == True:
             # The Dealer got blackjack. The player who has a non-zero
-            # insurance bet wins the bet. Otherwise, self.insurance = 0.
-            self.bank += self.insurance
+            # insurance bet wins the bet.
+            self._post('insurance', NOHAND, self.insurance)
         else:
             # The Dealer did not get blackjack. The insurance bet is
             # deducted from the player's bank.
-            self.bank -= self.insurance
+            self._post('insurance', NOHAND, -self.insurance)
 
         # In case the bet was deducted from the bank, we need to check it.
         if self.bank <= 0:
@@ -722,26 +1509,25 @@ class Player(object):
         arguments and returns no values. It is used at the end of a round, after the Dealer's
         turn.
         '''
-        self.hand = []
-        self.soft_hand_score = 0
-        self.hard_hand_score = 0
+        # Re-split hands are dropped; the regular and split hands are reused.
+        if self.scores is not None:
+            self.scores.drop_seat(self.seat_number)
+        del self.hands[2:]
+        for hand in self.hands:
+            hand.clear()
+        self.hand_count = 1
         self.split_flag = False
-        self.split_hand = []
-        self.soft_split_score = 0
-        self.hard_split_score = 0
-        self.bet = 0
-        self.raise_bet = False
-        self.split_bet = 0
-        self.raise_split_bet = False
         self.insurance = 0
+        self.version += 1
         return
     
-    def update_bet(self, new_increase, min_bet=1, max_bet=100):
+    def update_hand_bet(self, index, new_increase, min_bet=1, max_bet=100):
         '''
-        This method increases the regular bet by the amount of the increase.
-        It will add up all the other bets to make sure that player has enough
-        money in the bank to cover it.
-        INPUT: integer new_increase (or a float that will be truncated)
+        This method increases the bet on hands[index] by the amount of the
+        increase. It will add up all the other bets to make sure that player
+        has enough money in the bank to cover it.
+        INPUT: integer index of the hand (0 regular, 1 split, 2 and up for
+            re-split hands) and integer new_increase (or a float that will be truncated)
         OPTIONAL: min_bet and max_bet are not required (because of defaults),
             but a casino could override the value by including it.
         OUTPUT: string with the following meanings
@@ -772,8 +1558,9 @@ class Player(object):
         
         # Next, the new amount needs to be checked against min and max bets.
         # Note: min and max bets only apply to the bets laid before the cards
-        # are dealt. So, Player.bet = 0 then.
-        if self.bet == 0:
+        # are dealt. So, the bet on the hand is 0 then.
+        hand = self.hands[index]
+        if hand.bet == 0:
             if amt_to_increase < min_bet:
                 return 'min'
             # A max_bet of zero means there is no maximum (besides the implicit
@@ -782,68 +1569,30 @@ class Player(object):
                 return 'max'
         # A non-zero bet automatically is subject to the double down rule. A
         # player may not exceed twice their original bet on a "great" hand.
-        elif self.bet < amt_to_increase:
+        elif hand.bet < amt_to_increase:
             return 'size'
                 
         # Now, the total amount of all bets needs be checked against the bank
         # balance. total_bets() = self.bet + self.split_bet + self.insurance
         if (self.total_bets() + amt_to_increase) > self.bank:
             return 'bust'
-        self.bet += amt_to_increase
+        hand.bet += amt_to_increase
+        self.version += 1
         return 'success'
+
+    def update_bet(self, new_increase, min_bet=1, max_bet=100):
+        '''
+        This method increases the regular bet by the amount of the increase.
+        See update_hand_bet for the arguments and return values.
+        '''
+        return self.update_hand_bet(0, new_increase, min_bet, max_bet)
     
     def update_split_bet(self, new_increase, min_bet=1, max_bet=100):
         '''
-        This method increases the split bet by the amount of the increase. It
-        will add up all the other bets to make sure that player has enough
-        money in the bank to cover it.
-        INPUT: integer new_increase (or a float that will be truncated)
-        OPTIONAL: min_bet and max_bet are not required (because of defaults),
-            but a casino could override the value by including it.
-        OUTPUT: string with the following meanings
-            'success'   = the bet could be increased
-            'bust'      = the bet exceeds the money in the bank
-            'size'      = the bet is not allowed because it exceeds double the
-                        original bet
-            'min'       = the bet is not enough to meet the casino minimums
-            'max'       = the bet exceeds the max allowed initial bet
-            'TypeError' = at least one 'numerical' argument supplied was not a
-                        number
-            'Unknown'   = an unknown error occurred
-        
-        Note: A zero max_bet means that there is no maximum initial bet amount.
+        This method increases the split bet by the amount of the increase.
+        See update_hand_bet for the arguments and return values.
         '''
-        # The first step is to convert a possible floating point number into an integer.
-        try:
-            amt_to_increase = int(new_increase)
-        except TypeError:
-            return 'TypeError'
-        except:
-            return 'Unknown'
-        else:
-            # If it could be converted, the sign needs to be stripped off the value.
-            amt_to_increase = abs(amt_to_increase)
-        
-        # Next, the new amount needs to be checked to see against min and max bets.
-        # Note, min and max bets only apply to the bets laid before the cards are 
-        # dealt. So, Player.bet = 0 then.
-        if self.split_bet == 0:
-            if amt_to_increase < min_bet:
-                return 'min'
-            # A max_bet of zero means there is no maximum (besides the implicit all in).
-            if (max_bet != 0) and (amt_to_increase > max_bet):
-                return 'max'
-        # A non-zero bet automatically is subject to the double down rule. A player
-        # may not exceed twice their original bet on a "great" hand.
-        elif self.split_bet < amt_to_increase:
-            return 'size'
-                
-        # Now, the total amount of all bets needs be checked against the bank balance.
-        # total_bets = self.bet + self.split_bet + self.insurance
-        if (self.total_bets() + amt_to_increase) > self.bank:
-            return 'bust'
-        self.split_bet += amt_to_increase
-        return 'success'
+        return self.update_hand_bet(1, new_increase, min_bet, max_bet)
     
     def update_ins(self, ins_bet, min_bet=0, max_bet=200):
         '''
@@ -879,7 +1628,6 @@ class Player(object):
             # If it could be converted, the sign needs to be stripped off the
             # value.
             ins_amt = abs(ins_amt)
-        print("update_ins: Min Bet is ${0}. Max Bet is ${1}.".format(min_bet, max_bet))
         # Next, we need to check for an existing insurance bet. If it exists
         # already, no changes are permitted.
         if (self.insurance != 0):
@@ -893,30 +1641,53 @@ class Player(object):
         if (self.total_bets() + ins_amt) > self.bank:
             return 'bust'
         self.insurance += ins_amt
+        self.version += 1
         return 'success'
     
-    def split_check(self):
-        '''
-        This method verifies that the player's initial deal supports a split.
-        It returns True if the cards are a pair, False otherwise.
-        '''
-        if (self.hand[0][0] != self.hand[1][0]):
+    def split_check(self, index = 0, max_hands = 2, resplit_aces = False):
+        '''
+        This method verifies that hands[index] supports a split. The hand
+        must be a two card pair, and the player must have fewer than
+        max_hands hands in play. A pair of Aces that came from splitting
+        Aces can only be split again if resplit_aces is True.
+        INPUT: index, integer index of the hand in hands (default 0)
+               max_hands, integer, most hands a player may split to
+                   (default 2, one split and no re-splits)
+               resplit_aces, boolean, True if Aces may be re-split
+                   (default False)
+        It returns True if the hand can be split, False otherwise.
+        '''
+        cards = self.hands[index].cards
+        if (len(cards) != 2) or (self.hand_count >= max_hands):
             return False
-        else:
-            return True
+        rank = CardShoe.code_ranks[cards[0]]
+        if rank != CardShoe.code_ranks[cards[1]]:
+            return False
+        # Once the player has split, another pair of Aces is a re-split.
+        if (rank == 0) and (self.hand_count > 1) and not resplit_aces:
+            return False
+        return True
         
-    def split_pair(self):
+    def split_pair(self, index = 0):
         '''
-        This method moves the second card in the player's initial hand to the
-        split_hand, sets the split_flag to True, and recalculates the hand
-        scores.
+        This method moves the second card in hands[index] to the next free
+        hand, sets the split_flag to True, and recalculates the hand scores.
+        The first split goes to the split hand, hands[1]. Each re-split adds
+        another Hand to hands. split_check should have been called first.
+        It returns the index of the new hand, which has no bet yet.
         '''
+        new_index = self.hand_count
+        if new_index == len(self.hands):
+            self.hands.append(Hand())
         self.split_flag = True
-        self.add_card_to_split(self.hand[1])
-        self.hand.pop()
-        (self.soft_hand_score, self.hard_hand_score) = self.score_hand(self.hand)
-        (self.soft_split_score, self.hard_split_score) = self.score_hand(self.split_hand)
-        return
+        self.hand_count += 1
+        self.add_card_to_split(self.hands[index].cards.pop(), new_index)
+        # The split hand is down to its first card. add_card_to_split
+        # already scored the new hand.
+        self.hands[index].rescore()
+        self._track(index)
+        self.version += 1
+        return new_index
     
     def double_down(self, bet_amt, split):
         '''
@@ -940,16 +1711,12 @@ class Player(object):
         min and max do not apply to this bet. Only 'size' matters. Neither
         bets can be more than double the original bet.
         '''
-        # First, we check the split boolean to see if this is the split hand.
-        # Regular and split hands use different methods because their
-        # attributes have to be handled differently.
+        # The split boolean picks the hand: hands[1] is the split hand.
         if split:
-            # It is a split hand.
-            bet_check = self.update_split_bet(bet_amt, 0, self.bet)
+            index = 1
         else:
-            # It is a regular hand.
-            bet_check = self.update_bet(bet_amt, 0, self.bet)
-        return bet_check
+            index = 0
+        return self.update_hand_bet(index, bet_amt, 0, self.bet)
     
     def diagnostic_print(self):
         '''
@@ -967,12 +1734,18 @@ class Player(object):
         print("Split Hand: ", self.split_hand)
         print("Soft Score for Split Hand: ", self.soft_split_score)
         print("Hard Score for Split Hand: ", self.hard_split_score)
+        print("Hands in Play: ", self.hand_count)
+        for index in xrange(2, self.hand_count):
+            print("Re-split Hand {0}: ".format(index), self.hands[index].cards)
         print("Remaining Bank: ", self.bank)
         print("Bet on Hand: ", self.bet)
         print("Raise Flag on Regular Bet: ", self.raise_bet)
         print("Bet on Split Hand: ", self.split_bet)
         print("Raise Flag on Split Bet: ", self.raise_split_bet)
         print("Insurance Bet: ", self.insurance)
+        print("Version: ", self.version)
+        print("Ledger Seat: ", self.seat_number)
+        print("Score Index: ", self.scores)
         return
 
 
@@ -990,22 +1763,21 @@ class Dealer(Player):
         values
         
     Attributes:
-        hand: tracks the card tuples (rank, suit) of the cards in the Dealer's
-            hand (a list)
+        hands: a list holding the Dealer's one Hand object
         bank: tracks dealers bank (integer)
-        soft_hand_score: integer value of the current "soft" score of the
-            Dealer's hand
-        hard_hand_score: integer value of the "hard" score of the player's
-            hand
-        visible_card: single tuple showing hand[1] once it is dealt
+        visible_card: list holding the card code of hand[1] once it is dealt
         visible_soft_score: integer soft score of the visible card
         visible_hard_score: integer hard score of the visible card (only
             differs on Aces)
         blackjack_flag: True if the dealer's visible card is an Ace or a 10
             value card, False otherwise
+        counter: a CardCounter object that is shown the hold card (hand[0])
+            when it is revealed, or None
+        hold_revealed: True once the hold card has been revealed this round
     
     Inherited Attributes (from Player class):
-        hand, soft_hand_score, hard_hand_score
+        name, bank, hands, and the properties hand, soft_hand_score,
+        hard_hand_score, and hand_state, which read hands[0]
     
     Methods:
         __init__: initializes the attributes specific to dealer objects. Will 
@@ -1020,7 +1792,7 @@ class Dealer(Player):
                 'name'               : dealer's name (aka "Dealer")
                 'bank'               : dealer's bank
                 'hand'               : dealer's hand or None (a list)
-                'visible card'       : a tuple of the hand[1]
+                'visible card'       : a list of the hand[1]
                 'visible soft score  : soft score of the visible card
                 'visible hard score  : hard score of the visible card
                 'soft score'         : soft score for dealers's hand or None
@@ -1029,7 +1801,9 @@ class Dealer(Player):
             'dealer turn' set to True is a way to see that it is the dealer's
             turn, changing the GUI printout.
         dealer_print: This method is used during the dealer's turn to print
-            out the full hand and hand scores.
+            out the full hand and hand scores. It reveals the hold card.
+        reveal_hold_card: turns the hold card over, counting it once if there
+            is a counter
         add_card_to_hand: adds a card to the dealer's hand, updates 
             visible_card (a hand) and its scores on second deal, updates
             the actual hand scores,  sets the blackjack_flag for the right
@@ -1053,29 +1827,43 @@ class Dealer(Player):
         __len__, __del__, score_hand
 
     """
+    __slots__ = ('visible_card', 'visible_soft_score', 'visible_hard_score', 'blackjack_flag',
+                 'counter', 'hold_revealed', '_turn_snapshot')
+
     def __init__(self, name='Dealer', bank=100000):
         '''
         This method creates the following attributes for Dealers:
-            hand: creates an empty list
+            hands: a list of one empty Hand object
+            hand_count: set to 1
             bank: set to 100,000 (by default, but can be changed via an
                 optional argument)
-            soft_hand_score: set to 0
-            hard_hand_score: set to 0
+            split_flag: set to False, since the Dealer never splits
+            insurance: set to 0
             visible_card: empty list
             visible_soft_score: set to 0
             visible_hard_scort: set to 0
             blackjack_flag: set to False
+            version: set to 0, with no cached snapshots
         
         INPUT: bank, integer, defaults to 100,000 (dealer's starting bank)
                name, string, defaults to 'Dealer' (dealer's name)
         '''
+        self.version = 0
+        self._snapshot = self._turn_snapshot = None
+        self.ledger = None
+        self.seat_number = 0
+        self.scores = None
         self.name = name
-        self.hand = []
-        self.bank = bank
-        self.soft_hand_score = self.hard_hand_score = 0
+        self.hands = [Hand()]
+        self.hand_count = 1
+        self._bank = bank
+        self.split_flag = False
+        self.insurance = 0
         self.visible_card = []
         self.visible_soft_score = self.visible_hard_score = 0
         self.blackjack_flag = False
+        self.counter = None
+        self.hold_revealed = False
         return
 
     def __str__(self):
@@ -1096,8 +1884,7 @@ class Dealer(Player):
             if len(self) >= 1:
                 print("Facedown", end='')
             if len(self) >= 2:
-                (rank,suit) = self.visible_card[0]
-                print("  {0}-{1}".format(rank, suit), end='')
+                print("  {0}".format(CardShoe.names[self.visible_card[0]]), end='')
             if self.visible_soft_score == self.visible_hard_score:
                 print("\n\tDealer has {0} showing".format(self.visible_hard_score))
             else:
@@ -1116,7 +1903,7 @@ class Dealer(Player):
                 'hand'               : dealer's hand or None (a list)
                 'soft score'         : soft score for dealer's hand or None
                 'hard score'         : hard score for dealer's hand or None
-                'visible card'       : a tuple of the hand[1] or None
+                'visible card'       : a list of the hand[1] or None
                 'visible soft score  : soft score of the visible card
                 'visible hard score  : hard score of the visible card
                 'dealer turn'        : set to None, unless dealer_turn is True
@@ -1127,7 +1914,17 @@ class Dealer(Player):
         'hand' and 'visible card' are set to None if the Dealer has an empty
         hand, as are the scores. (Note, Dealers have no split_hand, nor any
         bets.)
+
+        Like Player.extract_data, the dict is a read only Snapshot that is
+        cached until the version changes. The player turn and dealer turn
+        views are cached separately.
         '''
+        if dealer_turn == True:
+            cached = self._turn_snapshot
+        else:
+            cached = self._snapshot
+        if (cached is not None) and (cached[0] == self.version):
+            return cached[1]
 
         dealerData = {}
         dealerData['name'] = self.name
@@ -1135,10 +1932,10 @@ class Dealer(Player):
 
         # Determine if a hand was dealt to the Dealer or still exists.
         if len(self.hand) != 0:
-            dealerData['hand']        = self.hand
+            dealerData['hand']        = tuple(self.hand)
             dealerData['soft score']  = self.soft_hand_score
             dealerData['hard score']  = self.hard_hand_score
-            dealerData['visible card']       = self.visible_card
+            dealerData['visible card']       = tuple(self.visible_card)
             dealerData['visible soft score'] = self.visible_soft_score
             dealerData['visible hard score'] = self.visible_hard_score
         else:
@@ -1157,33 +1954,53 @@ class Dealer(Player):
             dealerData['dealer turn'] = True
         else:
             dealerData['dealer turn'] = None
+        dealerData = Snapshot(dealerData)
+        if dealer_turn == True:
+            self._turn_snapshot = (self.version, dealerData)
+        else:
+            self._snapshot = (self.version, dealerData)
         return dealerData
 
     def dealer_print(self):
         '''
         This method is used during the dealer's turn to print out the full hand and
-        hand scores.
+        hand scores. Printing the full hand reveals the hold card.
         '''
+        self.reveal_hold_card()
         print("Dealer:\t", self.name)
         print("Bank:\t${0}".format(self.bank))
         print("\n\tCurrent Hand: ", end='')
         # This suppresses the linefeed and flushes the buffer to make the ouput
         # look like a single line of code.
                                                       
-        for rank, suit in self.hand:
-            print("{0}-{1}  ".format(rank,suit), end='')
+        for card in self.hand:
+            print("{0}  ".format(CardShoe.names[card]), end='')
         print("\n\tSoft score for this hand: ", self.soft_hand_score)
         print("\tHard score for this hand: ", self.hard_hand_score)
         return "Data on "+ self.name + " is complete"
+
+    def reveal_hold_card(self):
+        '''
+        This method turns over the dealer's hold card, hand[0]. The hold card
+        is dealt face down; so, the counter has not seen it yet. The first
+        call in a round shows it to the counter, if there is one. Any later
+        calls do nothing, since the printouts of the dealer's turn call this
+        every time they are drawn. It returns no values.
+        '''
+        if self.hold_revealed or len(self.hand) == 0:
+            return
+        self.hold_revealed = True
+        if self.counter is not None:
+            self.counter.count_code(self.hand[0])
+        return
      
     def add_card_to_hand(self, card):
         '''
         Functionality carried over from Player.add_card_to_hand():
         
-        This method accepts a card tuple (rank, suit) as argument. It places
-        this card into the Dealer.hand list. It calls the internal method
-        score_hand() to rescore the hard and soft scores of the hand with the
-        new card. The hard score for a hand will be equal to the soft score
+        This method accepts a card code as argument. It places
+        this card into the Dealer's hand with Hand.add_card, the same way
+        Player.add_card_to_hand does. The hard score for a hand will be equal to the soft score
         if there are no aces in the hand. The soft_score can be greater than
         the hard score if scoring any ace in the hand as an 11 would result
         in a playable hand. Note: Blackjack (a natural 21) has a hard score
@@ -1192,13 +2009,13 @@ class Dealer(Player):
         New functionality specific to Dealer class:
         
         On second deal, assign the second card to attribute visible_card and
-        run score_hand on this card to get soft and hard visible scores.
+        score this card to get soft and hard visible scores.
         This method sets the blackjack_flag to True if the visible_card is an
         Ace, a face card, or a 10. This condition allows players to place an
         'insurance bet' on whether or not the Dealer might have Blackjack
         based on the visible card.
         
-        INPUT: card, a tuple of (rank, suit)
+        INPUT: card, a card code (see CardShoe.cards)
         OUTPUT: This function returns the following:
             'blackjack'  = the soft score is 21, the hard score is 11, and the
                            len(hand) is 2 (meaning the starting deal was a
@@ -1210,26 +2027,22 @@ class Dealer(Player):
 
         With the Pygame conversion, no functionality changes were required.
         '''
-        self.hand.append(card)
-        (self.soft_hand_score, self.hard_hand_score) = self.score_hand(self.hand)
+        hand = self.hands[0]
+        status = hand.add_card(card)
+        self.version += 1
         # If this is the second card dealt to the Dealer, add it to the
-        # visible card and score it.
-        if len(self.hand) == 2:
+        # visible card and score it. A single card is scored by the table
+        # entry for an empty hand.
+        if len(hand.cards) == 2:
             self.visible_card.append(card)
-            (self.visible_soft_score, self.visible_hard_score) = self.score_hand(self.visible_card)
+            (state, self.visible_soft_score, self.visible_hard_score, visible_status) = \
+                Hand.hand_table[card][Hand.EMPTYHAND]
             # For a visible Ace, face card, or 10, the blackjack flag must
             # to be set to True so that insurance bets can be placed on it.
-            # self.values is a dict constant with the values of all of the
-            # card ranks in it. Aces are listed as a score of 1 there.
-            (rank, suit) = card
-            if (Dealer.values[rank] == 1) or (Dealer.values[rank] == 10):
+            # The hard score of a single Ace is 1.
+            if (self.visible_hard_score == 1) or (self.visible_hard_score == 10):
                 self.blackjack_flag = True
-        if self.hard_hand_score > 21:
-            return 'bust'
-        elif (self.hard_hand_score == 11) and (self.soft_hand_score == 21) and (len(self) == 2):
-            return 'blackjack'
-        else:
-            return 'playable'
+        return status
         
     def end_round(self):
         '''
@@ -1238,13 +2051,13 @@ class Dealer(Player):
         purpose as Player.end_round(), ensuring all flags, hands, and scores
         are reset between rounds.
         '''
-        self.hand = []
-        self.soft_hand_score = 0
-        self.hard_hand_score = 0
+        self.hands[0].clear()
         self.blackjack_flag = False
         self.visible_card = []
         self.visible_soft_score = 0
         self.visible_hard_score = 0
+        self.hold_revealed = False
+        self.version += 1
         return
 
     def dealer_lost(self, remaining_bets):
@@ -1257,7 +2070,8 @@ class Dealer(Player):
         With Pygame conversion, all print statements have been removed.
         '''
         losses = remaining_bets
-        self.bank -= losses
+        if losses != 0:
+            self._post('dealer lost', NOHAND, -losses)
         if self.bank <= 0:
             return False
         else:
@@ -1270,7 +2084,8 @@ class Dealer(Player):
         no return value.
         '''
         wins = player_bets
-        self.bank += wins
+        if wins != 0:
+            self._post('dealer won', NOHAND, wins)
         return
     
     def diagnostic_print(self):
@@ -1279,7 +2094,7 @@ class Dealer(Player):
         debug code. It is not intended for use outside of debugging programs.
         '''
         print("Class Order Attribute: ")
-        print("Name: ", Dealer.name)
+        print("Name: ", self.name)
         print("Values Dictionary: ", Dealer.values)
         print("Dealer Object Attributes:")
         print("Dealer's Hand: ", self.hand)
@@ -1289,7 +2104,9 @@ class Dealer(Player):
         print("Visible Soft Score: ", self.visible_soft_score)
         print("Visible Hard Score: ", self.visible_hard_score)
         print("Blackjack Flag: ", self.blackjack_flag)
+        print("Hold Card Revealed: ", self.hold_revealed)
         print("Dealer's Remaining Bank: ", self.bank)
+        print("Version: ", self.version)
         return
 
 
@@ -1302,6 +2119,13 @@ class CasinoTable(object):
         TABLESIZE:  TABLESIZE: integer, max number of players seatable at
             the table, currently 3 at 1024x768 resolution
         HANDLIST: lists all possible hands players and dealer might have
+            under the default split rules
+        SHOESPEC: the default shoe geometry used to build the CardShoe,
+            {'decks': 6, 'penetration': None, 'cut card': None, 'csm': False}
+        SPLITRULES: the default split rules, {'max hands': 2,
+            'resplit aces': False}. 'max hands' is the most hands a player
+            may split to (2 is a single split, 4 is the usual casino limit),
+            and 'resplit aces' allows a pair of split Aces to be split again.
 
     
     Attributes:
@@ -1311,8 +2135,22 @@ class CasinoTable(object):
             multiplier is a floating point two decimal approximation of the
                 ratio used to calculate the actual winnings
             This tuple is used to store and manage the table mulitiplier
-        deck: a CardShoe object that can be recreated via replace_cardshoe()
+        deck: a CardShoe object that can be reshuffled via replace_cardshoe()
             method
+        shoe_spec: the dict used to build deck, SHOESPEC updated by any keys
+            passed to __init__
+        split_rules: SPLITRULES updated by any keys passed to __init__
+        hand_list: every hand key in results for these split rules. It is
+            HANDLIST for the default rules.
+        rng: the random number generator handed to the CardShoe
+        shoe_pool: a ShoePool object that replace_cardshoe takes ready
+            shuffled shoes from, or None
+        counter: a CardCounter object shared by the deck and the dealer, or
+            None
+        ledger: a BankLedger object every bank change at the table is posted
+            to, or None
+        scores: a ScoreIndex of the soft scores of every live player hand,
+            kept up to date by the players as their hands change
         tableDealer: a Dealer object, initialized by a name and starting
             bank amount
         min_bet: The minimum acceptable ante bet for the Dealer's Table.
@@ -1348,6 +2186,9 @@ class CasinoTable(object):
                 'right reg'    : player in right seat, regular hand
                 'right split'  : player in right seat, split hand
                 'dealer reg'   : dealer's hand
+            With a 'max hands' split rule above 2, each seat also has
+            re-split hands 'left split 2', 'left split 3', and so on (see
+            hand_key).
             The statuses for these hands are:
                 'blackjack'    : natural 21
                 'playable'     : the hand is still playable
@@ -1395,6 +2236,15 @@ class CasinoTable(object):
             any busts that happen to players using the Player.reg_loss or Player.split_loss.
             Dropped the player deletion from this method, due to issues incrementing through
             the player list. This method returns codes 'none' or 'playable'.
+        hand_key: (static) returns the results key for a seat and hand index
+        hand_index: (static) returns the (seat, hand index) for a results key
+        seat_hands: returns the (results key, hand index) of every hand a
+            seat has in play
+        versions: returns the version of every seat and the dealer, so a
+            renderer can skip the ones that did not change
+        settle: settles the hands still in play against the dealer's hand
+            with settle_hands, then applies the payouts to the players and
+            the dealer
         dealer_autowin: When the Dealer doesn't need to play its hand, this method performs
             the hold card reveal for the dealer.
         dealer_turn: this method plays the dealer's hand according to the rules:
@@ -1405,16 +2255,23 @@ class CasinoTable(object):
                 one players playable hand and is greater than 16.
             * dealer must take a card on a hard 16- with a soft score that does not beat any
                 playable player hands.
-            then, it determines all remaining wins and losses, using max_min_score and Player
-            and Dealer class win/lose/tie methods to handle the changes to banks.
-        max_min_score: this method pulls out the max and min hand scores after eliminating
-            hands that busted or blackjacked. It returns a tuple (max,min).
+            then, it determines all remaining wins and losses with settle, using max_min_score to
+            decide when the dealer stands.
+        max_min_score: this method reads the max and min live hand scores from scores, which
+            already leaves out hands that busted, blackjacked, or were settled. It returns a
+            tuple (max,min).
         end_round: calls the end_round() methods in Dealer and Player classes to clear the
-            bets, hands, and so on. It will also ask if the players want a new CardShoe and
-            calls replace_cardshoe to get one. Dealer replace card shoes at 100 cards or less.
+            bets, hands, and so on. It calls check_cut_card to reshuffle the CardShoe once the
+            cut card has come out. It never asks the players about the shoe.
             If any players have a bank less than the min_bet for the table, they will be
             eliminated (including any who busted their bank).
-        replace_cardshoe: deletes the CardShoe object called deck and initializes a new deck
+        replace_cardshoe: returns the dealt cards to the CardShoe object called deck and reshuffles it
+        attach_counter: hands the table's CardCounter to the deck and the dealer
+        attach_ledger: hands the table's BankLedger to the dealer and every
+            player, with the seat number each one posts under
+        attach_scores: hands the table's ScoreIndex to every player
+        check_cut_card: reshuffles the deck if the cut card came out during the round. Returns
+            True if it did. A CSM deck gets its dealt cards back instead.
         start_round: Asks if any players wish to quit before anteing up. Returns True if at
             least one player remains, False otherwise.
         
@@ -1430,6 +2287,14 @@ class CasinoTable(object):
 
     # This constant lists all of the possible hand types.
     HANDLIST = ('left reg', 'left split', 'middle reg', 'middle split', 'right reg', 'right split', 'dealer reg')
+
+    # This constant is the default shoe geometry. The keys match the CardShoe
+    # arguments decks, penetration, and cut_card. The default cut card leaves
+    # CardShoe.CUTCARDRESERVE cards behind it.
+    SHOESPEC = {'decks': 6, 'penetration': None, 'cut card': None, 'csm': False}
+
+    # This constant is the default split rule: one split and no re-splits.
+    SPLITRULES = {'max hands': 2, 'resplit aces': False}
     
     def __init__(self,
                  playerNames          = list({'name' : 'Fred', 'bank' : 50000}),
@@ -1437,7 +2302,13 @@ class CasinoTable(object):
                  dealerName = 'Sarah',
                  dealerBank = 100000,
                  min_bet = 5,
-                 max_bet = 100):
+                 max_bet = 100,
+                 shoe_spec = None,
+                 rng = None,
+                 shoe_pool = None,
+                 counter = None,
+                 split_rules = None,
+                 ledger = None):
         '''
         This method requires several arguments from the calling program, even
         though it has clear defaults for each one. These inputs are:
@@ -1458,13 +2329,37 @@ class CasinoTable(object):
                 Default: 5
             max_bet: integer, the maximum allowed ante bet
                 Default: 100
+            shoe_spec: a dict with any of the keys 'decks', 'penetration',
+                'cut card', and 'csm'. Missing keys are taken from SHOESPEC.
+                See CardShoe.__init__ for the meaning of each one.
+                Default: None (uses SHOESPEC)
+            rng: an integer seed, a RandomStream object, or None for the
+                global random module. It is used by the CardShoe.
+                Default: None
+            shoe_pool: a ShoePool object. If it is provided, the deck comes
+                from the pool, and replace_cardshoe swaps it for the next
+                ready shoe. The pool's geometry and rng replace shoe_spec
+                and rng.
+                Default: None
+            counter: a CardCounter object. The deck counts every card dealt
+                face up, and the dealer counts the hold card when it is
+                revealed.
+                Default: None
+            split_rules: a dict with any of the keys 'max hands' and
+                'resplit aces'. Missing keys are taken from SPLITRULES. A
+                'max hands' below 2 raises a ValueError.
+                Default: None (uses SPLITRULES)
+            ledger: a BankLedger object. Every change to the dealer's and
+                the players' banks is posted to it.
+                Default: None
 
         This method will generate the following attributes from its input:
             tableDealer  a Dealer class object
             numPlayers   number of actual players (which can be less than 3)
             players      a dictionary of playerObjects from inputs
             deck         a CardShoe object (6 full 52 card decks shuffled
-                         together) 
+                         together, unless shoe_spec says otherwise) 
+            shoe_spec    the shoe geometry used to build deck
             min_bet      min bet players can make
             max_bet      max bet players can make
             results: This dictionary stores the status of the player's hand
@@ -1518,14 +2413,52 @@ class CasinoTable(object):
         self.phase = 'pregame'
         self.seat  = None
 
+        # The split rules are copied like the shoe geometry below. They decide
+        # how many hands each seat can have.
+        self.split_rules = dict(self.SPLITRULES)
+        if split_rules is not None:
+            self.split_rules.update(split_rules)
+        maxHands = self.split_rules['max hands']
+        if (type(maxHands) not in (int, long)) or (maxHands < 2):
+            raise ValueError("CasinoTable: 'max hands' must be an integer of at least 2, not {0}.".format(maxHands))
+        self.hand_list = []
+        for i in xrange(1, self.TABLESIZE + 1):
+            for index in xrange(0, maxHands):
+                self.hand_list.append(self.hand_key(self.TABLESEATS[str(i)], index))
+        self.hand_list.append('dealer reg')
+        self.hand_list = tuple(self.hand_list)
+
         # Now, we prepare a new attribute, results, which stores the current
         # status of any hands a player or dealer has.
         self.results = {}
-        for hand in self.HANDLIST:
+        for hand in self.hand_list:
             self.results[hand] = None
 
-        # Finally, we need to create a deck using the CardShoe class.
-        self.deck = CardShoe()
+        # Finally, we need to create a deck using the CardShoe class. The
+        # shoe geometry is copied; so, the caller's dict and SHOESPEC are
+        # never changed by the table.
+        self.shoe_spec = dict(self.SHOESPEC)
+        if shoe_spec is not None:
+            self.shoe_spec.update(shoe_spec)
+        self.shoe_pool = shoe_pool
+        if shoe_pool is None:
+            self.rng = resolve_stream(rng)
+            self.deck = CardShoe(self.shoe_spec['decks'],
+                                 self.shoe_spec['penetration'],
+                                 self.shoe_spec['cut card'],
+                                 self.rng,
+                                 self.shoe_spec['csm'])
+        else:
+            self.rng = shoe_pool.rng
+            self.shoe_spec['decks'], self.shoe_spec['penetration'], self.shoe_spec['cut card'] = shoe_pool.shoe_args
+            self.shoe_spec['csm'] = False
+            self.deck = shoe_pool.get()
+        self.counter = counter
+        self.attach_counter()
+        self.ledger = ledger
+        self.attach_ledger()
+        self.scores = ScoreIndex()
+        self.attach_scores()
         return
     
     def __str__(self):
@@ -1558,6 +2491,14 @@ class CasinoTable(object):
         print("Table seating (TABLESIZE): ", self.TABLESIZE)
         print("Dealer's Hand Status: ", self.results['dealer'])
         print("Actual Number of Players (numPlayers): ", self.numPlayers)
+        print("Shoe Specification: ", self.shoe_spec)
+        print("Split Rules: ", self.split_rules)
+        if self.shoe_pool is not None:
+            print("Shoe Pool: ", self.shoe_pool.stats())
+        if self.counter is not None:
+            print("Card Counter: ", self.counter.snapshot())
+        if self.ledger is not None:
+            print("Bank Ledger: ", self.ledger)
         self.deck.diagnostic_print()
         for i in xrange(1, self.numPlayers + 1):
             ordinal = self.TABLESEATS[str(i)]
@@ -1610,9 +2551,9 @@ class CasinoTable(object):
             card = self.deck.remove_top()
             # These blocks were used to test the player blackjack payout or splitting hands.
             # if len(self.players[i]) == 0 and i == 2:
-            #     card = ('A', 'S')
+            #     card = 0     # A-S
             # elif len(self.players[i]) == 1 and i == 2:
-            #     card = ('10', 'D')
+            #     card = 22    # 10-D
             # if len(self.players[i]) == 1 and i == 1:
             #    card = self.players[i].hand[0]
             result = self.players[i].add_card_to_hand(card)
@@ -1623,14 +2564,14 @@ class CasinoTable(object):
                 self.players[i].blackjack(self.blackjack_multiplier[1])
                 self.players[0].dealer_lost(winnings)
         print("Dealing a card to ", self.players[0].name)
-        card = self.deck.remove_top()
+        # The dealer's first card is the hold card, which is dealt face down.
+        card = self.deck.remove_top(face_down = (len(self.players[0]) == 0))
         # Used to test blackjack_flag
-        # card = ('10', 'H')
+        # card = 35    # 10-H
         self.players[0].add_card_to_hand(card)
         if self.players[0].blackjack_flag == True:
             print(self)
-            rank, suit = card
-            print("Dealer received a {0}-{1}".format(rank, suit))
+            print("Dealer received a {0}".format(CardShoe.names[card]))
             print("Players wishing to place an insurance bet for a Dealer Blackjack may do so now.")
             for i in xrange(1, self.numPlayers):
                 answer = raw_input("{0}, would you like to make an insurance bet? (y/n)".format(self.players[i].name))
@@ -1691,41 +2632,55 @@ class CasinoTable(object):
         
         This method also needs arguments for min_bet and max_bet.
         '''
+        max_hands = self.split_rules['max hands']
+        resplit_aces = self.split_rules['resplit aces']
         for i in xrange(1, self.numPlayers):
             # This conditional covers the  possibility of a player blackjack. Blackjack methods
             # clear up the player's hand as a signal to other methods that nothing needs to be
             # done with that player.
-            if len(self.players[i]) != 0:
-                result = self.players[i].split_check()
-                if result == True:
-                    answer = raw_input("Player {0}, you have a pair showing. Would you like to split your hand? (y/n)".format(self.players[i].name))
-                    if (answer[0].lower() == 'y'):
-                        print("Splitting your hand per your request.")
-                        self.players[i].split_pair()
-                        print("Here is the result of the split.")
-                        self.players[i].print_split()
-                        print("Before I can deal you another card for each hand, you need to place a separate bet on your split hand.")
-                        while True:
-                            print("The same rules apply to this hand. The table minimum is ${0} and maximum is ${1}.".format(min_bet, max_bet))
-                            bet = raw_input("Player {0}, you have {1} remaining. What would you like to bet? ".format(self.players[i].name, self.players[i].bank))
-                            # Call the update_split_bet method for the player in question. It has all kinds of
-                            # error trapping functionality.
-                            result = self.players[i].update_split_bet(bet, min_bet, max_bet)
-                            if result == 'success':
-                                break
-                            else:
-                                print("Please try again.")
-                                continue
-                        print("Thank you for your bet. Dealing cards to each hand.")
-                        card = self.deck.remove_top()
-                        # All hands should be playable since they only have two cards. So, the results
-                        # do not need to be tracked here. The hit/stand part of the player turn will 
-                        # catch all of that.
-                        self.players[i].add_card_to_hand(card)
-                        card = self.deck.remove_top()
-                        self.players[i].add_card_to_split(card)
-                        print("Here are your new hands and their scores.")
-                        print(self.players[i])
+            if len(self.players[i]) == 0:
+                continue
+            # Every hand in play is checked, including the ones a split just made. A hand that is
+            # split is checked again after its new second card, which is how re-splits are offered.
+            index = 0
+            while index < self.players[i].hand_count:
+                result = self.players[i].split_check(index, max_hands, resplit_aces)
+                if result == False:
+                    index += 1
+                    continue
+                answer = raw_input("Player {0}, you have a pair showing. Would you like to split your hand? (y/n)".format(self.players[i].name))
+                if (answer[0].lower() != 'y'):
+                    index += 1
+                    continue
+                print("Splitting your hand per your request.")
+                new_index = self.players[i].split_pair(index)
+                print("Here is the result of the split.")
+                self.players[i].print_split()
+                print("Before I can deal you another card for each hand, you need to place a separate bet on your split hand.")
+                while True:
+                    print("The same rules apply to this hand. The table minimum is ${0} and maximum is ${1}.".format(min_bet, max_bet))
+                    bet = raw_input("Player {0}, you have {1} remaining. What would you like to bet? ".format(self.players[i].name, self.players[i].bank))
+                    # Call the update_hand_bet method for the player in question. It has all kinds of
+                    # error trapping functionality.
+                    result = self.players[i].update_hand_bet(new_index, bet, min_bet, max_bet)
+                    if result == 'success':
+                        break
+                    else:
+                        print("Please try again.")
+                        continue
+                print("Thank you for your bet. Dealing cards to each hand.")
+                card = self.deck.remove_top()
+                # All hands should be playable since they only have two cards. So, the results
+                # do not need to be tracked here. The hit/stand part of the player turn will 
+                # catch all of that.
+                if index == 0:
+                    self.players[i].add_card_to_hand(card)
+                else:
+                    self.players[i].add_card_to_split(card, index)
+                card = self.deck.remove_top()
+                self.players[i].add_card_to_split(card, new_index)
+                print("Here are your new hands and their scores.")
+                print(self.players[i])
         return
     
     def double_down(self):
@@ -1794,8 +2749,7 @@ class CasinoTable(object):
                         continue
                     elif answer.lower() == 'hit':
                         card = self.deck.remove_top()
-                        rank, suit = card
-                        print("New card is {0}-{1}".format(rank, suit))
+                        print("New card is {0}".format(CardShoe.names[card]))
                         result = self.players[i].add_card_to_hand(card)
                         if (result == 'bust'):
                             print(self.players[i])
@@ -1822,8 +2776,9 @@ class CasinoTable(object):
                         playable_hands += 1
                         print("Player {0} stands. Good luck in the Dealer's turn.".format(self.players[i].name))
                         break
-            # Now, we need to deal with a split hand, if it exists.
-            if self.players[i].split_flag == True:
+            # Now, we need to deal with the split hands, if they exist. Re-split hands follow the
+            # split hand in the order they were made.
+            for index in xrange(1, self.players[i].hand_count):
                 print("Entering split hand algorithm.")
                 while True:
                     print(self.players[i])
@@ -1833,13 +2788,12 @@ class CasinoTable(object):
                         continue
                     elif answer.lower() == 'hit':
                         card = self.deck.remove_top()
-                        rank, suit = card
-                        print("New card is {0}-{1}".format(rank, suit))
-                        result = self.players[i].add_card_to_split(card)
+                        print("New card is {0}".format(CardShoe.names[card]))
+                        result = self.players[i].add_card_to_split(card, index)
                         if (result == 'bust'):
                             print(self.players[i])
-                            loss_result = self.players[i].split_loss()
-                            self.players[0].dealer_won(self.players[i].split_bet)
+                            loss_result = self.players[i].lose_hand(index)
+                            self.players[0].dealer_won(self.players[i].hands[index].bet)
                             if loss_result == False:
                                 if (self.players[i].insurance == 0):
                                     # The player's bank is zero or negative from losses this turn. If they
@@ -1872,6 +2826,110 @@ class CasinoTable(object):
         else:
             return 'playable'
     
+    @staticmethod
+    def hand_key(seat, index):
+        '''
+        This method returns the results key for hand index of a seat: 'reg'
+        for hands[0], 'split' for hands[1], and 'split 2', 'split 3', ... for
+        the re-split hands. For example, hand_key('left', 2) is
+        'left split 2'.
+        '''
+        if index == 0:
+            return seat + ' reg'
+        if index == 1:
+            return seat + ' split'
+        return '{0} split {1}'.format(seat, index)
+
+    @staticmethod
+    def hand_index(key):
+        '''
+        This method undoes hand_key. It returns a tuple (seat, index) for a
+        results key, such as ('left', 2) for 'left split 2'.
+        '''
+        words = key.split(' ')
+        if words[1] == 'reg':
+            return (words[0], 0)
+        if len(words) == 2:
+            return (words[0], 1)
+        return (words[0], int(words[2]))
+
+    def seat_hands(self, seat):
+        '''
+        This method returns a list of tuples (results key, hand index), one
+        for each hand the player in seat has in play this round, regular hand
+        first. Settlement loops over it instead of handling each hand type.
+        '''
+        player = self.players[seat]
+        return [(self.hand_key(seat, index), index) for index in xrange(0, player.hand_count)]
+
+    def versions(self):
+        '''
+        This method returns a dict {seat: version} for every occupied seat,
+        plus 'dealer' for the dealer. A renderer or a spectator keeps the dict
+        from the last time it drew the table and only redraws the seats
+        whose version differs. extract_data for those seats returns a cached
+        snapshot anyway; so, this saves comparing the snapshots themselves.
+        '''
+        seatVersions = {'dealer': self.tableDealer.version}
+        for seat in self.players:
+            seatVersions[seat] = self.players[seat].version
+        return seatVersions
+
+    def settle(self, keys = None, dealer_blackjack = False):
+        '''
+        This method is the settlement stage of the dealer's turn. It gathers
+        the scores, bets, and banks of the hands to settle into parallel
+        lists, works out every payout with settle_hands, and applies them.
+        Each hand is settled with Player.settle_hand and its result is stored
+        in results ('win', 'tie', or 'loss'). The dealer's wins and losses
+        are applied as two totals, wins first. No player is removed from the
+        table; the caller does that for the seats in 'eliminated'.
+        INPUTS:
+            keys: the results keys of the hands to settle
+                Default: None (every non-empty hand of every seated player)
+            dealer_blackjack: True if the dealer has blackjack
+                Default: False
+        OUTPUT: the dict returned by settle_hands, with 'eliminated' as seat
+            names, plus:
+            'keys'           : the keys of the settled hands, in order
+            'dealer solvent' : False if the dealer's losses broke its bank
+        '''
+        if keys is None:
+            keys = []
+            for number in sorted(self.TABLESEATS):
+                seat = self.TABLESEATS[number]
+                if seat in self.players:
+                    keys.extend([key for key, index in self.seat_hands(seat)
+                                 if len(self.players[seat].hands[index]) != 0])
+        seats = []
+        owners = []
+        hands = []
+        for key in keys:
+            seat, index = self.hand_index(key)
+            if seat not in seats:
+                seats.append(seat)
+            owners.append(seats.index(seat))
+            hands.append((seat, index))
+        dealer = self.tableDealer
+        if dealer.hard_hand_score > 21:
+            dealer_total = dealer.hard_hand_score
+        else:
+            dealer_total = dealer.soft_hand_score
+        settlement = settle_hands(dealer_total,
+                                  [self.players[seat].hands[index].soft_score for seat, index in hands],
+                                  [self.players[seat].hands[index].bet for seat, index in hands],
+                                  owners,
+                                  [self.players[seat].bank for seat in seats],
+                                  dealer_blackjack)
+        for key, (seat, index), outcome in zip(keys, hands, settlement['outcomes']):
+            self.players[seat].settle_hand(index, outcome)
+            self.results[key] = OUTCOMES[outcome]
+        dealer.dealer_won(settlement['dealer won'])
+        settlement['dealer solvent'] = dealer.dealer_lost(settlement['dealer lost'])
+        settlement['eliminated'] = [seats[owner] for owner in settlement['eliminated']]
+        settlement['keys'] = list(keys)
+        return settlement
+
     def dealer_autowin(self):
         '''
         This method is used when CasinoTable.hit_or_stand() returns "redeal". In that case, the dealer has 
@@ -1886,42 +2944,18 @@ class CasinoTable(object):
     
     def max_min_score(self):
         '''
-        This method extracts the minimum and maximum scores for player's hands from the remaining hands. It
+        This method returns the minimum and maximum scores for player's hands from the remaining hands. It
         ignores any removed hands. It looks at the soft_hand_score, which is the highest playable score a
         hand of Blackjack can have.
+
+        The players keep these scores up to date in self.scores as their hands change; so, nothing is
+        rescanned here, however many seats the table has.
         
-        If self.numPlayers < 2, no human players remain in the game. It will return (0,0) as an error.
+        If no playable hands remain, it returns (0,0).
         
         It returns a tuple in the form (max, min).
         '''
-        max_score = min_score = 0
-        if self.numPlayers < 2 :
-            # No human players remain in the game.
-            return (max_score, min_score)
-        # At least one human player remains in the game. We need the scores off of one of their hands.
-        
-        # print("Max: {0}.   Min: {1}".format(max_score, min_score))
-        for i in xrange(1, self.numPlayers):
-            # print(self.players[i])
-            if (len(self.players[i]) != 0):
-                if self.players[i].soft_hand_score > max_score:
-                    max_score = self.players[i].soft_hand_score
-                # The next if statement should ensure that min_score is also non-zero if a hand still exists.
-                if (min_score == 0) and (self.players[i].soft_hand_score != 0):
-                    min_score = self.players[i].soft_hand_score
-                if (0 < self.players[i].soft_hand_score < min_score):
-                    min_score = self.players[i].soft_hand_score
-            # print("Max: {0}.   Min: {1}".format(max_score, min_score))
-            if (len(self.players[i].split_hand) != 0):
-                if self.players[i].soft_split_score > max_score:
-                    max_score = self.players[i].soft_split_score
-                # The next if statement should ensure that min_score is also non-zero if a hand still exists.
-                if (min_score == 0) and (self.players[i].soft_split_score != 0):
-                    min_score = self.players[i].soft_split_score
-                if (0 < self.players[i].soft_split_score < min_score):
-                    min_score = self.players[i].soft_split_score                
-            # print("Max: {0}.   Min: {1}".format(max_score, min_score))
-        return (max_score, min_score)       
+        return (self.scores.high, self.scores.low)
     
     def dealer_turn(self):
         '''
@@ -1945,177 +2979,98 @@ class CasinoTable(object):
         Variables:
             dealer_blackjack = boolean True for a blackjack, False otherwise
             dealer_stand = boolean True once the dealer must stand, False otherwise
-            dealer_bust  = boolean True once the dealer busts, False otherwise
-            dealer_winnings = aggregate of the dealer's wins applied near the end of the dealer's turn, separate
-                from blackjack wins/losses and player busts
-            dealer_losses   = aggregate of the dealer's wins applied near the end of the dealer's turn, separate
-                from blackjack wins/losses and dealer busts
             min_score = minimum still playable score, extracted while skippng empty hands
             max_score = maximum still playable score, extracted while skippng empty hands
-            hand_results = list of string tuples of the form (name, index, outcome, hand_type), where name is
-                the player's name, index is their index in the players list, outcome is a string with values:
-                'lose' = player's hand lost against the dealer's hand
-                'win'  = player's hand won against the dealer's hand
-                'tie'  = player's hand tied the dealer's hand
-            and hand_type is a string as follows:
-                'reg'  = player's hand initial hand in the round
-                'split'= player's split hand
+            settlement = the dict returned by CasinoTable.settle
+        Every hand still in play is settled at once by CasinoTable.settle, whether the dealer has blackjack,
+        busts, or stands; so, there is one settlement path however many hands a player may split to.
         '''
+        dealer = self.tableDealer
         dealer_blackjack = False
         dealer_stand = False
-        dealer_bust = False
-        hand_results = []
-        dealer_winnings = 0
-        dealer_losses = 0
         print("Turning over Dealer's hold card.")
-        self.players[0].dealer_print()
+        dealer.dealer_print()
         
         # First, we need to check for a Dealer Blackjack.
-        if (len(self.players) == 2) and (self.players[0].soft_hand_score == 21) and (self.players[0].hard_hand_score == 11):
+        if (len(dealer) == 2) and (dealer.soft_hand_score == 21) and (dealer.hard_hand_score == 11):
             dealer_blackjack = True
             # Setting the dealer_stand boolean to True stops the Dealer from playing 
             # their hand.
             dealer_stand = True
             print("Dealer has a blackjack. All remaning hands lose, regardless of score.")
-            for i in xrange(1, self.numPlayers):
-                # Skip resolved hands and non-existent hands.
-                if (len(self.players[i]) == 0) and (len(self.players[i].split_hand) == 0):
-                    continue
-                if len(self.players[i]) != 0:
-                    # Mark hand as lost.
-                    hand_results.append((self.players[i].name, i, 'lose', 'reg'))
-                if len(self.players[i].split_hand) != 0:
-                    # Mark hand as lost.
-                    hand_results.append((self.players[i].name, i, 'lose', 'split'))
         # Dealer has a normal playable hand. Wins beat the Dealer's final score.
         # Ties are a draw, and players lose if they score less than the Dealer.
-        # print("Hand results (blackjack): ", hand_results)
         max_score, min_score = self.max_min_score()
         while (dealer_stand == False):
-            self.players[0].dealer_print()
-            if self.players[0].hard_hand_score > 21:
-                # Dealer busts.
-                print("Dealer busted with a hard score of {0}".format(self.players[0].hard_hand_score))
-                dealer_bust = True
+            dealer.dealer_print()
+            if dealer.hard_hand_score > 21:
+                # Dealer busts. Every remaining hand wins.
+                print("Dealer busted with a hard score of {0}".format(dealer.hard_hand_score))
                 dealer_stand = True
-                for i in xrange(1, self.numPlayers):
-                    # Skip resolved hands and non-existent hands.
-                    if (len(self.players[i]) == 0) and (len(self.players[i].split_hand) == 0):
-                        continue
-                    if len(self.players[i]) != 0:
-                        # Mark hand as winnner.
-                        hand_results.append((self.players[i].name, i, 'win', 'reg'))
-                    if len(self.players[i].split_hand) != 0:
-                        # Mark hand as winner.
-                        hand_results.append((self.players[i].name, i, 'win', 'split'))                
                 continue
-            if self.players[0].hard_hand_score > 16:
+            if dealer.hard_hand_score > 16:
                 # Dealer must stand on a hard 17 or higher.
-                print("Dealer's hard score is {0}, which is greater than 17. Dealer stands.".format(self.players[0].hard_hand_score))
+                print("Dealer's hard score is {0}, which is greater than 17. Dealer stands.".format(dealer.hard_hand_score))
                 dealer_stand = True
                 continue
-            if (self.players[0].hard_hand_score <= 16) and (self.players[0].soft_hand_score > min_score) \
-                and (self.players[0].soft_hand_score > 16):
+            if (dealer.hard_hand_score <= 16) and self.scores.beats_any(dealer.soft_hand_score) \
+                and (dealer.soft_hand_score > 16):
                 # Dealer must stand on a soft hand score that beats at least one player and has a score
-                # above 16.
+                # above 16. The table's ScoreIndex answers the first part without looking at the seats.
                 dealer_stand = True
                 continue
             # Dealer takes a card.
             card = self.deck.remove_top()
-            rank, suit = card
-            print("Dealer draws {0}-{1}.".format(rank, suit))
-            self.players[0].add_card_to_hand(card)
-        # print("Hand results (dealer turn): ", hand_results)
+            print("Dealer draws {0}.".format(CardShoe.names[card]))
+            dealer.add_card_to_hand(card)
         print("Dealer's turn is complete. Determining any remaining wins and losses.")
-        # Now, we have to finish out the hand results. This can be skipped if dealer_blackjack = True
-        # or dealer_bust = True. The win/lose/tie data has already been created for both conditions.
-        # Remember also that soft scores are always the highest playable score that a hand can have,
-        # regardless of the cards dealt.
-        if (dealer_blackjack == False) and (dealer_bust == False):
-            for i in xrange(1, self.numPlayers):
-                # Again, skip resolved and non-existent hands.
-                if (len(self.players[i]) == 0) and (len(self.players[i].split_hand) == 0):
-                    continue
-                if (len(self.players[i]) != 0):
-                    if (self.players[i].soft_hand_score < self.players[0].soft_hand_score):
-                        # Player loses to a higher score.
-                        hand_results.append((self.players[i].name, i, 'lose', 'reg'))
-                    elif (self.players[i].soft_hand_score == self.players[0].soft_hand_score):
-                        # Tie result. No one loses their bets.
-                        hand_results.append((self.players[i].name, i, 'tie', 'reg'))
-                    else:
-                        # Player wins.
-                        hand_results.append((self.players[i].name, i, 'win', 'reg'))
-                if len(self.players[i].split_hand) != 0:
-                    if (self.players[i].soft_split_score < self.players[0].soft_hand_score):
-                        # Player loses split hand to a higher score.
-                        hand_results.append((self.players[i].name, i, 'lose', 'split'))
-                    elif (self.players[i].soft_split_score == self.players[0].soft_hand_score):
-                        # Tie result. No one loses their bets.
-                        hand_results.append((self.players[i].name, i, 'tie', 'split'))
-                    else:
-                        # Player wins.
-                        hand_results.append((self.players[i].name, i, 'win', 'split'))        
-        # print("Hand results (dealer scoring): ", hand_results)
         
         # Now to notify the player and total up the wins and losses, starting with the insurance bets.
         # The Player.ins(boolean) method handles this loss by sending the dealer_blackjack flag. It
         # automatically returns the right results. True means the player is still in the game, False,
         # they broke their bank and will be eliminated in the end_round.
-        if self.players[0].blackjack_flag == True:
-            for i in xrange(1, self.numPlayers):
+        if dealer.blackjack_flag == True:
+            for seat in self.players:
+                player = self.players[seat]
                 if dealer_blackjack == False:
-                    dealer_winnings += self.players[i].insurance
-                    print("Player {0}: You have lost your insurance bet of {1}.".format(self.players[i].name, self.players[i].insurance))
+                    dealer.dealer_won(player.insurance)
+                    print("Player {0}: You have lost your insurance bet of {1}.".format(player.name, player.insurance))
                 else:
-                    dealer_losses += self.players[i].insurance
-                    print("Player {0}: You have won your insurance bet of {1}.".format(self.players[i].name, self.players[i].insurance))
-                ins_result = self.players[i].ins(dealer_blackjack)
+                    dealer.dealer_lost(player.insurance)
+                    print("Player {0}: You have won your insurance bet of {1}.".format(player.name, player.insurance))
+                ins_result = player.ins(dealer_blackjack)
                 if ins_result == False:
-                    print("Player {0} has broken his bank and will be eliminated at the end of the round.".format(self.players[i].name))
+                    print("Player {0} has broken his bank and will be eliminated at the end of the round.".format(player.name))
             print("Insurance bets are complete.")
         else:
             print("There were no insurance bets this round.")
-        
-        for i in xrange(0, len(hand_results)):
-            # Each entry in hand_results is a tuple of the form (name, index in players list, outcome, type of hand).
-            # The list is ordered and built in the order the players are "seated" at the casino table. The boolean
-            # flag for players breaking their bank has to be reset for each hand.
-            player_loss = True
-            name, num, outcome, hand_type = hand_results[i]
-            if (hand_type == 'reg'):
-                if (outcome == 'win'):
-                    print("Dealer lost to Player {0} with a score of {1} to {2}.".format(name, self.players[0].soft_hand_score, self.players[num].soft_hand_score))
-                    dealer_losses += self.players[num].bet
-                    self.players[num].win()
-                elif (outcome == 'tie'):
-                    print("Dealer and Player {0} tied this hand. No losses either way.".format(name))
-                    self.players[num].tie()
-                else: # Player lost this round.
-                    print("Player {0} lost to Dealer with a score of {1} to {2}.".format(name, self.players[num].soft_hand_score, self.players[0].soft_hand_score))
-                    dealer_winnings += self.players[num].bet
-                    player_loss = self.players[num].reg_loss()
-            else: # hand_type == 'split'
-                if (outcome == 'win'):
-                    print("Dealer lost to Player {0}'s split hand with a score of {1} to {2}.".format(name, self.players[0].soft_hand_score, self.players[num].soft_split_score))
-                    dealer_losses += self.players[num].split_bet
-                    self.players[num].split_win()
-                elif (outcome == 'tie'):
-                    print("Dealer and Player {0}'s split hand this round. No losses either way.".format(name))
-                    self.players[num].split_tie()
-                else: # Player's split hand lost this round.
-                    print("Player {0}'s split hand lost to Dealer with a score of {1} to {2}.".format(name, self.players[num].soft_split_score, self.players[0].soft_hand_score))
-                    dealer_winnings += self.players[num].split_bet
-                    player_loss = self.players[num].split_loss()
-            if player_loss == False:
-                print("Player {0} has broken their bank and will be eliminated at the end of the round.".format(name))
+
+        # The scores are printed before settlement, since losing a hand removes its cards.
+        scores = {}
+        for seat in self.players:
+            for key, index in self.seat_hands(seat):
+                scores[key] = self.players[seat].hands[index].soft_score
+        settlement = self.settle(dealer_blackjack = dealer_blackjack)
+        for key, outcome in zip(settlement['keys'], settlement['outcomes']):
+            seat, index = self.hand_index(key)
+            player = self.players[seat]
+            if index == 0:
+                hand_name = "Player {0}".format(player.name)
             else:
-                print("Player {0} still has ${1} remaining in the bank after this hand.".format(name, self.players[num].bank))
+                hand_name = "Player {0}'s {1}".format(player.name, Player._split_title(index).lower())
+            if (outcome == WIN):
+                print("Dealer lost to {0} with a score of {1} to {2}.".format(hand_name, dealer.soft_hand_score, scores[key]))
+            elif (outcome == TIE):
+                print("Dealer and {0} tied this hand. No losses either way.".format(hand_name))
+            else: # Player's hand lost this round.
+                print("{0} lost to Dealer with a score of {1} to {2}.".format(hand_name, scores[key], dealer.soft_hand_score))
+        for seat in self.players:
+            if seat in settlement['eliminated']:
+                print("Player {0} has broken their bank and will be eliminated at the end of the round.".format(self.players[seat].name))
+            else:
+                print("Player {0} still has ${1} remaining in the bank after this round.".format(self.players[seat].name, self.players[seat].bank))
         
-        # Now, we apply the wins and losses to the bank to see if the bank remains in the game.
-        self.players[0].dealer_won(dealer_winnings)
-        dealer_result = self.players[0].dealer_lost(dealer_losses)
-        if dealer_result == False:
+        if settlement['dealer solvent'] == False:
             # The Dealer broke their bank.
             print("The Dealer has broke their bank. The game will end at the end of this round.")
         return
@@ -2124,9 +3079,8 @@ class CasinoTable(object):
         '''
         This method cleans up at the end of a round of play. Any players, dealer included, who broke their
         banks during play are eliminated. It calls Dealer.end_round() and Player.end_round() to clear hands
-        hand scores, and flags. It also offers the option to replace the CardShoe, an action recommended
-        once the shoe gets down to less half the original cards (156). This method automatically replaces
-        the CardShoe once deck drops to 100 cards or less.
+        hand scores, and flags. It also reshuffles the CardShoe, using check_cut_card, once the cut card
+        has come out. Where the cut card sits is set by the table's shoe_spec.
         
         It accepts an integer min_bet that will eliminate a player because their bank cannot sustain the
         next round of betting.
@@ -2137,6 +3091,8 @@ class CasinoTable(object):
         end_game = False
         for i in xrange(0, self.numPlayers):
             self.players[i].end_round()
+        if self.ledger is not None:
+            self.ledger.next_round()
             
         if self.players[0].bank <= min_bet:
             del(self.players[0])
@@ -2170,45 +3126,97 @@ class CasinoTable(object):
             print("All human players have been eliminated. The game is over and the House won.")
             end_game = True
         if end_game ==False:
-            # We need to test if the deck has too few cards remaining. It should be replaced once it down
-            # to less than 100 cards since this is a text game with a running tally of cards played.
-            if len(self.deck) <= 100:
-                print("The card shoe has too few cards for the games to remain random. Replacing the shoe.")
-                self.replace_cardshoe()
-                print("New card shoe is ready.")
-                print(self.deck)
-            else:
-                print("You may request a new card shoe between rounds. It is recommended once a card shoe drops below 150 cards.")
-                print(self.deck)
-                while True:
-                    try:
-                        answer = raw_input("Would you like to replace the Card Shoe? (y/n)")
-                    except:
-                        print("Please try again.")
-                        continue
-                    if (answer[0].lower() != 'y') and (answer[0].lower() != 'n'):
-                        print("Please try again.")
-                        continue
-                    else:
-                        break
-                if answer[0].lower() == 'y':
-                    self.replace_cardshoe()
-                    print("New card shoe is ready.")
-                else:
-                    print("The deck shoe will not be replaced.")
+            # The shoe is reshuffled once the cut card has come out. There is no prompt; so, rounds can
+            # be played back to back without anyone at the keyboard.
+            if self.check_cut_card():
+                print("The cut card came out. The card shoe has been reshuffled.")
+            print(self.deck)
         # This prints out who is left and how much money they have left. All hands and bets have been reset.
         print(self)
         return end_game            
         
     def replace_cardshoe(self):
         '''
-        This method deletes the current shoe and initializes a new one. This is recommended once a shoe
-        drops to 50% (156) of the original cards. It returns no values.
+        This method returns all of the dealt cards to the current shoe and reshuffles it. This is
+        normally done by check_cut_card once the cut card comes out. It returns no values.
+        Note: CardShoe.reshuffle() only moves the shoe's cursor back to the start. Building a new
+        CardShoe object is no longer required. If the table has a shoe_pool, the current shoe goes back
+        to the pool and the next ready shoe, already shuffled by the pool's worker thread, replaces it.
         '''
-        del(self.deck)
-        self.deck = CardShoe()
+        if self.shoe_pool is None:
+            self.deck.reshuffle()
+        else:
+            # The used shoe is taken off the counter and the recorder before the pool's worker can
+            # reshuffle it. The recorder moves to the new shoe, like the counter.
+            recorder = self.deck.recorder
+            self.deck.counter = None
+            self.deck.recorder = None
+            self.shoe_pool.put_back(self.deck)
+            self.deck = self.shoe_pool.get()
+            if recorder is not None:
+                recorder.attach(self.deck)
+            self.attach_counter()
         return
 
+    def attach_counter(self):
+        '''
+        This method hands the table's counter to the deck and the dealer and starts the count over
+        for the deck. It is called when the table is built and whenever the deck is swapped for a
+        new one. It returns no values.
+        '''
+        self.deck.counter = self.counter
+        self.tableDealer.counter = self.counter
+        if self.counter is not None:
+            self.counter.reset(self.deck.decks)
+        return
+
+    def attach_ledger(self):
+        '''
+        This method hands the table's ledger to the dealer and the players.
+        The dealer posts as seat 0 and each player as the number of their
+        seat in TABLESEATS. It returns no values.
+        '''
+        self.tableDealer.ledger = self.ledger
+        self.tableDealer.seat_number = 0
+        for number, seat in self.TABLESEATS.items():
+            if seat in self.players:
+                self.players[seat].ledger = self.ledger
+                self.players[seat].seat_number = int(number)
+        return
+
+    def attach_scores(self):
+        '''
+        This method hands the table's ScoreIndex to every player, starting it
+        over from the hands they hold now. attach_ledger must have set their
+        seat numbers first. It returns no values.
+        '''
+        self.scores.clear()
+        for player in self.players.values():
+            player.scores = self.scores
+            for index in xrange(0, player.hand_count):
+                player._track(index)
+        return
+
+    def check_cut_card(self):
+        '''
+        This method reshuffles the deck if the cut card came out during the round. It is called between
+        rounds, never during one, because the round in play is always finished from the current shoe. If
+        the shoe runs out first, its discards finish the round (see CardShoe.remove_top). Otherwise, the
+        shoe marks where the next round starts, so it knows which cards are discards.
+        Since replace_cardshoe only resets the shoe's cursor, this costs the same for any number of decks.
+        It returns True if the shoe was reshuffled and False otherwise.
+        A continuous shuffling machine (CSM) shoe has no cut card. Its dealt cards are returned to it
+        instead, which is not a reshuffle; so, this always returns False for one.
+        '''
+        if self.deck.csm:
+            self.deck.return_dealt()
+            return False
+        if self.deck.cut_card_reached:
+            self.replace_cardshoe()
+            return True
+        self.deck.mark_round()
+        return False
+
     def start_round(self):
         '''
         This method begins a new round. The previous round (or __init__) already cleared some attributes and updated
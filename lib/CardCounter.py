@@ -0,0 +1,163 @@
+from __future__ import print_function
+from BlackjackClasses import CardShoe
+
+
+class CardCounter(object):
+    '''
+    This class keeps a running count and a true count of the cards that have
+    been seen at a table. It is fed one card at a time: CardShoe.remove_top
+    counts every card dealt face up, and Dealer.reveal_hold_card counts the
+    dealer's hold card when it is turned over. Each card costs one table
+    lookup and one addition; so, counting never looks back at the hands.
+
+    Class Order Attributes:
+        SYSTEMS: dict mapping the name of a counting system to a dict with
+            'tags': tuple of the tag for each rank, in the order of
+                CardShoe.ranks (A, 2, 3, ..., 10, J, Q, K)
+            'balanced': True if the tags of a full deck add up to zero
+            The systems included are 'Hi-Lo', 'KO', and 'Omega II'.
+
+    Attributes:
+        system: the name of the counting system, or 'custom'
+        tags: tuple of the tag for each rank
+        code_tags: tuple of the tag for each card index in CardShoe.cards
+        balanced: True for a balanced system
+        decks: the number of decks in the shoe being counted
+        initial_count: the running count of a fresh shoe. It is zero for
+            balanced systems. For an unbalanced system like KO, it is
+            4 - 4 * decks; so, the key count is the same for any shoe size.
+        running_count: the sum of the tags of every card seen, plus
+            initial_count
+        cards_seen: the number of cards counted since the last reset
+        shoe_cards: the number of cards in the shoe being counted
+
+    Methods:
+        __init__: sets up the counter for a counting system and shoe size
+        __str__: returns a string with the running and true counts
+        count_code: counts one card by its card index
+        count_card: counts one card tuple (rank, suit)
+        true_count: (property) the running count per deck not yet seen
+        reset: starts the count over for a reshuffled shoe
+        snapshot: returns a dict of the counts
+        diagnostic_print: prints out the counter's attributes
+    '''
+    SYSTEMS = {'Hi-Lo'    : {'tags'     : (-1, 1, 1, 1, 1, 1, 0, 0, 0, -1, -1, -1, -1),
+                             'balanced' : True},
+               'KO'       : {'tags'     : (-1, 1, 1, 1, 1, 1, 1, 0, 0, -1, -1, -1, -1),
+                             'balanced' : False},
+               'Omega II' : {'tags'     : (0, 1, 1, 2, 2, 2, 1, 0, -1, -2, -2, -2, -2),
+                             'balanced' : True}}
+
+    # Card tuples are turned back into card indexes with this dict.
+    CARDCODES = dict([(card, code) for code, card in enumerate(CardShoe.cards)])
+
+    def __init__(self, system = 'Hi-Lo', decks = 6):
+        '''
+        INPUTS:
+            system: the name of a counting system in SYSTEMS, or a tuple of
+                13 integer tags in the order of CardShoe.ranks for a custom
+                system
+                Default: 'Hi-Lo'
+            decks: integer, the number of decks in the shoe
+                Default: 6
+        An unknown system name or a tag tuple of the wrong length raises a
+        ValueError.
+        '''
+        if isinstance(system, basestring):
+            if system not in CardCounter.SYSTEMS:
+                raise ValueError("CardCounter: unknown counting system {0}. Choose from {1}.".format(
+                                 system, sorted(CardCounter.SYSTEMS)))
+            self.system = system
+            self.tags = CardCounter.SYSTEMS[system]['tags']
+            self.balanced = CardCounter.SYSTEMS[system]['balanced']
+        else:
+            tags = tuple(system)
+            if len(tags) != len(CardShoe.ranks):
+                raise ValueError("CardCounter: a custom system needs {0} tags, not {1}.".format(
+                                 len(CardShoe.ranks), len(tags)))
+            self.system = 'custom'
+            self.tags = tags
+            self.balanced = (sum(tags) == 0)
+        self.code_tags = tuple([self.tags[rank] for rank in CardShoe.code_ranks])
+        self.decks = decks
+        self.shoe_cards = CardShoe.deck_size * decks
+        if self.balanced:
+            self.initial_count = 0
+        else:
+            self.initial_count = -len(CardShoe.suits) * sum(self.tags) * (decks - 1)
+        self.reset()
+
+    def __str__(self):
+        return "Counter ({0}): running count {1}, true count {2:.2f}.".format(self.system,
+                                                                             self.running_count,
+                                                                             self.true_count)
+
+    def count_code(self, code):
+        '''
+        This method counts one card by its card code, its index in
+        CardShoe.cards. It is the method CardShoe.remove_top and
+        Dealer.reveal_hold_card call. It returns no values.
+        '''
+        self.running_count += self.code_tags[code]
+        self.cards_seen += 1
+        return
+
+    def count_card(self, card):
+        '''
+        This method counts one card tuple (rank, suit), for callers that
+        have a card tuple instead of a card code. It returns no values.
+        '''
+        self.count_code(CardCounter.CARDCODES[card])
+        return
+
+    @property
+    def true_count(self):
+        '''
+        This property is the running count divided by the number of decks
+        that have not been seen yet. Once every card has been seen, it is
+        the running count.
+        '''
+        unseen = self.shoe_cards - self.cards_seen
+        if unseen <= 0:
+            return float(self.running_count)
+        return self.running_count * float(CardShoe.deck_size) / unseen
+
+    def reset(self, decks = None):
+        '''
+        This method starts the count over for a fresh shoe. CardShoe calls it
+        whenever the shoe is reshuffled or a CSM shoe gets its cards back. If
+        decks is given, the counter is resized for a shoe of that many decks.
+        It returns no values.
+        '''
+        if decks is not None and decks != self.decks:
+            self.decks = decks
+            self.shoe_cards = CardShoe.deck_size * decks
+            if not self.balanced:
+                self.initial_count = -len(CardShoe.suits) * sum(self.tags) * (decks - 1)
+        self.running_count = self.initial_count
+        self.cards_seen = 0
+        return
+
+    def snapshot(self):
+        '''
+        This method returns a dict of the current counts. It is what a bet
+        ramp or a training overlay should read.
+        '''
+        return {'system'        : self.system,
+                'running count' : self.running_count,
+                'true count'    : self.true_count,
+                'cards seen'    : self.cards_seen}
+
+    def diagnostic_print(self):
+        '''
+        This method prints out the attributes of the counter for debugging.
+        '''
+        print("Counting system: ", self.system)
+        print("Tags by rank: ", self.tags)
+        print("Balanced: ", self.balanced)
+        print("Decks: ", self.decks)
+        print("Initial count: ", self.initial_count)
+        print("Running count: ", self.running_count)
+        print("True count: ", self.true_count)
+        print("Cards seen: ", self.cards_seen)
+        return
@@ -0,0 +1,225 @@
+from __future__ import print_function
+from RandomStreams import resolve_stream
+
+__doc__ = """
+This module builds the casino's dealers and their table configurations. It
+was moved out of Casino.py so the simulator can evaluate the same tables
+without pygame. Nothing here draws anything; the felt colors are plain RGB
+tuples the game passes to pygame.
+
+Functions:
+    generateDealerList: returns the dealers, each with a bank, blackjack
+        multiplier, felt color, and table bets rolled for their table type
+    dieRoll: rolls a die with a floor and a ceiling on the result
+"""
+
+# Felt colors         R    G    B
+BLUE         = (  0,   0, 255)
+AQUAMARINE   = (  0, 255, 255)
+OLIVE        = (128, 128,   0)
+PURPLE       = (128,   0, 128)
+
+def generateDealerList(rng = None):
+    """
+    This function creates a list of dictionary objects that feed initial
+    settings for creating dealer objects in CasinoTable objects. The structure
+    is a list of dictionaries of the form below:
+        'name'  : Dealer's name (string)
+        'type'  : This is type of CasinoTable that this "dealer" normally works
+                    'high'    : only works high roller tables, banks over $1m
+                    'starter' : best for new players, bank under $100k
+                    'normal'  : banks 100-250k
+                    'special' : dealer only works special events
+                    
+    For the early versions of the pygame implementation, this list will be
+    hardcoded, but the intention is to migrate this data to a much more
+    complete database, such as a postgres or sql-lite database.
+    INPUTS: rng, an integer seed, RandomStream object, or None (the global
+        random module). All die rolls for the list are made with it.
+    OUTPUTS: list of dictionaries with the following additions
+        'bank' : A value calculated from a base determined by table type
+                 and adjusted by a random amount
+        'blackjack_multiplier : A value chosen randomly from a set of ratios
+                 controlled by the table type
+        'table color' : This the color of the felt of the table. The rim is
+                 always leather.
+        'table bets'  : Tuple storing the min and max bets that table allows
+
+    Each table type has formulas, complete with random choices to create
+    variety during play. All die rolls have a max value of whatever the die
+    itself can produce (d6+2 still maxes at 6, but a d6-2 maxes at 4). All die
+    rolls have a min of 0 (no negative values). The function, dieRoll(),
+    produces these "weighted" die results.
+        'starter': Starter tables
+            'bank': $50k + [(d30 - 5) * $1k]
+                This produces a range 50-75k with most banks being 50k
+            'table color' : OLIVE
+            'blackjack multiplier' : d6 choice from the following options:
+                1) 7:3, 2.33
+                2) 9:4, 2.25
+                3) 2:1, 2.00
+                4) 7:4, 1.75
+                5) 5:3, 1.67
+                6) 3:2, 1.50
+            'table bets' : (tableMin = 5, tableMax = 100)
+            
+        'high' : High Roller Tables
+            'bank': $1m + (d100 * $25k)
+                This produces a range of $1-3.5m (uniform)
+            'table color' : PURPLE
+            'blackjack multiplier' : d6 choice from the following options:
+                1) 11:4, 2.75
+                2) 8:3, 2.67
+                3) 5:2, 2.50
+                4) 7:3, 2.33
+                5) 9:4, 2.25
+                6) 2:1, 2.00
+            'table bets' : (tableMin = 500, tableMax = 100k)
+
+        'special' : Special Event Tables
+            'bank': $250k + (d100 * 5k)
+                This produces a range of $250-750k (uniform)
+            'table color' : AQUAMARINE
+            'blackjack multiplier' : d4 choice from the following options:
+                1) 3:1, 3.00
+                2) 5:2, 2.50
+                3) 2:1, 2.00
+                4) 3:2, 1.50
+            'table bets' : (tableMin = 250, tableMax = 1000)        
+
+        'normal' : Regular Tables
+            'bank': $100k + [(d100 - 25) * 2k]
+                This produces a range of $100-250k, weighted to 25% of banks
+                being $100k
+            'table color' : BLUE
+            'blackjack multiplier' : d8 choice from the following options:
+                1) 2:1, 2.00
+                2) 9:5, 1.80
+                3) 7:4, 1.75
+                4) 8:5, 1.60
+                5) 5:3, 1.67
+                6) 7:5, 1.40
+                7) 4:3, 1.33
+                8) 6:5, 1.20
+            'table bets' : (tableMin = 50, tableMax = 200)
+            
+    Note: All players start with the starter tables while they learn to play
+    this game. It helps to reinforce that the game is partly about having fun,
+    but it is also about beating the bank.
+    """
+    listDealers = []
+    listDealers.append({'name' : 'Frank',   'type' : 'starter'})
+    listDealers.append({'name' : 'Hannah',  'type' : 'normal'})
+    listDealers.append({'name' : 'Mike',    'type' : 'normal'})
+    listDealers.append({'name' : 'Rayden',  'type' : 'special'})
+    listDealers.append({'name' : 'Charlie', 'type' : 'special'})
+    listDealers.append({'name' : 'Freddie', 'type' : 'high'})
+    listDealers.append({'name' : 'James',   'type' : 'high'})
+    listDealers.append({'name' : 'Angela',  'type' : 'high'})
+    # print(listDealers)
+
+    numOfDealers = len(listDealers)
+    rng = resolve_stream(rng)
+    # As mentioned in the main comment block, we need to calculate the banks
+    # for each dealer, their current table blackjack_multiplier, and the color
+    # of the felt on their table. These are determined by formulas that depend
+    # on the type of table the dealer works at.
+    for i in range(0, numOfDealers):
+        if listDealers[i]['type'] == 'starter':
+            listDealers[i]['table color'] = OLIVE
+            listDealers[i]['bank'] = 50000 + (1000 * dieRoll(30, 0, 25, -5, rng = rng))
+            multiplierChoice = dieRoll(6, 1, 6, rng = rng)
+            if multiplierChoice == 1:
+                listDealers[i]['blackjack multiplier'] = ('7:3', 2.33)
+            elif  multiplierChoice == 2:
+                listDealers[i]['blackjack multiplier'] = ('9:4', 2.25)
+            elif  multiplierChoice == 3:
+                listDealers[i]['blackjack multiplier'] = ('2:1', 2.00)
+            elif  multiplierChoice == 4:
+                listDealers[i]['blackjack multiplier'] = ('7:4', 1.75)
+            elif  multiplierChoice == 5:
+                listDealers[i]['blackjack multiplier'] = ('5:3', 1.67)
+            elif  multiplierChoice == 6:
+                listDealers[i]['blackjack multiplier'] = ('3:2', 1.50)
+            listDealers[i]['table bets'] = (5, 100)
+            
+        elif listDealers[i]['type'] == 'normal':
+            listDealers[i]['table color'] = BLUE
+            listDealers[i]['bank'] = 100000 + (2000 * dieRoll(100, 0, 75, -25, rng = rng))
+            multiplierChoice = dieRoll(8, 1, 8, rng = rng)
+            if multiplierChoice == 1:
+                listDealers[i]['blackjack multiplier'] = ('2:1', 2.00)
+            elif  multiplierChoice == 2:
+                listDealers[i]['blackjack multiplier'] = ('9:5', 1.80)
+            elif  multiplierChoice == 3:
+                listDealers[i]['blackjack multiplier'] = ('7:4', 1.75)
+            elif  multiplierChoice == 4:
+                listDealers[i]['blackjack multiplier'] = ('8:5', 1.60)
+            elif  multiplierChoice == 5:
+                listDealers[i]['blackjack multiplier'] = ('3:2', 1.50)
+            elif  multiplierChoice == 6:
+                listDealers[i]['blackjack multiplier'] = ('7:5', 1.40)
+            elif  multiplierChoice == 7:
+                listDealers[i]['blackjack multiplier'] = ('4:3', 1.33)
+            elif  multiplierChoice == 8:
+                listDealers[i]['blackjack multiplier'] = ('6:5', 1.20)
+            listDealers[i]['table bets'] = (50, 200)
+
+        elif listDealers[i]['type'] == 'special':
+            listDealers[i]['table color'] = AQUAMARINE
+            listDealers[i]['bank'] = 250000 + (5000 * dieRoll(100, 1, 100, rng = rng))
+            multiplierChoice = dieRoll(4, 1, 4, rng = rng)
+            if multiplierChoice == 1:
+                listDealers[i]['blackjack multiplier'] = ('3:1', 3.00)
+            elif  multiplierChoice == 2:
+                listDealers[i]['blackjack multiplier'] = ('5:2', 2.50)
+            elif  multiplierChoice == 3:
+                listDealers[i]['blackjack multiplier'] = ('2:1', 2.00)
+            elif  multiplierChoice == 4:
+                listDealers[i]['blackjack multiplier'] = ('3:2', 1.50)
+            listDealers[i]['table bets'] = (250, 1000)
+
+        elif listDealers[i]['type'] == 'high':
+            listDealers[i]['table color'] = PURPLE
+            listDealers[i]['bank'] = 1000000 + (25000 * dieRoll(100, 1, 100, rng = rng))
+            multiplierChoice = dieRoll(6, 1, 6, rng = rng)
+            if multiplierChoice == 1:
+                listDealers[i]['blackjack multiplier'] = ('11:4', 2.75)
+            elif  multiplierChoice == 2:
+                listDealers[i]['blackjack multiplier'] = ('8:3', 2.67)
+            elif  multiplierChoice == 3:
+                listDealers[i]['blackjack multiplier'] = ('5:2', 2.50)
+            elif  multiplierChoice == 4:
+                listDealers[i]['blackjack multiplier'] = ('7:3', 2.33)
+            elif  multiplierChoice == 5:
+                listDealers[i]['blackjack multiplier'] = ('9:4', 2.25)
+            elif  multiplierChoice == 6:
+                listDealers[i]['blackjack multiplier'] = ('2:1', 2.00)
+            listDealers[i]['table bets'] = (500, 1000000)
+
+    return listDealers # generateDealerList
+
+def dieRoll(die, minNum, maxNum, adj=0, rng = None):
+    """
+    This function generates random numbers for sequences with floor or ceiling
+    values. For example, suppose you need to have a roll weighted to be zero
+    more often than one possible value, such as d6-2 with a 0 minimum value.
+    The sequence of numbers would be [0, 0, 1, 2, 3, 4]. Or suppose you want
+    a d12+3 with max of 12. That sequence would be [4, 5, 6, 7, 8, 9 ,10, 11
+    12, 12, 12, 12]. In this version, it cannot do a sequence like [1, 1, 2, 2].
+    The rolls are made with rng, an integer seed, RandomStream object, or None
+    for the global random module.
+    """
+    rng = resolve_stream(rng)
+    numList = []
+    for i in range(1, die + 1):
+        currentNum = i + adj
+        if not (minNum <= currentNum <= maxNum):
+            if currentNum < minNum:
+                currentNum = minNum
+            elif currentNum > maxNum:
+                currentNum = maxNum
+        numList.append(currentNum)
+    rng.shuffle(numList)
+    output = rng.randint(0, die - 1)
+    return numList[output]
@@ -0,0 +1,154 @@
+from __future__ import print_function
+import random, os, hashlib, binascii
+
+
+class RandomStream(random.Random):
+    '''
+    This class is a seedable random number generator for the card shoes, the
+    dealer roster, and the award rolls. It is a random.Random object; so, it
+    has the same randint, shuffle, and choice methods as the random module.
+    Replaying a game or a simulation only requires the root seed.
+
+    Streams form a tree. The root stream is built from a seed. Every child
+    stream is identified by its path from the root, a tuple of names and
+    numbers. The Mersenne Twister state of a stream is seeded from a SHA-256
+    hash of (root seed, path), so two different paths never share a state
+    and a child stream never repeats the numbers of its parent. Drawing
+    numbers from a stream does not change the seeds of its children.
+
+    Class Order Attributes:
+        SEEDBITS: the number of bits in a root seed generated from
+            os.urandom() when no seed is provided
+
+    Attributes:
+        root_seed: the integer seed of the root stream. It is shared by every
+            stream in the tree. Printing it is enough to replay a run.
+        path: tuple identifying this stream. The root stream's path is ().
+        spawned: the number of children created by spawn() so far
+        named: dict of the child streams created by stream(), by name
+
+    Methods:
+        __init__: seeds the stream from a root seed and a path
+        __str__: returns a string with the root seed and path
+        __reduce__: lets a stream be pickled for another process
+        derive_seed: (static) returns the seed of the stream at a path
+        stream: returns the child stream with a given name
+        spawn: returns the next numbered child stream, or a list of them,
+            for handing out to parallel workers
+        diagnostic_print: prints out the attributes of the stream
+    '''
+    SEEDBITS = 128
+
+    def __new__(cls, seed = None, path = ()):
+        # random.Random is built on a C type whose __new__ only accepts a
+        # seed. The stream is seeded in __init__ instead.
+        return random.Random.__new__(cls)
+
+    def __init__(self, seed = None, path = ()):
+        '''
+        INPUTS:
+            seed: integer root seed. If it is None, a random seed is taken
+                from os.urandom() and stored in root_seed.
+                Default: None
+            path: tuple of strings and integers naming this stream. Callers
+                normally leave it empty and use stream() or spawn() instead.
+                Default: ()
+        '''
+        if seed is None:
+            seed = int(binascii.hexlify(os.urandom(RandomStream.SEEDBITS // 8)), 16)
+        self.root_seed = seed
+        self.path = tuple(path)
+        self.spawned = 0
+        self.named = {}
+        random.Random.__init__(self, RandomStream.derive_seed(seed, self.path))
+
+    @staticmethod
+    def derive_seed(seed, path):
+        '''
+        This method returns the integer seed used for the stream at path in the
+        tree rooted at seed. The seed and the path are written out in a fixed
+        text form and hashed; so, the result is the same on every platform and
+        every run. Numbers are written in decimal, whether they are ints or
+        longs, and names are prefixed with their length, so no two paths are
+        written out the same way.
+        '''
+        parts = ['%d' % seed]
+        for step in path:
+            if type(step) in (int, long):
+                parts.append('#%d' % step)
+            else:
+                parts.append('%d:%s' % (len(step), step))
+        digest = hashlib.sha256('/'.join(parts).encode('ascii')).hexdigest()
+        return int(digest, 16)
+
+    def __str__(self):
+        return "RandomStream: root seed {0}, path {1}".format(self.root_seed, self.path)
+
+    def __reduce__(self):
+        '''
+        random.Random pickles only the generator state. This keeps the root
+        seed, path, and spawn count as well, so a stream sent to another
+        process can still spawn the same children. Named child streams are
+        not pickled. They start over from their seeds in the other process.
+        '''
+        return (_rebuild_stream, (self.root_seed, self.path, self.spawned, self.getstate()))
+
+    def stream(self, name):
+        '''
+        This method returns the child stream called name. It is created the
+        first time it is asked for, and the same object is returned after
+        that; so, repeated calls keep drawing from one stream. Its seed only
+        depends on the name, not on how many numbers have been drawn or in
+        what order the children were asked for. The game uses the names
+        'shoe', 'dealers', 'players', and 'awards'.
+        '''
+        if name not in self.named:
+            self.named[name] = RandomStream(self.root_seed, self.path + (name,))
+        return self.named[name]
+
+    def spawn(self, count = None):
+        '''
+        This method returns the next numbered child stream. If count is given,
+        it returns a list of count child streams instead. Each worker of a
+        parallel run should get its own spawned stream. Spawned streams are
+        numbered in order; so, the n'th spawn of a stream is always the same.
+        '''
+        if count is None:
+            child = RandomStream(self.root_seed, self.path + (self.spawned,))
+            self.spawned += 1
+            return child
+        return [self.spawn() for i in xrange(0, count)]
+
+    def diagnostic_print(self):
+        '''
+        This method prints out the attributes of the stream for debugging.
+        '''
+        print("Root seed: ", self.root_seed)
+        print("Stream path: ", self.path)
+        print("Child streams spawned: ", self.spawned)
+        return
+
+
+def _rebuild_stream(seed, path, spawned, state):
+    '''
+    This function rebuilds a pickled RandomStream. See RandomStream.__reduce__.
+    '''
+    rng = RandomStream(seed, path)
+    rng.spawned = spawned
+    rng.setstate(state)
+    return rng
+
+
+def resolve_stream(rng = None):
+    '''
+    This function turns the rng argument accepted by the game's classes and
+    functions into something with randint and shuffle methods:
+        None: the global random module, which is how the game always worked
+        integer: a new RandomStream seeded with it
+        anything else: returned as is (a RandomStream or random.Random object)
+    '''
+    if rng is None:
+        return random
+    if type(rng) in (int, long):
+        return RandomStream(rng)
+    return rng
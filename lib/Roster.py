@@ -0,0 +1,231 @@
+from __future__ import print_function
+import collections
+
+__doc__ = """
+This module keeps the user's team of players: their names, banks, and skill
+levels. A Roster is the one authoritative copy of that data for a game. The
+saved game is read into it, the CasinoTable is built from it, and the saved
+game is written back out of it.
+
+Nothing outside the roster gets a copy of an entry. Callers get RosterView
+objects, read only mappings with the keys 'name', 'bank', and 'skill' that
+look into the roster's own entries. Once a Player is bound to its entry, the
+entry's 'bank' is read from the Player itself; so, the roster never has to be
+brought up to date after a round. Entries are indexed by name.
+
+Classes:
+    RosterView: a read only view of one roster entry
+    Roster: the entries, in seating order, with an index by name
+"""
+
+
+class RosterView(collections.Mapping):
+    '''
+    This class is a read only view of one roster entry. It is a mapping with
+    the keys 'name', 'bank', and 'skill', so it can be used anywhere the
+    player dictionaries of a saved game were used. The view always shows the
+    entry as it is now: while a Player is bound to the entry, 'bank' is that
+    Player's bank.
+
+    Attributes:
+        entry: the roster's dict for this player. Callers must not change it.
+        seated: the roster's dict {name: Player} of bound players
+    '''
+    __slots__ = ('entry', 'seated')
+
+    KEYS = ('name', 'bank', 'skill')
+
+    def __init__(self, entry, seated):
+        self.entry = entry
+        self.seated = seated
+
+    def __getitem__(self, key):
+        if key == 'bank':
+            player = self.seated.get(self.entry['name'])
+            if player is not None:
+                return player.bank
+        return self.entry[key]
+
+    def __iter__(self):
+        return iter(RosterView.KEYS)
+
+    def __len__(self):
+        return len(RosterView.KEYS)
+
+    def __repr__(self):
+        return "RosterView({0})".format(dict(self))
+
+
+class Roster(object):
+    '''
+    This class holds the entries of the user's players, in seating order,
+    with an index by name. Indexing or iterating over a Roster gives
+    RosterView objects, so CasinoTable and the saved game functions can read
+    it like the list of player dictionaries it replaces.
+
+    Class Order Attributes:
+        SKILLS: the skill levels, from lowest to highest. promote moves a
+            player up one level.
+
+    Attributes:
+        entries: list of the entry dicts, {'name', 'bank', 'skill'}, in
+            seating order
+        index: dict {name: entry dict}
+        seated: dict {name: Player} of the players bound to their entries
+
+    Methods:
+        __init__: builds the roster from player dictionaries
+        __len__: returns the number of players
+        __iter__: yields a view of every entry, in order
+        __getitem__: returns a view of the entry at an index
+        __contains__: returns True if a player of that name is in the roster
+        __str__: returns a string with the players and their banks
+        view: returns a view of the entry for a name
+        add: adds a player and returns a view of the new entry
+        remove: removes a player by name
+        bind: makes an entry read its bank from a Player
+        bind_table: binds every player seated at a CasinoTable
+        unbind: copies a Player's bank into its entry and unbinds it
+        set_bank: sets the bank of an unbound entry
+        promote: raises a player's skill by one level
+        skills: returns the set of skills in the roster
+        diagnostic_print: prints out the roster's attributes
+    '''
+    SKILLS = ('starter', 'normal', 'special', 'high')
+
+    def __init__(self, players = None):
+        '''
+        INPUTS:
+            players: a list of player dictionaries with the keys 'name',
+                'bank', and 'skill', like the ones findPlayers reads from a
+                saved game. They are copied into the roster once, here.
+                Default: None (an empty roster)
+        A duplicate name or an unknown skill raises a ValueError.
+        '''
+        self.entries = []
+        self.index = {}
+        self.seated = {}
+        if players is not None:
+            for player in players:
+                self.add(player['name'], player['bank'], player['skill'])
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        seated = self.seated
+        for entry in self.entries:
+            yield RosterView(entry, seated)
+
+    def __getitem__(self, position):
+        return RosterView(self.entries[position], self.seated)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __str__(self):
+        return "Roster: " + ", ".join(["{0} (${1}, {2})".format(view['name'], view['bank'], view['skill'])
+                                       for view in self])
+
+    def view(self, name):
+        '''
+        This method returns a RosterView of the entry for name. An unknown
+        name raises a KeyError.
+        '''
+        return RosterView(self.index[name], self.seated)
+
+    def add(self, name, bank, skill = 'starter'):
+        '''
+        This method adds a player at the end of the roster. It returns a view
+        of the new entry. A name already in the roster or an unknown skill
+        raises a ValueError.
+        '''
+        if name in self.index:
+            raise ValueError("Roster: {0} is already in the roster.".format(name))
+        if skill not in Roster.SKILLS:
+            raise ValueError("Roster: unknown skill {0}. Choose from {1}.".format(skill, Roster.SKILLS))
+        entry = {'name' : name, 'bank' : bank, 'skill' : skill}
+        self.entries.append(entry)
+        self.index[name] = entry
+        return RosterView(entry, self.seated)
+
+    def remove(self, name):
+        '''
+        This method removes the player name from the roster, and unbinds
+        them if they are bound. An unknown name is ignored. It returns no
+        values.
+        '''
+        entry = self.index.pop(name, None)
+        if entry is not None:
+            self.seated.pop(name, None)
+            self.entries.remove(entry)
+        return
+
+    def bind(self, player):
+        '''
+        This method binds the Player object player to the entry with the same
+        name. Until it is unbound, the entry's bank is the Player's bank. An
+        unknown name raises a KeyError. It returns no values.
+        '''
+        if player.name not in self.index:
+            raise KeyError(player.name)
+        self.seated[player.name] = player
+        return
+
+    def bind_table(self, table):
+        '''
+        This method binds every player seated at the CasinoTable table. It
+        returns no values.
+        '''
+        for player in table.players.values():
+            self.bind(player)
+        return
+
+    def unbind(self, name):
+        '''
+        This method copies the bank of the Player bound to name into the
+        entry and unbinds it, for a player leaving the table. It returns the
+        bank, or None if name is not bound.
+        '''
+        player = self.seated.pop(name, None)
+        if player is None:
+            return None
+        self.index[name]['bank'] = player.bank
+        return player.bank
+
+    def set_bank(self, name, bank):
+        '''
+        This method sets the bank of the entry for name. The bank of a bound
+        entry belongs to its Player; so, that raises a ValueError. It returns
+        no values.
+        '''
+        if name in self.seated:
+            raise ValueError("Roster: {0} is seated; change the Player's bank instead.".format(name))
+        self.index[name]['bank'] = bank
+        return
+
+    def promote(self, name):
+        '''
+        This method raises the skill of name by one level. There is no level
+        above the last one in SKILLS. It returns the new skill.
+        '''
+        entry = self.index[name]
+        level = Roster.SKILLS.index(entry['skill'])
+        if level + 1 < len(Roster.SKILLS):
+            entry['skill'] = Roster.SKILLS[level + 1]
+        return entry['skill']
+
+    def skills(self):
+        '''
+        This method returns the set of the skills of the players in the
+        roster.
+        '''
+        return set([entry['skill'] for entry in self.entries])
+
+    def diagnostic_print(self):
+        '''
+        This method prints out the attributes of the roster for debugging.
+        '''
+        print("Entries: ", self.entries)
+        print("Seated Players: ", sorted(self.seated))
+        return
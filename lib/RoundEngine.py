@@ -0,0 +1,481 @@
+from __future__ import print_function
+
+__doc__ = """
+This module plays rounds of Blackjack on a CasinoTable without any input or
+output. The rules of a round live here; the game, bots, and simulations only
+supply the decisions. Nothing in this module prints, calls raw_input, or
+touches pygame.
+
+A round is a state machine that moves through PHASES in order:
+    'ante'         : every seated player who can cover the table minimum
+                     places a bet
+    'deal'         : two cards to every player in the round and the dealer,
+                     the dealer's first card face down. Player blackjacks
+                     are paid right away.
+    'insurance'    : if the dealer shows an Ace or a 10 value card, every
+                     player may place an insurance bet
+    'split'        : every pair the table's split rules allow may be split,
+                     with a bet on the new hand, and each hand gets its
+                     second card
+    'double'       : every playable hand may raise its bet by up to the
+                     original bet (this game's double down; it does not
+                     stop the player from hitting)
+    'player turns' : every playable hand hits or stands, in seat order.
+                     Busted hands are lost to the dealer right away.
+    'dealer'       : the hold card is revealed, insurance is resolved, and
+                     the dealer draws until the stand rule is met
+    'settle'       : every hand still in play is settled with
+                     CasinoTable.settle
+    'end'          : hands and bets are cleared, the ledger moves to the
+                     next round, and the shoe is reshuffled once the cut card
+                     has come out
+
+Decisions are requests (kind, seat, index), with kind one of REQUESTS. They
+are answered in one of two ways:
+    callback: step() and play_round() ask the Policy of the seat, calling
+        the method named in REQUESTS
+    step API: next_request() returns the next request, and decide(value)
+        answers it, for a driver like the GUI that waits on the user
+
+Classes:
+    Policy: the decisions of one seat. The default plays like the dealer.
+    RoundEngine: the round state machine on top of a CasinoTable
+"""
+
+PHASES = ('ante', 'deal', 'insurance', 'split', 'double', 'player turns', 'dealer', 'settle', 'end')
+
+# The kinds of decisions, and the Policy method that answers each of them.
+REQUESTS = {'bet'       : 'bet',
+            'insurance' : 'insurance',
+            'split'     : 'split',
+            'split bet' : 'split_bet',
+            'double'    : 'double',
+            'hit'       : 'hit'}
+
+
+class Policy(object):
+    '''
+    This class makes the decisions for one seat. Every method takes the
+    RoundEngine asking, the seat, and the index of the hand in Player.hands,
+    and returns the answer to one kind of request. The default plays like
+    the dealer: it bets the table minimum, never insures, splits, or
+    doubles, and hits below 17. Subclasses override the methods they need.
+
+    Methods:
+        bet: returns the ante for the regular hand
+        insurance: returns the insurance bet, 0 for none
+        split: returns True to split hands[index]
+        split_bet: returns the bet on the new split hand hands[index]
+        double: returns the raise on hands[index], 0 for none
+        hit: returns True to take another card on hands[index]
+    '''
+    def bet(self, engine, seat, index):
+        return engine.table.min_bet
+
+    def insurance(self, engine, seat, index):
+        return 0
+
+    def split(self, engine, seat, index):
+        return False
+
+    def split_bet(self, engine, seat, index):
+        return engine.table.min_bet
+
+    def double(self, engine, seat, index):
+        return 0
+
+    def hit(self, engine, seat, index):
+        return engine.hand(seat, index).soft_score < 17
+
+
+class RoundEngine(object):
+    '''
+    This class plays rounds on a CasinoTable as a state machine. The table
+    holds all of the state of the round (players, hands, bets, results, the
+    shoe); the engine only adds the phase the round is in and the request
+    waiting for an answer. So, the game's screens and a simulation can look
+    at the same table between steps.
+
+    Attributes:
+        table: the CasinoTable being played
+        policies: dict {seat: Policy} used by step() and play_round()
+        default_policy: the Policy of any seat not in policies
+        phase: the phase the round is in, one of PHASES, or None before the
+            first round
+        pending: the request (kind, seat, index) waiting for an answer, or
+            None
+        refused: the error code of the last answer the table refused, or
+            None
+        finished: True once the round has been played through 'end'
+        rounds: the number of rounds started
+        seats: the seats playing this round, in table order
+        summary: dict describing the round, filled in as it is played:
+            'round'            : the round number
+            'sitting out'      : seats that could not cover the table
+                                 minimum and were not dealt in
+            'blackjacks'       : seats paid for a blackjack
+            'busts'            : results keys of the hands that busted
+            'insurance'        : dict {seat: change to the bank} from
+                                 insurance bets
+            'dealer blackjack' : True if the dealer had blackjack
+            'dealer total'     : the dealer's final soft score, or its hard
+                                 score if it busted
+            'settlement'       : the dict returned by CasinoTable.settle
+            'dealer solvent'   : False once a payout broke the dealer's bank
+            'eliminated'       : seats whose bank is zero or less at the end
+            'reshuffled'       : True if the shoe was reshuffled at the end
+
+    Methods:
+        __init__: sets up the engine for a table and its policies
+        policy_for: returns the Policy of a seat
+        hand: returns the Hand object of a seat's hand
+        upcard: (property) the dealer's visible card code, or None
+        start_round: starts a round at 'ante'
+        next_request: runs the round up to the next request and returns it
+        decide: answers the pending request
+        step: runs the current phase to its end with the policies
+        play_round: plays a whole round with the policies
+    '''
+    def __init__(self, table, policy = None):
+        '''
+        INPUTS:
+            table: a CasinoTable
+            policy: a Policy for every seat, or a dict {seat: Policy}
+                Default: None (Policy() for every seat)
+        '''
+        self.table = table
+        if isinstance(policy, dict):
+            self.policies = dict(policy)
+            self.default_policy = Policy()
+        else:
+            self.policies = {}
+            self.default_policy = policy if policy is not None else Policy()
+        self.phase = None
+        self.pending = None
+        self.refused = None
+        self.finished = True
+        self.rounds = 0
+        self.seats = []
+        self.summary = {}
+        self._flow = None
+
+    def policy_for(self, seat):
+        '''
+        This method returns the Policy that decides for seat.
+        '''
+        return self.policies.get(seat, self.default_policy)
+
+    def hand(self, seat, index = 0):
+        '''
+        This method returns the Hand object hands[index] of the player in
+        seat.
+        '''
+        return self.table.players[seat].hands[index]
+
+    @property
+    def upcard(self):
+        '''
+        This property is the card code of the dealer's visible card, or None
+        before it is dealt.
+        '''
+        visible = self.table.tableDealer.visible_card
+        if len(visible) == 0:
+            return None
+        return visible[0]
+
+    def start_round(self):
+        '''
+        This method starts a new round. The engine stops at the start of
+        'ante'; nothing at the table changes until the round is run with
+        next_request or step. A round that has not finished is abandoned.
+        It returns no values.
+        '''
+        self.rounds += 1
+        self.finished = False
+        self.pending = None
+        self.refused = None
+        self._flow = self._round()
+        self._advance(None)
+        return
+
+    def _advance(self, value):
+        try:
+            self.pending = self._flow.send(value)
+        except StopIteration:
+            self.pending = None
+            self.finished = True
+        return
+
+    def next_request(self):
+        '''
+        This method runs the round until a decision is needed and returns
+        the request (kind, seat, index). Phases that need no decision are
+        played through. It returns None once the round has finished.
+        '''
+        while (self.pending is None) and not self.finished:
+            self._advance(None)
+        return self.pending
+
+    def decide(self, value):
+        '''
+        This method answers the pending request with value and plays on
+        until the next request or the end of the phase. It returns 'success',
+        or the error code of the Player bet method that refused the value;
+        a refused request stays pending. With nothing pending, it raises a
+        ValueError.
+        '''
+        if self.pending is None:
+            raise ValueError("RoundEngine: there is no request waiting for a decision.")
+        self.refused = None
+        self._advance(value)
+        if self.refused is not None:
+            return self.refused
+        return 'success'
+
+    def _ask(self, request):
+        kind, seat, index = request
+        return getattr(self.policy_for(seat), REQUESTS[kind])(self, seat, index)
+
+    def step(self):
+        '''
+        This method runs the current phase to its end, answering every
+        request with the policies, and stops at the start of the next phase.
+        A policy answer the table refuses raises a ValueError, since asking
+        the same policy again would give the same answer. It returns the
+        phase the engine stopped at, or None once the round has finished.
+        '''
+        if self.finished:
+            return None
+        if self.pending is None:
+            self._advance(None)
+        while self.pending is not None:
+            request = self.pending
+            result = self.decide(self._ask(request))
+            if result != 'success':
+                raise ValueError("RoundEngine: the {0} decision for {1} was refused ({2}).".format(
+                                 request[0], request[1], result))
+        if self.finished:
+            return None
+        return self.phase
+
+    def play_round(self):
+        '''
+        This method plays a whole round with the policies and returns the
+        summary dict.
+        '''
+        self.start_round()
+        while self.step() is not None:
+            pass
+        return self.summary
+
+    def _accepted(self, result):
+        # This records a refused answer; the request is then asked again.
+        if result == 'success':
+            return True
+        self.refused = result
+        return False
+
+    def _deal(self, seat, index):
+        # This deals one card to hands[index] of seat and records its result
+        # in table.results.
+        table = self.table
+        card = table.deck.remove_top()
+        if index == 0:
+            result = table.players[seat].add_card_to_hand(card)
+        else:
+            result = table.players[seat].add_card_to_split(card, index)
+        table.results[table.hand_key(seat, index)] = result
+        return result
+
+    def _dealer_paid(self, amount):
+        # This takes a payout out of the dealer's bank, noting if it broke.
+        if not self.table.tableDealer.dealer_lost(amount):
+            self.summary['dealer solvent'] = False
+        return
+
+    def _round(self):
+        '''
+        This generator is the round. It yields a request whenever a decision
+        is needed, and None at the start of each phase; so, the round pauses
+        at every phase boundary.
+        '''
+        table = self.table
+        dealer = table.tableDealer
+        players = table.players
+        min_bet = table.min_bet
+        max_bet = table.max_bet
+        summary = {'round'            : self.rounds,
+                   'sitting out'      : [],
+                   'blackjacks'       : [],
+                   'busts'            : [],
+                   'insurance'        : {},
+                   'dealer blackjack' : False,
+                   'dealer total'     : None,
+                   'settlement'       : None,
+                   'dealer solvent'   : True,
+                   'eliminated'       : [],
+                   'reshuffled'       : False}
+        self.summary = summary
+
+        # The seats are fixed for the round before the ante. A player who
+        # cannot cover the table minimum sits the round out.
+        self.phase = 'ante'
+        yield None
+        self.seats = []
+        for number in sorted(table.TABLESEATS):
+            seat = table.TABLESEATS[number]
+            if seat not in players:
+                continue
+            if players[seat].bank < min_bet:
+                summary['sitting out'].append(seat)
+            else:
+                self.seats.append(seat)
+        for seat in self.seats:
+            while True:
+                value = yield ('bet', seat, 0)
+                if self._accepted(players[seat].update_bet(value, min_bet, max_bet)):
+                    break
+
+        # Two passes around the table, the dealer last. The dealer's first
+        # card is the hold card, dealt face down.
+        self.phase = 'deal'
+        yield None
+        for deal in xrange(0, 2):
+            for seat in self.seats:
+                self._deal(seat, 0)
+            card = table.deck.remove_top(face_down = (deal == 0))
+            table.results['dealer reg'] = dealer.add_card_to_hand(card)
+        multiplier = table.blackjack_multiplier[1]
+        for seat in self.seats:
+            if table.results[table.hand_key(seat, 0)] == 'blackjack':
+                winnings = int(players[seat].bet * multiplier)
+                players[seat].blackjack(multiplier)
+                self._dealer_paid(winnings)
+                summary['blackjacks'].append(seat)
+
+        self.phase = 'insurance'
+        yield None
+        if dealer.blackjack_flag:
+            for seat in self.seats:
+                if seat in summary['blackjacks']:
+                    continue
+                while True:
+                    value = yield ('insurance', seat, 0)
+                    if (not value) or self._accepted(players[seat].update_ins(value, 0, max_bet)):
+                        break
+
+        # Every hand in play is checked, including the ones a split just
+        # made; so, re-splits are offered like CasinoTable.pairs_check. A
+        # split is only offered if the player can cover the minimum bet on
+        # the new hand.
+        self.phase = 'split'
+        yield None
+        max_hands = table.split_rules['max hands']
+        resplit_aces = table.split_rules['resplit aces']
+        for seat in self.seats:
+            player = players[seat]
+            index = 0
+            while index < player.hand_count:
+                if not player.split_check(index, max_hands, resplit_aces) or \
+                   (player.total_bets() + min_bet > player.bank):
+                    index += 1
+                    continue
+                answer = yield ('split', seat, index)
+                if not answer:
+                    index += 1
+                    continue
+                new_index = player.split_pair(index)
+                while True:
+                    value = yield ('split bet', seat, new_index)
+                    if self._accepted(player.update_hand_bet(new_index, value, min_bet, max_bet)):
+                        break
+                self._deal(seat, index)
+                self._deal(seat, new_index)
+
+        # The raise is from nothing up to the original bet, once per hand.
+        self.phase = 'double'
+        yield None
+        for seat in self.seats:
+            player = players[seat]
+            for key, index in table.seat_hands(seat):
+                hand = player.hands[index]
+                if table.results[key] != 'playable' or hand.raise_bet:
+                    continue
+                while True:
+                    value = yield ('double', seat, index)
+                    if (not value) or self._accepted(player.update_hand_bet(index, value, 0, hand.bet)):
+                        break
+                hand.raise_bet = True
+
+        # A hand is played until it stands, busts, or reaches 21. A busted
+        # hand is lost to the dealer right away.
+        self.phase = 'player turns'
+        yield None
+        for seat in self.seats:
+            player = players[seat]
+            for key, index in table.seat_hands(seat):
+                hand = player.hands[index]
+                while (table.results[key] == 'playable') and (hand.soft_score < 21):
+                    answer = yield ('hit', seat, index)
+                    if not answer:
+                        break
+                    if self._deal(seat, index) == 'bust':
+                        summary['busts'].append(key)
+                        player.lose_hand(index)
+                        dealer.dealer_won(hand.bet)
+
+        # The dealer's turn follows the casino rules in CasinoTable.dealer_turn.
+        self.phase = 'dealer'
+        yield None
+        dealer.reveal_hold_card()
+        dealer_blackjack = (len(dealer) == 2) and (dealer.soft_hand_score == 21) and (dealer.hard_hand_score == 11)
+        summary['dealer blackjack'] = dealer_blackjack
+        if dealer.blackjack_flag:
+            for seat in self.seats:
+                insurance = players[seat].insurance
+                if insurance == 0:
+                    continue
+                players[seat].ins(dealer_blackjack)
+                if dealer_blackjack:
+                    self._dealer_paid(insurance)
+                    summary['insurance'][seat] = insurance
+                else:
+                    dealer.dealer_won(insurance)
+                    summary['insurance'][seat] = -insurance
+        if not dealer_blackjack:
+            # The dealer stands on a hard 17 or more, or on a soft score over
+            # 16 that beats at least one live hand. With no live hands left,
+            # there is nothing to play for.
+            scores = table.scores
+            while (len(scores) != 0) and (dealer.hard_hand_score < 17) and \
+                  not ((dealer.soft_hand_score > 16) and scores.beats_any(dealer.soft_hand_score)):
+                card = table.deck.remove_top()
+                table.results['dealer reg'] = dealer.add_card_to_hand(card)
+            if dealer.hard_hand_score <= 21:
+                table.results['dealer reg'] = 'stand'
+        if dealer.hard_hand_score > 21:
+            summary['dealer total'] = dealer.hard_hand_score
+        else:
+            summary['dealer total'] = dealer.soft_hand_score
+
+        self.phase = 'settle'
+        yield None
+        settlement = table.settle(dealer_blackjack = dealer_blackjack)
+        summary['settlement'] = settlement
+        if not settlement['dealer solvent']:
+            summary['dealer solvent'] = False
+
+        # Nobody is removed from the table here. The eliminated seats are
+        # reported, and sit out every round until the caller removes them.
+        self.phase = 'end'
+        yield None
+        summary['eliminated'] = [seat for seat in self.seats if players[seat].bank <= 0]
+        for seat in self.seats:
+            players[seat].end_round()
+        dealer.end_round()
+        for key in table.hand_list:
+            table.results[key] = None
+        if table.ledger is not None:
+            table.ledger.next_round()
+        summary['reshuffled'] = table.check_cut_card()
+        return
@@ -0,0 +1,253 @@
+from __future__ import print_function
+import os, mmap, struct
+from array import array
+from BlackjackClasses import CardShoe
+
+__doc__ = """
+This module records the order of card shoes to a binary archive file and
+deals them back later. It is used to rerun the exact same cards across code
+versions, for benchmarks and for chasing bugs.
+
+Archive file layout:
+    Header (HEADERSIZE bytes):
+        magic   8 bytes  MAGIC
+        version 2 bytes  VERSION (unsigned, little endian)
+        decks   2 bytes  decks in every recorded shoe
+        cards   4 bytes  cards in every record (decks * 52)
+        count   4 bytes  number of complete records
+        padding up to HEADERSIZE
+    Records: count records of cards bytes each, one card index (0-51 into
+        CardShoe.cards) per byte, in the order the cards are dealt.
+
+Every record is the same size; so, record i starts at
+HEADERSIZE + i * cards. The count in the header is only raised after a
+record has been written; so, a recording that was cut short never exposes a
+partial record.
+
+Classes:
+    ShoeRecorder: appends the order of every shoe a CardShoe produces
+    ShoeArchive: memory maps an archive file and hands back recorded shoes
+    ReplayShoe: a CardShoe that deals the archive's shoes in order, moving to
+        the next record each time it is reshuffled
+"""
+
+MAGIC = b'BJSHOE\x00\x01'
+VERSION = 1
+HEADER = struct.Struct('<8sHHII')
+HEADERSIZE = 32
+COUNTOFFSET = 16
+
+
+def _read_header(fileObj, filename):
+    fileObj.seek(0)
+    data = fileObj.read(HEADER.size)
+    if len(data) < HEADER.size:
+        raise ValueError("{0} is too short to be a shoe archive.".format(filename))
+    magic, version, decks, cards, count = HEADER.unpack(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("{0} is not a version {1} shoe archive.".format(filename, VERSION))
+    return decks, cards, count
+
+
+class ShoeRecorder(object):
+    '''
+    This class appends shoe orders to an archive file. Attach it to a CardShoe
+    with attach(); the shoe then calls record() every time it is reshuffled.
+
+    Attributes:
+        filename: path of the archive file
+        decks: number of decks in every recorded shoe
+        cards: number of cards in every record
+        count: number of records in the file
+        fileObj: the open archive file
+
+    Methods:
+        __init__: opens or creates the archive file
+        __len__: returns the number of records
+        __str__: returns a string with the file name and record count
+        attach: makes a shoe record itself, recording its current order
+        record: shuffles a fresh shoe completely and appends its order
+        close: closes the archive file
+    '''
+    def __init__(self, filename, decks = 6):
+        '''
+        INPUTS:
+            filename: path of the archive file. An existing archive is
+                appended to; its shoes must have the same number of decks.
+            decks: integer, the number of decks in the recorded shoes
+                Default: 6
+        '''
+        self.filename = filename
+        self.decks = decks
+        self.cards = CardShoe.deck_size * decks
+        if os.path.exists(filename) and os.path.getsize(filename) > 0:
+            self.fileObj = open(filename, 'r+b')
+            fileDecks, cards, self.count = _read_header(self.fileObj, filename)
+            if fileDecks != decks:
+                self.fileObj.close()
+                raise ValueError("ShoeRecorder: {0} holds {1} deck shoes, not {2}.".format(filename, fileDecks, decks))
+        else:
+            self.fileObj = open(filename, 'w+b')
+            self.count = 0
+            header = HEADER.pack(MAGIC, VERSION, decks, self.cards, 0)
+            self.fileObj.write(header + b'\x00' * (HEADERSIZE - len(header)))
+            self.fileObj.flush()
+
+    def __len__(self):
+        return self.count
+
+    def __str__(self):
+        return "Shoe Recorder: {0} shoes in {1}.".format(self.count, self.filename)
+
+    def attach(self, shoe):
+        '''
+        This method sets shoe.recorder to this recorder. If no card has been
+        dealt from the shoe yet, its current order is recorded right away.
+        '''
+        if shoe.decks != self.decks:
+            raise ValueError("ShoeRecorder: cannot record a {0} deck shoe in a {1} deck archive.".format(shoe.decks,
+                                                                                                      self.decks))
+        shoe.recorder = self
+        if shoe.cursor == 0:
+            self.record(shoe)
+        return
+
+    def record(self, shoe):
+        '''
+        This method finishes shuffling a shoe that has not been dealt from
+        and appends its order to the archive. The shoe then deals exactly the
+        recorded cards. It returns the index of the new record.
+        '''
+        if shoe.cursor != 0:
+            raise ValueError("ShoeRecorder: only a freshly shuffled shoe can be recorded.")
+        shoe.finish_shuffle()
+        self.fileObj.seek(HEADERSIZE + self.count * self.cards)
+        self.fileObj.write(shoe.card_codes.tostring())
+        self.count += 1
+        self.fileObj.seek(COUNTOFFSET)
+        self.fileObj.write(struct.pack('<I', self.count))
+        self.fileObj.flush()
+        return self.count - 1
+
+    def close(self):
+        '''
+        This method closes the archive file. It returns no values.
+        '''
+        if not self.fileObj.closed:
+            self.fileObj.close()
+        return
+
+
+class ShoeArchive(object):
+    '''
+    This class memory maps an archive file written by ShoeRecorder. Reading a
+    shoe is a slice of the map; nothing in the file is parsed except the
+    header.
+
+    Attributes:
+        filename: path of the archive file
+        decks: number of decks in every recorded shoe
+        cards: number of cards in every record
+        count: number of records in the archive when it was opened
+        data: the read only mmap of the whole file
+
+    Methods:
+        __init__: opens and maps the archive file
+        __len__: returns the number of records
+        __getitem__: returns the raw bytes of one record
+        codes: returns one record as an array of card indexes
+        load_shoe: returns a CardShoe that deals one record
+        as_numpy: returns every record as a (count, cards) numpy array
+        close: unmaps and closes the file
+    '''
+    def __init__(self, filename):
+        self.filename = filename
+        self._fileObj = open(filename, 'rb')
+        self.decks, self.cards, self.count = _read_header(self._fileObj, filename)
+        self.data = mmap.mmap(self._fileObj.fileno(), 0, access = mmap.ACCESS_READ)
+
+    def __len__(self):
+        return self.count
+
+    def __str__(self):
+        return "Shoe Archive: {0} shoes of {1} decks in {2}.".format(self.count, self.decks, self.filename)
+
+    def __getitem__(self, index):
+        '''
+        This method returns the bytes of record index, one card index per
+        byte. Negative indexes count from the end, like a list.
+        '''
+        if index < 0:
+            index += self.count
+        if not (0 <= index < self.count):
+            raise IndexError("ShoeArchive: record {0} is not in the archive.".format(index))
+        start = HEADERSIZE + index * self.cards
+        return self.data[start:start + self.cards]
+
+    def codes(self, index):
+        '''
+        This method returns record index as an array('B') of card indexes.
+        '''
+        return array('B', self[index])
+
+    def load_shoe(self, index, penetration = None, cut_card = None):
+        '''
+        This method returns a CardShoe that deals the cards of record index
+        in order. The shoe is marked as completely shuffled; so, it never
+        calls its random number generator until it is reshuffled.
+        '''
+        shoe = CardShoe(self.decks, penetration, cut_card)
+        shoe.card_codes = self.codes(index)
+        shoe.shuffled = shoe.length
+        return shoe
+
+    def as_numpy(self):
+        '''
+        This method returns every record as a read only numpy uint8 array of
+        shape (count, cards) that shares memory with the map, in the same
+        form as ShoeBatch.shuffled_shoes. It needs numpy.
+        '''
+        import numpy
+        return numpy.frombuffer(self.data, dtype = numpy.uint8, count = self.count * self.cards,
+                                offset = HEADERSIZE).reshape(self.count, self.cards)
+
+    def close(self):
+        '''
+        This method unmaps and closes the archive. It returns no values.
+        '''
+        self.data.close()
+        self._fileObj.close()
+        return
+
+
+class ReplayShoe(CardShoe):
+    '''
+    This class is a CardShoe that deals recorded shoes from a ShoeArchive,
+    starting at record start. Each reshuffle moves on to the next record.
+    Reshuffling past the last record raises an IndexError. A CasinoTable can
+    deal from one by assigning it to table.deck and calling
+    table.attach_counter().
+
+    Attributes (besides those of CardShoe):
+        archive: the ShoeArchive being replayed
+        record: the index of the record being dealt
+    '''
+    def __init__(self, archive, start = 0, penetration = None, cut_card = None):
+        CardShoe.__init__(self, archive.decks, penetration, cut_card)
+        self.archive = archive
+        self.record = start
+        self.card_codes = archive.codes(start)
+        self.shuffled = self.length
+
+    def reshuffle(self):
+        '''
+        This method returns every dealt card to the shoe and loads the next
+        recorded shoe. The next record is read first; so, running out of
+        records leaves the shoe as it was.
+        '''
+        codes = self.archive.codes(self.record + 1)
+        CardShoe.reshuffle(self)
+        self.record += 1
+        self.card_codes = codes
+        self.shuffled = self.length
+        return
@@ -0,0 +1,124 @@
+from __future__ import print_function
+from array import array
+from BlackjackClasses import CardShoe
+from RandomStreams import RandomStream
+
+# NumPy is only needed for batches of shoes. The game itself runs without it;
+# so, the import failing is not an error until one of these functions is used.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+__doc__ = """
+This module builds batches of shuffled card shoes for Monte Carlo
+simulations. A batch is a 2-D numpy array of card codes with one row per shoe
+and one column per card position. A card code is the index of the card tuple
+(rank, suit) in CardShoe.cards, the same code CardShoe stores in card_codes.
+Building a batch of thousands of shoes is one vectorized call instead of
+thousands of Python shuffles, and it takes one byte per card instead of a list
+of string tuples.
+
+Lookup tables, indexed by card code:
+    CODERANKS:  rank index 0-12 (A, 2, ..., 10, J, Q, K)
+    CODEVALUES: blackjack value of the card, with aces counted as 1
+
+Functions:
+    shuffled_shoes: returns a (count, decks * 52) array of shuffled shoes
+    numpy_random_state: turns a seed or RandomStream into a RandomState
+    load_shoe: builds a CardShoe that deals one row of a batch
+    shoe_cards: turns one row of a batch into a list of card tuples
+
+NumPy is optional. If it is not installed, HAVENUMPY is False and the
+functions raise ImportError.
+"""
+
+HAVENUMPY = numpy is not None
+
+if HAVENUMPY:
+    CODERANKS = numpy.array([CardShoe.ranks.index(rank) for (rank, suit) in CardShoe.cards], dtype = numpy.uint8)
+    CODEVALUES = numpy.minimum(CODERANKS + 1, 10).astype(numpy.uint8)
+else:
+    CODERANKS = None
+    CODEVALUES = None
+
+
+def _require_numpy(caller):
+    if not HAVENUMPY:
+        raise ImportError("{0}: numpy is required for batches of shoes.".format(caller))
+    return
+
+
+def numpy_random_state(rng = None):
+    '''
+    This function returns a numpy.random.RandomState for a batch. rng can be:
+        None: a RandomState seeded by numpy from the operating system
+        integer: a RandomStream is built from it, as in CardShoe
+        RandomStream or random.Random: 256 random bits are drawn from it to
+            seed the RandomState, so batches follow the same stream tree as
+            the shoes do
+        numpy.random.RandomState: returned as is
+    '''
+    _require_numpy('numpy_random_state')
+    if rng is None:
+        return numpy.random.RandomState()
+    if isinstance(rng, numpy.random.RandomState):
+        return rng
+    if type(rng) in (int, long):
+        rng = RandomStream(rng)
+    return numpy.random.RandomState([rng.getrandbits(32) for i in xrange(0, 8)])
+
+
+def shuffled_shoes(count, decks = 6, rng = None):
+    '''
+    This function returns count shuffled shoes of decks 52 card decks each, as
+    a numpy array of uint8 card codes with shape (count, decks * 52). Row i is
+    shoe i, dealt from column 0 onward.
+
+    Every row is an independent, uniformly random order of the shoe. The
+    random keys for the whole batch are drawn in one call, and sorting each
+    row of keys gives that row's permutation of the sequential shoe.
+
+    INPUTS:
+        count: integer, the number of shoes in the batch
+        decks: integer, the number of decks in each shoe
+            Default: 6
+        rng: seed, RandomStream, RandomState, or None. See
+            numpy_random_state.
+            Default: None
+    '''
+    _require_numpy('shuffled_shoes')
+    if (type(count) not in (int, long)) or (count < 0):
+        raise ValueError("shuffled_shoes: count must be a non-negative integer, not {0}.".format(count))
+    if (type(decks) not in (int, long)) or (decks < 1):
+        raise ValueError("shuffled_shoes: decks must be a positive integer, not {0}.".format(decks))
+    state = numpy_random_state(rng)
+    length = CardShoe.deck_size * decks
+    sequential = numpy.tile(numpy.arange(CardShoe.deck_size, dtype = numpy.uint8), decks)
+    order = state.random_sample((count, length)).argsort(axis = 1)
+    return sequential[order]
+
+
+def load_shoe(row, penetration = None, cut_card = None):
+    '''
+    This function returns a CardShoe that deals the cards in one row of a
+    batch, in order. The row is already shuffled; so, the shoe is marked as
+    completely shuffled and never calls its random number generator until it
+    is reshuffled. The row must be a whole number of decks.
+    '''
+    _require_numpy('load_shoe')
+    codes = numpy.asarray(row, dtype = numpy.uint8)
+    if codes.ndim != 1 or len(codes) == 0 or len(codes) % CardShoe.deck_size:
+        raise ValueError("load_shoe: a row must hold whole decks, not {0} cards.".format(codes.size))
+    shoe = CardShoe(len(codes) // CardShoe.deck_size, penetration, cut_card)
+    shoe.card_codes = array('B', codes.tostring())
+    shoe.shuffled = shoe.length
+    return shoe
+
+
+def shoe_cards(row):
+    '''
+    This function returns the list of card tuples (rank, suit) for one row of
+    a batch. It is meant for printouts and debugging, not for simulations.
+    '''
+    return [CardShoe.cards[code] for code in row]
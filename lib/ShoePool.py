@@ -0,0 +1,235 @@
+from __future__ import print_function
+import threading, Queue, atexit, weakref
+from BlackjackClasses import CardShoe
+from RandomStreams import resolve_stream
+
+
+class ShoePool(object):
+    '''
+    This class keeps a bounded pool of card shoes that have already been
+    completely shuffled. A background worker thread keeps the pool full; so,
+    replacing the shoe at the end of a round is just taking the next shoe out
+    of the pool. Shoes that are put back are reshuffled by the worker and
+    reused instead of building new CardShoe objects.
+
+    A shoe from the pool has had finish_shuffle() called on it. Dealing from
+    it never has to pick a random card, which makes remove_top cheaper too.
+
+    When the pool is seeded, the worker gives each shoe the next child stream
+    spawned from the pool's RandomStream. Since only the worker spawns
+    streams and the pool hands shoes out in the order they were shuffled,
+    a seeded pool deals the same shoes in the same order every run. A caller
+    that finds the pool empty waits for the worker instead of shuffling a
+    shoe itself, for the same reason. A shoe the worker has shuffled but not
+    yet put in the pool when it is stopped is kept, and it is the first shoe
+    put in when the worker starts again; so, stop() does not skip a stream.
+
+    Class Order Attributes:
+        DEFAULTSIZE: the number of ready shoes kept in the pool if no size is
+            given
+
+    Attributes:
+        size: the maximum number of ready shoes in the pool
+        shoe_args: tuple (decks, penetration, cut_card) used to build shoes
+        rng: the random number generator the shoe streams are spawned from.
+            If it cannot spawn (None or a plain random.Random), every shoe
+            shares it.
+        hits: the number of get() calls that found a ready shoe
+        misses: the number of get() calls that had to wait for the worker
+        built: the number of CardShoe objects the worker created
+        recycled: the number of returned shoes the worker reshuffled
+        ready: Queue of shuffled shoes waiting to be dealt
+        returned: Queue of used shoes waiting to be reshuffled
+        worker: the background threading.Thread, or None before start()
+        pending: a shuffled shoe the worker was stopped before putting in the
+            pool, or None
+
+    Methods:
+        __init__: stores the shoe geometry and starts the worker
+        __len__: returns the number of ready shoes in the pool
+        __str__: returns a string with the pool size and counters
+        start: starts the worker thread if it is not running
+        stop: tells the worker thread to finish and waits for it
+        get: returns a ready shoe, waiting for one if the pool is empty
+        put_back: returns a used shoe to the pool for reshuffling
+        stats: returns a dict of the pool counters
+        diagnostic_print: prints out the pool's attributes
+    '''
+    DEFAULTSIZE = 2
+
+    def __init__(self, size = None, decks = 6, penetration = None, cut_card = None, rng = None):
+        '''
+        INPUTS:
+            size: integer, number of ready shoes kept in the pool
+                Default: None (uses DEFAULTSIZE)
+            decks, penetration, cut_card: the shoe geometry, see CardShoe
+            rng: an integer seed, a RandomStream object, or None for the
+                global random module
+                Default: None
+        A CardShoe is built right away to check the geometry; so, a bad
+        geometry raises ValueError here instead of in the worker thread.
+        '''
+        if size is None:
+            size = ShoePool.DEFAULTSIZE
+        if (type(size) not in (int, long)) or (size < 1):
+            raise ValueError("ShoePool: size must be a positive integer, not {0}.".format(size))
+        self.size = size
+        self.shoe_args = (decks, penetration, cut_card)
+        self.rng = resolve_stream(rng)
+        self.hits = 0
+        self.misses = 0
+        self.built = 0
+        self.recycled = 0
+        self.ready = Queue.Queue(size)
+        self.returned = Queue.Queue()
+        self.worker = None
+        self.pending = None
+        self._stopping = threading.Event()
+        # The first shoe is the geometry check. The worker gives it a stream
+        # and shuffles it like any other shoe.
+        decks, penetration, cut_card = self.shoe_args
+        _POOLS.add(self)
+        self._spare = CardShoe(decks, penetration, cut_card)
+        self._sequential_codes = self._spare.card_codes[:]
+        self.built += 1
+        self.start()
+
+    def __len__(self):
+        return self.ready.qsize()
+
+    def __str__(self):
+        return "Shoe Pool: {0} of {1} shoes ready, {2} hits, {3} misses.".format(len(self), self.size,
+                                                                              self.hits, self.misses)
+
+    def _next_rng(self):
+        '''
+        This method returns the random number generator for the next shoe the
+        worker shuffles.
+        '''
+        if hasattr(self.rng, 'spawn'):
+            return self.rng.spawn()
+        return self.rng
+
+    def _run(self):
+        '''
+        This is the worker thread. It takes a returned shoe if there is one,
+        otherwise it builds a new one, shuffles it completely, and waits for
+        room in the pool. Every shoe gets the next stream, whether it is new
+        or recycled; so, the streams are handed out in the order the shoes
+        come out of the pool. A shoe left pending by stop() goes in first,
+        with the stream it already has.
+        '''
+        decks, penetration, cut_card = self.shoe_args
+        while not self._stopping.is_set():
+            shuffled = self.pending is not None
+            if shuffled:
+                shoe, self.pending = self.pending, None
+            elif self._spare is not None:
+                shoe, self._spare = self._spare, None
+            else:
+                try:
+                    shoe = self.returned.get_nowait()
+                    # A recycled shoe is put back in sequential order first.
+                    # Otherwise the shoe dealt from a stream would depend on
+                    # whether the worker recycled a shoe or built a new one.
+                    shoe.card_codes[:] = self._sequential_codes
+                    self.recycled += 1
+                except Queue.Empty:
+                    shoe = CardShoe(decks, penetration, cut_card)
+                    self.built += 1
+            if not shuffled:
+                shoe.rng = self._next_rng()
+                shoe.reshuffle()
+                shoe.finish_shuffle()
+            while True:
+                if self._stopping.is_set():
+                    self.pending = shoe
+                    break
+                try:
+                    self.ready.put(shoe, True, 0.1)
+                    break
+                except Queue.Full:
+                    continue
+        return
+
+    def start(self):
+        '''
+        This method starts the worker thread if it is not already running. It
+        is daemonic; so, it never keeps the game from exiting.
+        '''
+        if self.worker is None or not self.worker.is_alive():
+            self._stopping.clear()
+            self.worker = threading.Thread(target = self._run, name = 'ShoePool')
+            self.worker.daemon = True
+            self.worker.start()
+        return
+
+    def stop(self):
+        '''
+        This method stops the worker thread and waits for it to finish. The
+        shoes already in the pool stay there, and so does the shoe the worker
+        was waiting to put in (pending). start() restarts the worker.
+        '''
+        if self.worker is not None:
+            self._stopping.set()
+            self.worker.join()
+            self.worker = None
+        return
+
+    def get(self):
+        '''
+        This method returns the next ready shoe. If the pool is empty, it
+        counts a miss and waits for the worker to finish the next shoe.
+        '''
+        try:
+            shoe = self.ready.get_nowait()
+            self.hits += 1
+        except Queue.Empty:
+            self.misses += 1
+            self.start()
+            shoe = self.ready.get()
+        return shoe
+
+    def put_back(self, shoe):
+        '''
+        This method hands a used shoe back to the pool. The worker reshuffles
+        it and reuses it. It returns no values.
+        '''
+        self.returned.put(shoe)
+        return
+
+    def stats(self):
+        '''
+        This method returns a dict of the counters used to size the pool.
+        '''
+        return {'size'     : self.size,
+                'ready'    : len(self),
+                'hits'     : self.hits,
+                'misses'   : self.misses,
+                'built'    : self.built,
+                'recycled' : self.recycled}
+
+    def diagnostic_print(self):
+        '''
+        This method prints out the attributes of the pool for debugging.
+        '''
+        print("Shoe Pool size: ", self.size)
+        print("Shoe geometry (decks, penetration, cut card): ", self.shoe_args)
+        print("Random number generator: ", self.rng)
+        print("Pool counters: ", self.stats())
+        print("Worker running: ", self.worker is not None and self.worker.is_alive())
+        return
+
+
+# Python 2 tears down module globals while daemon threads may still be
+# running, which makes a busy worker raise on the way out. Every pool is
+# stopped before that happens.
+_POOLS = weakref.WeakSet()
+
+
+def _stop_all_pools():
+    for pool in list(_POOLS):
+        pool.stop()
+    return
+
+atexit.register(_stop_all_pools)
@@ -0,0 +1,244 @@
+from __future__ import print_function
+from array import array
+from BlackjackClasses import CardShoe
+from RoundEngine import Policy
+
+__doc__ = """
+This module holds the built in playing strategies for RoundEngine. Every one
+of them is a TablePolicy: its split, double, and hit decisions are compiled
+once, when the module is loaded, into flat arrays of 0s and 1s. A decision
+during a round is one index into one array; the rules themselves only run
+while the arrays are built.
+
+The arrays are indexed by decision_index, which packs:
+    total  : the soft score of the hand, 0-21 (TOTALS values)
+    soft   : 1 if an Ace is being counted as 11, 0 if not
+    pair   : 0 if the hand is not a two card pair, or 1 plus the rank index
+             of the pair (1 for Aces through 13 for Kings, PAIRS values)
+    upcard : the blackjack value of the dealer's visible card less one, 0
+             for an Ace through 9 for a 10 value card (UPCARDS values)
+
+Built in policies (POLICIES maps a name to each class):
+    'basic'        : BasicStrategy, the usual multi-deck basic strategy
+                     chart for a dealer standing on soft 17. It never takes
+                     insurance.
+    'mimic dealer' : MimicDealer, hits below 17 and never splits or doubles
+    'never bust'   : NeverBust, only hits a hand no card can bust, and never
+                     splits or doubles
+
+Every built in bets the table minimum. Subclasses can override bet and
+insurance like any other Policy.
+
+Classes:
+    TablePolicy: a Policy whose split, double, and hit decisions are lookups
+        in compiled arrays
+    BasicStrategy, MimicDealer, NeverBust: the built in TablePolicy classes
+"""
+
+TOTALS  = 22
+PAIRS   = len(CardShoe.ranks) + 1
+UPCARDS = 10
+DECISIONS = TOTALS * 2 * PAIRS * UPCARDS
+
+# The rank index of an Ace and the value of a pair of each rank, used by the
+# rules below.
+ACE = 0
+PAIRVALUES = (0,) + tuple([CardShoe.code_values[rank] for rank in xrange(0, len(CardShoe.ranks))])
+
+
+def decision_index(hand, upcard):
+    '''
+    This function packs a Hand object and the dealer's visible card code
+    into the index of the decision arrays of a TablePolicy.
+    '''
+    cards = hand.cards
+    pair = 0
+    if len(cards) == 2:
+        rank = CardShoe.code_ranks[cards[0]]
+        if rank == CardShoe.code_ranks[cards[1]]:
+            pair = rank + 1
+    soft = int(hand.soft_score != hand.hard_score)
+    return ((hand.soft_score * 2 + soft) * PAIRS + pair) * UPCARDS + CardShoe.code_values[upcard] - 1
+
+
+def compile_rule(rule):
+    '''
+    This function runs rule(total, soft, pair, upcard) for every index of
+    the decision arrays and returns the answers as an array of 0s and 1s.
+    total and pair are as in decision_index; soft is a boolean, and upcard is
+    the card's blackjack value, 2-10 or 11 for an Ace. Some indexes can
+    never come up (a soft 4, say); they are compiled anyway, so the lookup
+    never has to check.
+    '''
+    decisions = array('B', [0] * DECISIONS)
+    for total in xrange(0, TOTALS):
+        for soft in (0, 1):
+            for pair in xrange(0, PAIRS):
+                for upcard in xrange(0, UPCARDS):
+                    base = ((total * 2 + soft) * PAIRS + pair) * UPCARDS
+                    value = upcard + 1 if upcard > 0 else 11
+                    decisions[base + upcard] = int(bool(rule(total, bool(soft), pair, value)))
+    return decisions
+
+
+def _basic_split(total, soft, pair, upcard):
+    if pair == 0:
+        return False
+    value = PAIRVALUES[pair]
+    if (pair - 1 == ACE) or (value == 8):
+        return True
+    if value == 9:
+        return upcard in (2, 3, 4, 5, 6, 8, 9)
+    if value in (2, 3, 7):
+        return upcard <= 7
+    if value == 6:
+        return upcard <= 6
+    if value == 4:
+        return upcard in (5, 6)
+    return False
+
+
+def _basic_double(total, soft, pair, upcard):
+    if soft:
+        if total in (13, 14):
+            return upcard in (5, 6)
+        if total in (15, 16):
+            return upcard in (4, 5, 6)
+        if total in (17, 18):
+            return upcard in (3, 4, 5, 6)
+        return False
+    if total == 9:
+        return upcard in (3, 4, 5, 6)
+    if total == 10:
+        return upcard <= 9
+    if total == 11:
+        return upcard <= 10
+    return False
+
+
+def _basic_hit(total, soft, pair, upcard):
+    if soft:
+        if total == 18:
+            return upcard >= 9
+        return total < 18
+    if total <= 11:
+        return True
+    if total == 12:
+        return upcard not in (4, 5, 6)
+    if total <= 16:
+        return upcard > 6
+    return False
+
+
+def _never(total, soft, pair, upcard):
+    return False
+
+
+def _mimic_hit(total, soft, pair, upcard):
+    return total < 17
+
+
+def _safe_hit(total, soft, pair, upcard):
+    # A soft hand counts its Ace as 11; so, its hard score is 10 less. No
+    # card can bust a hand whose hard score is 11 or less.
+    if soft:
+        return total - 10 <= 11
+    return total <= 11
+
+
+class TablePolicy(Policy):
+    '''
+    This class is a Policy whose split, double, and hit decisions are read
+    out of compiled arrays, one index per decision. A subclass sets the
+    class attributes split_table, double_table, and hit_table with
+    compile_rule; an instance can also be given its own arrays.
+
+    A double raises the bet by the full original bet, or by whatever the
+    bank still covers. A split hand is bet the same as the regular hand, or
+    whatever the bank still covers. RoundEngine only offers a split when the
+    bank covers the table minimum on the new hand.
+
+    Class Order Attributes:
+        split_table: array, 1 where the pair should be split
+        double_table: array, 1 where the bet should be raised
+        hit_table: array, 1 where the hand should take a card
+
+    Methods:
+        __init__: optionally replaces the arrays of the class
+        split: looks up split_table
+        split_bet: returns the bet on the regular hand, capped by the bank
+        double: looks up double_table and returns the raise
+        hit: looks up hit_table
+    '''
+    split_table  = compile_rule(_never)
+    double_table = compile_rule(_never)
+    hit_table    = compile_rule(_mimic_hit)
+
+    def __init__(self, split_table = None, double_table = None, hit_table = None):
+        '''
+        INPUTS:
+            split_table, double_table, hit_table: arrays from compile_rule
+                to use instead of the class's own
+                Default: None (the class's arrays)
+        An array of the wrong size raises a ValueError.
+        '''
+        for name, table in (('split_table', split_table),
+                            ('double_table', double_table),
+                            ('hit_table', hit_table)):
+            if table is None:
+                continue
+            if len(table) != DECISIONS:
+                raise ValueError("TablePolicy: {0} needs {1} decisions, not {2}.".format(
+                                 name, DECISIONS, len(table)))
+            setattr(self, name, table)
+
+    def split(self, engine, seat, index):
+        hand = engine.table.players[seat].hands[index]
+        return self.split_table[decision_index(hand, engine.upcard)] == 1
+
+    def split_bet(self, engine, seat, index):
+        player = engine.table.players[seat]
+        return min(player.bet, player.bank - player.total_bets())
+
+    def double(self, engine, seat, index):
+        player = engine.table.players[seat]
+        hand = player.hands[index]
+        if not self.double_table[decision_index(hand, engine.upcard)]:
+            return 0
+        return max(min(hand.bet, player.bank - player.total_bets()), 0)
+
+    def hit(self, engine, seat, index):
+        hand = engine.table.players[seat].hands[index]
+        return self.hit_table[decision_index(hand, engine.upcard)] == 1
+
+
+class BasicStrategy(TablePolicy):
+    '''
+    This class plays the multi-deck basic strategy chart for a dealer who
+    stands on soft 17. Since this game's double down does not end the hand,
+    a doubled hand is played on with the hit chart.
+    '''
+    split_table  = compile_rule(_basic_split)
+    double_table = compile_rule(_basic_double)
+    hit_table    = compile_rule(_basic_hit)
+
+
+class MimicDealer(TablePolicy):
+    '''
+    This class plays like the dealer: it hits below 17, and never splits or
+    doubles.
+    '''
+    hit_table = compile_rule(_mimic_hit)
+
+
+class NeverBust(TablePolicy):
+    '''
+    This class only hits a hand that no card can bust, and never splits or
+    doubles.
+    '''
+    hit_table = compile_rule(_safe_hit)
+
+
+POLICIES = {'basic'        : BasicStrategy,
+            'mimic dealer' : MimicDealer,
+            'never bust'   : NeverBust}
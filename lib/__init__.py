@@ -1,22 +1,74 @@
 from __future__ import print_function
-import random
-from BlackjackClasses import CardShoe, Player, Dealer, CasinoTable
-from PygameTextboxClass import Textbox
+from BlackjackClasses import CardShoe, Hand, Player, Dealer, CasinoTable, hand_state
+from BlackjackClasses import settle_hands, LOSS, TIE, WIN, OUTCOMES, ScoreIndex
+# pygame is only needed by the game's GUI; so, the package never imports it.
+# The game imports Textbox from lib.PygameTextboxClass itself.
+from RandomStreams import RandomStream, resolve_stream
+from ShoePool import ShoePool
+from ShoeBatch import shuffled_shoes, load_shoe, HAVENUMPY
+from CardCounter import CardCounter
+from ShoeArchive import ShoeRecorder, ShoeArchive, ReplayShoe
+from BankLedger import BankLedger
+from Roster import Roster, RosterView
+from RoundEngine import RoundEngine, Policy, PHASES
+from StrategyPolicies import TablePolicy, BasicStrategy, MimicDealer, NeverBust, POLICIES, compile_rule
+from DealerList import generateDealerList, dieRoll
+from BatchRounds import BatchEngine
 __doc__ = """
 This is the library subpackage for Blackjack. The libraries include the
 following classes:
 
     CardShoe: takes 6 52-card standards decks and creates a random card shoe
         from them
+    Hand: one hand's cards, scores, bet, and status, scored one table lookup
+        per card. Player and Dealer hold lists of them.
     Player: objects tracking player's name, bank, hands (regular and split),
         bets, wins, losses, and ties in each round
     Dealer: special derived class from Player handling the Dealer's hands,
         bank, and wins, losses, and draws
     CasinoTable: covers dealing cards, player turns, dealer's turn, and
         wins/losses/ties, specific casino conditionals
-    Textbox: uses pygame and the string module to create interactive textboxes
-        that accept only specified characters (number for bets, text for
-        names)
+    hand_state: packs a hand's hard score, Ace, and card count into the
+        state index of Hand.hand_table, the per-card scoring table
+    settle_hands: settles every hand of a round against the dealer's total
+        in one pass, returning the outcomes (LOSS, TIE, WIN), the payouts,
+        the dealer's totals, and the players left insolvent
+    ScoreIndex: the soft scores of every live player hand at a table, kept
+        in order as hands change, for the dealer's stand rule
+    Textbox: (PygameTextboxClass, imported on its own) uses pygame and the
+        string module to create interactive textboxes that accept only
+        specified characters (number for bets, text for names)
+    RandomStream: a seedable random number generator that spawns
+        independent child streams for shoes, dealer rosters, award rolls,
+        and parallel workers
+    ShoePool: a bounded pool of shuffled card shoes kept full by a
+        background thread, so a CasinoTable can swap shoes instantly
+    shuffled_shoes, load_shoe: (ShoeBatch) build batches of shuffled shoes
+        as a numpy array of card codes for simulations. NumPy is optional;
+        HAVENUMPY is False without it.
+    CardCounter: keeps running and true counts (Hi-Lo, KO, Omega II, or a
+        custom tag set), fed one card at a time by CardShoe and Dealer
+    ShoeRecorder, ShoeArchive, ReplayShoe: (ShoeArchive) record shoe orders
+        to a binary file, one byte per card, and deal them back from a
+        memory map
+    BankLedger: an append-only record of every change to the players' and
+        the dealer's banks, buffered in a ring and written to disk in blocks
+    Roster, RosterView: the user's players, their banks, and skills, indexed
+        by name. Tables and screens read it through read only views, and a
+        seated Player's bank is read from the Player itself.
+    RoundEngine, Policy, PHASES: (RoundEngine) plays rounds on a CasinoTable
+        as a state machine with no input or output. Decisions come from a
+        Policy per seat or from a driver through next_request and decide.
+    TablePolicy, BasicStrategy, MimicDealer, NeverBust: (StrategyPolicies)
+        playing strategies whose split, double, and hit decisions are one
+        lookup each in arrays compiled by compile_rule. POLICIES maps their
+        names to them.
+    generateDealerList, dieRoll: (DealerList) the casino's dealers and their
+        table configurations, rolled with dieRoll
+    BatchEngine: (BatchRounds) plays RoundEngine's rounds at many
+        independent tables at once, with the hands, scores, and bets in NumPy
+        arrays and the decisions looked up in TablePolicy arrays. NumPy is
+        optional; building one without it raises ImportError.
 
 These libraries are written in Python 2.7.14 and pygame 1.9.2. Textbox was
 written with help from Sean McKiernan (Mekire on GitHub).